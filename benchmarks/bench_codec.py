@@ -0,0 +1,121 @@
+"""
+Benchmark JSON decode/encode paths on realistic 250-record Congress.gov pages.
+
+    python benchmarks/bench_codec.py [--repeat N]
+
+Compares the standard library, orjson (when installed) and pydantic_core,
+which FastMCP uses to serialize dict results by default, and measures a
+cache hit that reuses the encoded bytes stored with the entry.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault("CONGRESS_GOV_API_KEY", "benchmark")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pydantic_core  # noqa: E402
+import server  # noqa: E402
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def bills_page(n=250):
+    bills = []
+    for i in range(1, n + 1):
+        bills.append({
+            "congress": 118,
+            "latestAction": {
+                "actionDate": "2024-05-01",
+                "text": "Referred to the Committee on Ways and Means, and in addition to the Committee on the Budget."
+            },
+            "number": str(i),
+            "originChamber": "House",
+            "originChamberCode": "H",
+            "title": f"To amend the Internal Revenue Code of 1986 to provide for a credit for \"qualified\" expenses, and for other purposes ({i}).",
+            "type": "HR",
+            "updateDate": "2024-05-02",
+            "updateDateIncludingText": "2024-05-02T12:34:56Z",
+            "url": f"https://api.congress.gov/v3/bill/118/hr/{i}?format=json"
+        })
+    return {
+        "bills": bills,
+        "pagination": {"count": 11263, "next": "https://api.congress.gov/v3/bill/118?offset=250&limit=250&format=json"},
+        "request": {"congress": "118", "contentType": "application/json", "format": "json"}
+    }
+
+
+def summaries_page(n=250):
+    summaries = []
+    for i in range(1, n + 1):
+        summaries.append({
+            "actionDate": "2024-03-12",
+            "actionDesc": "Introduced in House",
+            "bill": {
+                "congress": 118,
+                "number": str(i),
+                "originChamber": "House",
+                "title": "Lower Energy Costs Act",
+                "type": "HR",
+                "updateDateIncludingText": "2024-03-20T14:00:00Z",
+                "url": f"https://api.congress.gov/v3/bill/118/hr/{i}?format=json"
+            },
+            "currentChamber": "House",
+            "lastSummaryUpdateDate": "2024-03-20T13:59:00Z",
+            "text": "<p><strong>Lower Energy Costs Act</strong></p><p>This bill addresses a variety of energy related issues. " * 6 + "</p>",
+            "updateDate": "2024-03-20T14:00:00Z",
+            "versionCode": "00"
+        })
+    return {
+        "summaries": summaries,
+        "pagination": {"count": 9120, "next": "https://api.congress.gov/v3/summaries/118?offset=250&limit=250&format=json"},
+        "request": {"contentType": "application/json", "format": "json"}
+    }
+
+
+def timed(fn, repeat):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def run(name, page, repeat):
+    raw = json.dumps(page).encode()
+    chunks = [raw[i:i + server._STREAM_CHUNK_SIZE] for i in range(0, len(raw), server._STREAM_CHUNK_SIZE)]
+    cached = server._EncodedResult(page, server._json_dumps(page))
+
+    rows = [
+        ("decode  json.loads", lambda: json.loads(raw)),
+        ("decode  streaming (_decode_stream)", lambda: server._decode_stream(chunks)),
+        ("encode  json.dumps", lambda: json.dumps(page)),
+        ("encode  pydantic_core.to_json(indent=2)", lambda: pydantic_core.to_json(page, indent=2)),
+        ("encode  cache hit (_encode_result)", lambda: server._encode_result(cached)),
+    ]
+    if orjson is not None:
+        rows.insert(1, ("decode  orjson.loads", lambda: orjson.loads(raw)))
+        rows.insert(5, ("encode  orjson.dumps", lambda: orjson.dumps(page)))
+
+    print(f"{name}: {len(raw) / 1024:.0f} KiB, {repeat} iterations")
+    for label, fn in rows:
+        print(f"  {label:<42} {timed(fn, repeat):8.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"orjson: {'installed' if orjson else 'not installed'}")
+    run("bills (250 records)", bills_page(), args.repeat)
+    run("summaries (250 records)", summaries_page(), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
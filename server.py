@@ -1,7 +1,44 @@
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
+from mcp.types import TextContent
+from array import array
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import argparse
+import asyncio
+import base64
+import bisect
+import codecs
+import contextvars
+import copy
+import csv
+import hashlib
+import heapq
+import io
+import json
 import requests
 import os
+import re
+import shutil
+import sqlite3
+import struct
+import sys
+import threading
+import time
+import zlib
 from dotenv import load_dotenv
+from urllib3.util import make_headers
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 load_dotenv()
 
@@ -15,14 +52,2475 @@ for key in required_api_keys:
 if missing_keys:
     raise EnvironmentError(f"Required environment variables are missing: {', '.join(missing_keys)}")
 
-mcp = FastMCP("usgov_mcp")
 congress_gov_api_key = os.environ.get("CONGRESS_GOV_API_KEY")
 
+# "auto" uses orjson when it is installed; "json" forces the standard library.
+json_codec = os.environ.get("CONGRESS_GOV_JSON_CODEC", "auto")
+if json_codec not in ("auto", "orjson", "json"):
+    raise EnvironmentError(f"CONGRESS_GOV_JSON_CODEC must be auto, orjson or json, not {json_codec!r}")
+if json_codec == "orjson" and orjson is None:
+    raise EnvironmentError("CONGRESS_GOV_JSON_CODEC=orjson but orjson is not installed")
+
+if orjson is not None and json_codec != "json":
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+    _json_loads = orjson.loads
+else:
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, default=str, ensure_ascii=False, separators=(",", ":")).encode()
+
+    _json_loads = json.loads
+
+
+class _EncodedResult(dict):
+    """A tool result that carries its already-encoded JSON bytes."""
+
+    __slots__ = ("encoded",)
+
+    def __init__(self, data: dict, encoded: bytes):
+        super().__init__(data)
+        self.encoded = encoded
+
+
+def _encode_result(result) -> bytes:
+    encoded = getattr(result, "encoded", None)
+    return encoded if encoded is not None else _json_dumps(result)
+
+
+class _CongressMCP(FastMCP):
+    """FastMCP that serializes tool results with the configured JSON codec.
+
+    Results that came out of the response cache are sent as the bytes stored
+    with the entry instead of being serialized again.
+    """
+
+    async def call_tool(self, name: str, arguments: dict) -> list[TextContent]:
+        result = await self._tool_manager.call_tool(name, arguments, context=self.get_context())
+        if compact_output and isinstance(result, dict):
+            result = _compact(result)
+        text = result if isinstance(result, str) else _encode_result(result).decode()
+        return [TextContent(type="text", text=text)]
+
+
+mcp = _CongressMCP("usgov_mcp")
+
+# One pooled session for every upstream call. It advertises every content
+# encoding urllib3 can decode: gzip/deflate always, br/zstd when the optional
+# brotli/zstandard packages are installed.
+_API_BASE = "https://api.congress.gov/v3/"
+
+_session = requests.Session()
+_session.headers["Accept-Encoding"] = make_headers(accept_encoding=True)["accept-encoding"]
+
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+# Compact results: no request echo, and Congress.gov URLs shortened to
+# relative IDs such as "bill/118/hr/1".
+compact_output = os.environ.get("CONGRESS_GOV_COMPACT", "0") == "1"
+
+
+def _relative_id(url: str) -> str:
+    """'https://api.congress.gov/v3/bill/118/hr/1?format=json' -> 'bill/118/hr/1'."""
+    path, _, query = url[len(_API_BASE):].partition("?")
+    query = urlencode([(k, v) for k, v in parse_qsl(query) if k not in ("format", "api_key")])
+    return f"{path}?{query}" if query else path
+
+
+def _without_key(url: str) -> str:
+    """`url` with any api_key query parameter removed."""
+    parts = urlsplit(url)
+    query = urlencode([(k, v) for k, v in parse_qsl(parts.query) if k != "api_key"])
+    return urlunsplit(parts._replace(query=query))
+
+
+def _redact(text: str) -> str:
+    return text.replace(congress_gov_api_key, "***") if congress_gov_api_key else text
+
+
+def _compact_value(value):
+    if isinstance(value, dict):
+        return {k: _relative_id(v) if k in _URL_KEYS and isinstance(v, str) and v.startswith(_API_BASE) else _compact_value(v)
+                for k, v in value.items()}
+    if isinstance(value, list):
+        return [_compact_value(v) for v in value]
+    return value
+
+
+_URL_KEYS = {"url", "next", "prev"}
+
+
+def _compact(result: dict) -> dict:
+    """`result` without its request echo and with Congress.gov URLs as relative IDs."""
+    return _compact_value({k: v for k, v in result.items() if k != "request"})
+
+
+# Top-level objects that wrap a record array instead of being a record
+# themselves (the congressional record nests its issues under "Results").
+_ENVELOPE_KEYS = {"Results"}
+
+_json_decoder = json.JSONDecoder()
+
+
+class _JSONStream:
+    """Pull reader over a chunked JSON body.
+
+    Only unconsumed text is buffered: values are decoded one at a time and the
+    consumed prefix is dropped whenever more input is read.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _read(self, need: int):
+        """Append decoded chunks until `need` more characters are buffered or input ends."""
+        self._buf = self._buf[self._pos:]
+        self._pos = 0
+        target = len(self._buf) + need
+        while len(self._buf) < target and not self._eof:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self._eof = True
+                self._buf += self._utf8.decode(b"", final=True)
+            else:
+                self._buf += self._utf8.decode(chunk)
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ("" at end of input)."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in " \t\r\n":
+                self._pos += 1
+            if self._pos < len(self._buf) or self._eof:
+                return self._buf[self._pos:self._pos + 1]
+            self._read(1)
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting {char!r}", self._buf, self._pos)
+        self._pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = _json_decoder.raw_decode(self._buf, self._pos)
+                # A number at the very end of the buffer may still be truncated.
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            # Double the lookahead so a large value costs O(log n) retries.
+            self._read(max(len(self._buf) - self._pos, _STREAM_CHUNK_SIZE))
+
+
+def _project(record: dict, fields: list[str] | None) -> dict:
+    if not fields:
+        return record
+    return {field: record[field] for field in fields if field in record}
+
+
+def _decode_records(stream: _JSONStream, fields) -> list:
+    stream.expect("[")
+    records = []
+    if stream.peek() == "]":
+        stream.expect("]")
+        return records
+    while True:
+        record = stream.value()
+        if not isinstance(record, dict):
+            records.append(record)
+        else:
+            records.append(_project(record, fields))
+        if stream.peek() == ",":
+            stream.expect(",")
+            continue
+        stream.expect("]")
+        return records
+
+
+def _decode_object(stream: _JSONStream, fields, envelope: bool = False) -> dict:
+    stream.expect("{")
+    obj = {}
+    if stream.peek() == "}":
+        stream.expect("}")
+        return obj
+    while True:
+        key = stream.value()
+        stream.expect(":")
+        char = stream.peek()
+        if char == "[" and envelope:
+            obj[key] = _decode_records(stream, fields)
+        elif char == "{" and envelope and key in _ENVELOPE_KEYS:
+            obj[key] = _decode_object(stream, fields, envelope=True)
+        else:
+            obj[key] = stream.value()
+        if stream.peek() == ",":
+            stream.expect(",")
+            continue
+        stream.expect("}")
+        return obj
+
+
+def _decode_stream(chunks, fields: list[str] | None = None) -> dict:
+    """
+    Incrementally decode a Congress.gov response body.
+
+    Record arrays (top-level lists such as "bills", or lists inside an envelope
+    such as "Results") are decoded one record at a time; each record is
+    projected onto `fields` before the next one is read, so the raw page never
+    sits in memory as a single string.
+    """
+    stream = _JSONStream(chunks)
+    result = _decode_object(stream, fields, envelope=True)
+    if stream.peek():
+        raise json.JSONDecodeError("Extra data", "", 0)
+    return result
+
+
+class _Cancelled(Exception):
+    """Raised inside a fetch whose result is no longer wanted."""
+
+
+class _CallScope:
+    """
+    Deadline and cancellation shared by all upstream work done for one call.
+
+    The scope travels in a context variable, so retries and fan-out
+    subrequests see the same deadline. Cancelling it closes every response
+    still being read, which aborts the blocked read and frees its pool slot.
+    """
+
+    def __init__(self, deadline: float | None = None):
+        self.deadline = deadline
+        self.cancelled = threading.Event()
+        self._responses = set()
+        self._children = set()
+        self._lock = threading.Lock()
+
+    def child(self) -> "_CallScope":
+        """A scope with the same deadline that can also be cancelled on its own."""
+        child = _CallScope(self.deadline)
+        with self._lock:
+            self._children.add(child)
+        if self.cancelled.is_set():
+            child.cancel()
+        return child
+
+    def release(self, child: "_CallScope"):
+        with self._lock:
+            self._children.discard(child)
+
+    def remaining(self) -> float | None:
+        return None if self.deadline is None else self.deadline - time.monotonic()
+
+    def check(self):
+        if self.cancelled.is_set():
+            raise _Cancelled()
+        remaining = self.remaining()
+        if remaining is not None and remaining <= 0:
+            raise requests.exceptions.Timeout("Deadline exceeded")
+
+    def track(self, response):
+        with self._lock:
+            self._responses.add(response)
+        if self.cancelled.is_set():
+            response.close()
+
+    def untrack(self, response):
+        with self._lock:
+            self._responses.discard(response)
+
+    def cancel(self):
+        self.cancelled.set()
+        with self._lock:
+            responses = list(self._responses)
+            children = list(self._children)
+        for response in responses:
+            response.close()
+        for child in children:
+            child.cancel()
+
+
+_scope = contextvars.ContextVar("congress_gov_call_scope", default=None)
+
+call_deadline = float(os.environ.get("CONGRESS_GOV_DEADLINE", "60"))
+_retries = int(os.environ.get("CONGRESS_GOV_RETRIES", "2"))
+_RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# (connect, read) seconds; the congressional record endpoints return large
+# documents and get longer to respond.
+_DEFAULT_TIMEOUT = (
+    float(os.environ.get("CONGRESS_GOV_CONNECT_TIMEOUT", "5")),
+    float(os.environ.get("CONGRESS_GOV_READ_TIMEOUT", "30"))
+)
+_ENDPOINT_TIMEOUTS = {
+    "congressional-record": (_DEFAULT_TIMEOUT[0], 2 * _DEFAULT_TIMEOUT[1]),
+    "daily-congressional-record": (_DEFAULT_TIMEOUT[0], 2 * _DEFAULT_TIMEOUT[1]),
+    "bound-congressional-record": (_DEFAULT_TIMEOUT[0], 2 * _DEFAULT_TIMEOUT[1])
+}
+
+
+async def _call(fn, *args, deadline: float | None = call_deadline, **kwargs):
+    """
+    Run blocking upstream work for a tool call in a worker thread.
+
+    Everything it does shares one _CallScope with `deadline` seconds to
+    finish; if the MCP client cancels the call, the scope is cancelled too.
+    """
+    scope = _CallScope(None if deadline is None else time.monotonic() + deadline)
+    token = _scope.set(scope)
+    try:
+        return await asyncio.to_thread(fn, *args, **kwargs)
+    except asyncio.CancelledError:
+        scope.cancel()
+        raise
+    except requests.exceptions.RequestException as e:
+        # requests puts the full URL, api_key included, in its error messages.
+        e.args = tuple(_redact(str(arg)) if _redact(str(arg)) != str(arg) else arg for arg in e.args)
+        raise
+    finally:
+        _scope.reset(token)
+
+
+_fanout = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("CONGRESS_GOV_FANOUT_WORKERS", "4")),
+    thread_name_prefix="fanout"
+)
+
+
+def _fanout_map(fn, items) -> list:
+    """Like _fanout.map, but each task runs in the caller's context (and scope)."""
+    futures = [_fanout.submit(contextvars.copy_context().run, fn, item) for item in items]
+    try:
+        return [future.result() for future in futures]
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+class _Quota:
+    """
+    Hourly request allowance, as reported by the Congress.gov rate-limit headers.
+
+    The count is only updated by responses, so it is forgotten `window`
+    seconds after the last one: by then the hour it described has passed.
+    """
+
+    def __init__(self, reserve: int, window: float = 3600):
+        self.reserve = reserve
+        self.window = window
+        self.limit = None
+        self.remaining = None
+        self.updated_at = None
+        self._lock = threading.Lock()
+
+    def update(self, headers):
+        with self._lock:
+            if "X-RateLimit-Limit" in headers:
+                self.limit = int(headers["X-RateLimit-Limit"])
+            if "X-RateLimit-Remaining" in headers:
+                self.remaining = int(headers["X-RateLimit-Remaining"])
+                self.updated_at = time.monotonic()
+
+    def spend_spare(self) -> bool:
+        """Claim one request for optional work, never dipping into the reserve."""
+        with self._lock:
+            if self.remaining is not None and time.monotonic() - self.updated_at >= self.window:
+                self.remaining = None
+            if self.remaining is None:
+                return True
+            if self.remaining <= self.reserve:
+                return False
+            self.remaining -= 1
+            return True
+
+
+_quota = _Quota(reserve=int(os.environ.get("CONGRESS_GOV_QUOTA_RESERVE", "500")))
+
+_metrics = Counter()
+_metrics_lock = threading.Lock()
+
+
+def _count(name: str, n: int = 1):
+    with _metrics_lock:
+        _metrics[name] += n
+
+
+class _CircuitOpen(requests.exceptions.ConnectionError):
+    """Raised instead of calling an upstream that keeps failing."""
+
+
+class _CircuitBreaker:
+    """
+    Stop calling Congress.gov after `failures` calls in a row fail.
+
+    While open, requests fail at once. Every `cooldown` seconds a single
+    probe is let through; a success closes the circuit.
+    """
+
+    def __init__(self, failures: int, cooldown: float):
+        self.failures = failures
+        self.cooldown = cooldown
+        self._failed = 0
+        self._opened_at = None
+        self._lock = threading.Lock()
+
+    def check(self):
+        with self._lock:
+            if self._opened_at is None:
+                return
+            now = time.monotonic()
+            if now - self._opened_at < self.cooldown:
+                raise _CircuitOpen("Congress.gov is unavailable (circuit open)")
+            # Let this request probe, and hold everyone else off for another cooldown.
+            self._opened_at = now
+
+    def success(self):
+        with self._lock:
+            self._failed = 0
+            self._opened_at = None
+
+    def failure(self):
+        with self._lock:
+            self._failed += 1
+            if self._failed >= self.failures and self.failures > 0:
+                if self._opened_at is None:
+                    _count("breaker_opened")
+                self._opened_at = time.monotonic()
+
+
+_breaker = _CircuitBreaker(
+    failures=int(os.environ.get("CONGRESS_GOV_BREAKER_FAILURES", "5")),
+    cooldown=float(os.environ.get("CONGRESS_GOV_BREAKER_COOLDOWN", "30"))
+)
+
+
+def _unavailable(e: Exception) -> bool:
+    """Whether `e` means the upstream is down rather than that the request was bad."""
+    if isinstance(e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    return isinstance(e, requests.exceptions.HTTPError) and e.response is not None \
+        and e.response.status_code in _RETRY_STATUS
+
+
+def _guarded(chunks, scope: _CallScope | None, attempt_deadline: float | None):
+    """Stop reading a body once the call is cancelled or the attempt runs out of time."""
+    for chunk in chunks:
+        if scope is not None:
+            scope.check()
+        if attempt_deadline is not None and time.monotonic() > attempt_deadline:
+            raise requests.exceptions.Timeout("Read deadline exceeded")
+        yield chunk
+
+
+def _get_json_once(url: str, params: dict, fields, timeout, scope: _CallScope | None,
+                   attempt_deadline: float | None) -> dict:
+    with _session.get(url, params=params, stream=True, timeout=timeout) as response:
+        if scope is not None:
+            scope.track(response)
+        try:
+            if url.startswith(_API_BASE):
+                _quota.update(response.headers)
+            _count("upstream_requests")
+            response.raise_for_status()
+            chunks = _guarded(response.iter_content(_STREAM_CHUNK_SIZE), scope, attempt_deadline)
+            try:
+                return _decode_stream(chunks, fields)
+            except json.JSONDecodeError as e:
+                raise requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos) from e
+        except requests.exceptions.RequestException:
+            if scope is not None and scope.cancelled.is_set():
+                raise _Cancelled()
+            raise
+        finally:
+            if scope is not None:
+                scope.untrack(response)
+
+
+class _Latency:
+    """Recent successful request latencies per endpoint."""
+
+    window = 200
+    min_samples = 20
+
+    def __init__(self):
+        self._samples = {}  # endpoint -> deque of seconds
+        self._p95 = {}  # endpoint -> p95 as of the last recomputation
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, seconds: float):
+        with self._lock:
+            samples = self._samples.setdefault(endpoint, deque(maxlen=self.window))
+            samples.append(seconds)
+            # Re-sorting a 200-sample window on every request is wasted work;
+            # the p95 drifts slowly, so refresh it every few samples.
+            if len(samples) >= self.min_samples and (len(samples) % 10 == 0 or endpoint not in self._p95):
+                ordered = sorted(samples)
+                self._p95[endpoint] = ordered[int(0.95 * (len(ordered) - 1))]
+
+    def p95(self, endpoint: str) -> float | None:
+        with self._lock:
+            return self._p95.get(endpoint)
+
+
+class _HedgeBudget:
+    """
+    Token bucket for duplicate requests.
+
+    Every primary request earns `ratio` of a hedge, so hedges never exceed
+    that fraction of traffic; each hedge also spends spare hourly quota.
+    """
+
+    def __init__(self, ratio: float, burst: float = 10):
+        self.ratio = ratio
+        self.burst = burst
+        self._tokens = 0.0
+        self._lock = threading.Lock()
+
+    def earn(self):
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + self.ratio)
+
+    def spend(self) -> bool:
+        with self._lock:
+            if self._tokens < 1 or not _quota.spend_spare():
+                return False
+            self._tokens -= 1
+            return True
+
+
+hedge_enabled = os.environ.get("CONGRESS_GOV_HEDGE", "0") == "1"
+_latency = _Latency()
+_hedge_budget = _HedgeBudget(ratio=float(os.environ.get("CONGRESS_GOV_HEDGE_RATIO", "0.05")))
+_hedge_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="hedge")
+
+
+def _get_json_hedged(url: str, params: dict, fields, timeout, scope: _CallScope | None,
+                     attempt_deadline: float | None, threshold: float) -> dict:
+    """
+    One attempt that sends a duplicate request if the first is still pending
+    after `threshold` seconds. The first successful response wins and the
+    other request is cancelled.
+    """
+    parent = scope if scope is not None else _CallScope()
+    scopes = {}
+
+    def launch():
+        child = parent.child()
+        future = _hedge_pool.submit(_get_json_once, url, params, fields, timeout, child, attempt_deadline)
+        scopes[future] = child
+        return future
+
+    primary = launch()
+    pending = {primary}
+    error = None
+    try:
+        done, pending = wait(pending, timeout=threshold)
+        if not done and _hedge_budget.spend():
+            _count("hedges_sent")
+            pending.add(launch())
+        while True:
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # Report the primary's error if both fail.
+                    if error is None or future is primary:
+                        error = e
+                    continue
+                if future is not primary:
+                    _count("hedge_wins")
+                return result
+            if not pending:
+                raise error
+            parent.check()
+            done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+    finally:
+        for future, child in scopes.items():
+            if future in pending:
+                future.cancel()
+                child.cancel()
+            parent.release(child)
+
+
+def _get_json(url: str, params: dict, fields: list[str] | None = None) -> dict:
+    """
+    GET a Congress.gov endpoint, decoding the compressed body as it streams in.
+
+    Connection errors, timeouts and 429/5xx responses are retried. Each
+    attempt gets the endpoint's (connect, read) timeouts, capped by an equal
+    share of what is left of the current call's deadline. With hedging on, an
+    attempt still pending past the endpoint's observed p95 latency is raced
+    against a duplicate request. Calls fail at once while the circuit
+    breaker is open.
+    """
+    scope = _scope.get()
+    endpoint = url[len(_API_BASE):].split("/")[0] if url.startswith(_API_BASE) else ""
+    connect_timeout, read_timeout = _ENDPOINT_TIMEOUTS.get(endpoint, _DEFAULT_TIMEOUT)
+    for attempt in range(_retries + 1):
+        budget = None
+        if scope is not None:
+            scope.check()
+            remaining = scope.remaining()
+            if remaining is not None:
+                budget = remaining / (_retries + 1 - attempt)
+        _breaker.check()
+        timeout = (connect_timeout, read_timeout) if budget is None else (
+            min(connect_timeout, budget), min(read_timeout, budget))
+        attempt_deadline = None if budget is None else time.monotonic() + budget
+        threshold = _latency.p95(endpoint) if hedge_enabled else None
+        started = time.monotonic()
+        try:
+            if threshold is None:
+                result = _get_json_once(url, params, fields, timeout, scope, attempt_deadline)
+            else:
+                _hedge_budget.earn()
+                result = _get_json_hedged(url, params, fields, timeout, scope, attempt_deadline, threshold)
+            _latency.record(endpoint, time.monotonic() - started)
+            _breaker.success()
+            return result
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            error = e
+        except requests.exceptions.HTTPError as e:
+            if e.response is None or e.response.status_code not in _RETRY_STATUS:
+                _breaker.success()
+                raise
+            error = e
+        if attempt == _retries:
+            _breaker.failure()
+            raise error
+        _count("upstream_retries")
+        backoff = 0.5 * 2 ** attempt
+        if scope is not None and scope.remaining() is not None:
+            backoff = min(backoff, max(scope.remaining(), 0) / 2)
+        time.sleep(backoff)
+
+
+class _ResponseCache:
+    """
+    In-memory TTL cache of encoded upstream responses with LRU eviction.
+
+    Bounded by entry count and by the total size of the encoded responses.
+    Expired entries are kept for another `keep_stale` seconds so they can
+    still be served while a refresh runs or while the upstream is down.
+    """
+
+    def __init__(self, ttl: float, max_entries: int, keep_stale: float = 0, max_bytes: int | None = None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.keep_stale = keep_stale
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (stored_at, encoded)
+        self._bytes = 0
+        self._stats = Counter()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and time.time() - entry[0] <= self.ttl
+
+    def get(self, key: str) -> bytes | None:
+        entry = self.get_stale(key, max_stale=0)
+        return None if entry is None else entry[0]
+
+    def get_stale(self, key: str, max_stale: float) -> tuple[bytes, float] | None:
+        """Return (encoded, stored_at) for an entry at most `max_stale` seconds past its TTL."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = time.time() - entry[0]
+                if age > self.ttl + self.keep_stale:
+                    self._remove(key)
+                    entry = None
+                elif age > self.ttl + max_stale:
+                    entry = None
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["hits"] += 1
+            self._entries.move_to_end(key)
+            return entry[1], entry[0]
+
+    def put(self, key: str, encoded: bytes, stored_at: float | None = None):
+        if self.ttl <= 0 or (self.max_bytes is not None and len(encoded) > self.max_bytes):
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.time() if stored_at is None else stored_at, encoded)
+            self._bytes += len(encoded)
+            while len(self._entries) > self.max_entries or (self.max_bytes is not None and self._bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+
+    def _remove(self, key: str):
+        self._bytes -= len(self._entries.pop(key)[1])
+
+    def invalidate(self, predicate) -> int:
+        """Remove every entry for which predicate(key, stored_at) is true; return how many."""
+        with self._lock:
+            keys = [key for key, (stored_at, _) in self._entries.items() if predicate(key, stored_at)]
+            for key in keys:
+                self._remove(key)
+        return len(keys)
+
+    def keys(self) -> list[str]:
+        with self._lock:
+            return list(self._entries)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries), bytes=self._bytes, max_bytes=self.max_bytes)
+
+
+# An expired entry younger than stale_ttl past its TTL is served at once and
+# refreshed in the background; one younger than stale_if_error is served only
+# when the upstream is unavailable.
+stale_ttl = float(os.environ.get("CONGRESS_GOV_STALE_TTL", "3600"))
+stale_if_error = float(os.environ.get("CONGRESS_GOV_STALE_IF_ERROR", "86400"))
+
+_cache = _ResponseCache(
+    ttl=float(os.environ.get("CONGRESS_GOV_CACHE_TTL", "300")),
+    max_entries=int(os.environ.get("CONGRESS_GOV_CACHE_MAX_ENTRIES", "1024")),
+    keep_stale=max(stale_ttl, stale_if_error),
+    max_bytes=int(os.environ.get("CONGRESS_GOV_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+)
+
+
+class _DiskCache:
+    """
+    Compressed responses kept on disk, so they survive a restart and a long
+    history fits in little space.
+
+    Entries are zstd-compressed when zstandard is installed (zlib otherwise)
+    and evicted least recently used first once they exceed `max_bytes`.
+    """
+
+    _HEADER = struct.Struct("<dI")  # stored_at, length of the key that follows
+
+    def __init__(self, directory: str, ttl: float, max_bytes: int, keep_stale: float = 0):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.keep_stale = keep_stale
+        self.compression = "zstd" if zstandard is not None else "zlib"
+        self._files = OrderedDict()  # path -> size, least recently used first
+        self._bytes = 0
+        self._stats = Counter()
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        existing = []
+        for name in os.listdir(directory):
+            if name.endswith((".zst", ".z")):
+                stat = os.stat(os.path.join(directory, name))
+                existing.append((stat.st_mtime, name, stat.st_size))
+        for _, name, size in sorted(existing):
+            self._files[os.path.join(directory, name)] = size
+            self._bytes += size
+
+    def _path(self, key: str, compression: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest() + (".zst" if compression == "zstd" else ".z"))
+
+    @staticmethod
+    def _decompress(path: str, data: bytes) -> bytes:
+        if path.endswith(".zst"):
+            return zstandard.ZstdDecompressor().decompress(data)
+        return zlib.decompress(data)
+
+    def get(self, key: str) -> bytes | None:
+        entry = self.get_stale(key, max_stale=0)
+        return None if entry is None else entry[0]
+
+    def get_stale(self, key: str, max_stale: float) -> tuple[bytes, float] | None:
+        for compression in ("zstd", "zlib") if zstandard is not None else ("zlib",):
+            path = self._path(key, compression)
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+            except OSError:
+                continue
+            stored_at, key_length = self._HEADER.unpack_from(data)
+            age = time.time() - stored_at
+            if age > self.ttl + self.keep_stale:
+                self._delete(path)
+            elif age <= self.ttl + max_stale:
+                with self._lock:
+                    self._stats["hits"] += 1
+                    if path in self._files:
+                        self._files.move_to_end(path)
+                return self._decompress(path, data[self._HEADER.size + key_length:]), stored_at
+            break
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    def put(self, key: str, encoded: bytes, stored_at: float | None = None):
+        if self.ttl <= 0:
+            return
+        if zstandard is not None:
+            compressed = zstandard.ZstdCompressor(level=3).compress(encoded)
+        else:
+            compressed = zlib.compress(encoded, 6)
+        key_bytes = key.encode()
+        data = self._HEADER.pack(time.time() if stored_at is None else stored_at, len(key_bytes)) + key_bytes + compressed
+        if len(data) > self.max_bytes:
+            return
+        path = self._path(key, self.compression)
+        # Write then rename, so a concurrent reader never sees a partial file.
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        evicted = []
+        with self._lock:
+            self._bytes += len(data) - self._files.pop(path, 0)
+            self._files[path] = len(data)
+            while self._bytes > self.max_bytes:
+                old, size = self._files.popitem(last=False)
+                self._bytes -= size
+                self._stats["evictions"] += 1
+                evicted.append(old)
+        for old in evicted:
+            self._unlink(old)
+
+    def invalidate(self, predicate) -> int:
+        """Remove every entry for which predicate(key, stored_at) is true; return how many."""
+        with self._lock:
+            paths = list(self._files)
+        removed = 0
+        for path in paths:
+            try:
+                with open(path, "rb") as f:
+                    header = f.read(self._HEADER.size)
+                    stored_at, key_length = self._HEADER.unpack(header)
+                    key = f.read(key_length).decode()
+            except (OSError, struct.error, UnicodeDecodeError):
+                continue
+            if predicate(key, stored_at):
+                self._delete(path)
+                removed += 1
+        return removed
+
+    def _delete(self, path: str):
+        with self._lock:
+            self._bytes -= self._files.pop(path, 0)
+        self._unlink(path)
+
+    @staticmethod
+    def _unlink(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats, entries=len(self._files), bytes=self._bytes, max_bytes=self.max_bytes,
+                        compression=self.compression)
+
+
+# Unset by default: responses are only cached in memory.
+cache_dir = os.environ.get("CONGRESS_GOV_CACHE_DIR")
+_disk_cache = _DiskCache(
+    os.path.abspath(cache_dir),
+    ttl=float(os.environ.get("CONGRESS_GOV_DISK_CACHE_TTL", "86400")),
+    max_bytes=int(os.environ.get("CONGRESS_GOV_DISK_CACHE_MAX_BYTES", str(1024 * 1024 * 1024))),
+    keep_stale=max(stale_ttl, stale_if_error)
+) if cache_dir else None
+
+
+_UPSTREAM_MAX_LIMIT = 250
+# What Congress.gov assumes for a parameter that is left out.
+_PARAM_DEFAULTS = {"format": "json", "offset": 0, "limit": 20, "sort": "updateDate+desc"}
+
+
+def _canonical_params(params: dict) -> dict:
+    """`params` as Congress.gov sees them: defaults filled in, limit clamped, api_key dropped."""
+    canonical = {k: str(v) for k, v in params.items() if k != "api_key" and v is not None}
+    for k, default in _PARAM_DEFAULTS.items():
+        canonical.setdefault(k, str(default))
+    canonical["limit"] = str(min(int(canonical["limit"]), _UPSTREAM_MAX_LIMIT))
+    return canonical
+
+
+def _key(url: str, canonical: dict, fields: list[str] | None) -> str:
+    key = f"{url.rstrip('/')}?{urlencode(sorted(canonical.items()))}"
+    if fields:
+        key += "#" + ",".join(sorted(set(fields)))
+    return key
+
+
+def _cache_key(url: str, params: dict, fields: list[str] | None = None) -> str:
+    """
+    Cache key for a request. Requests Congress.gov answers identically map to
+    one key, whatever their parameter order, spelled-out defaults or api_key.
+    """
+    return _key(url, _canonical_params(params), fields)
+
+
+class _PageIndex:
+    """
+    Where cached list pages sit in their list, so a request for a sub-range
+    (say offset=40, limit=10) can be cut out of a cached larger page
+    (offset=0, limit=100) instead of going upstream.
+    """
+
+    max_lists = 4096
+
+    def __init__(self):
+        self._lists = OrderedDict()  # key without offset/limit -> {(offset, limit): page key}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _locate(url: str, params: dict, fields: list[str] | None) -> tuple[str, int, int]:
+        canonical = _canonical_params(params)
+        offset, limit = int(canonical.pop("offset")), int(canonical.pop("limit"))
+        return _key(url, canonical, fields), offset, limit
+
+    def add(self, key: str, url: str, params: dict, fields: list[str] | None):
+        base, offset, limit = self._locate(url, params, fields)
+        with self._lock:
+            self._lists.setdefault(base, {})[(offset, limit)] = key
+            self._lists.move_to_end(base)
+            while len(self._lists) > self.max_lists:
+                self._lists.popitem(last=False)
+
+    def slice(self, url: str, params: dict, fields: list[str] | None) -> dict | None:
+        """The requested page cut from a cached page that covers it, or None."""
+        base, offset, limit = self._locate(url, params, fields)
+        with self._lock:
+            pages = list(self._lists.get(base, {}).items())
+        for (page_offset, _), page_key in pages:
+            if page_offset > offset:
+                continue
+            encoded = _cache.get(page_key)
+            if encoded is None:
+                continue
+            data = _json_loads(encoded)
+            records_key = _records_key(data)
+            pagination = data.get("pagination")
+            if records_key is None or not isinstance(data[records_key], list) or not isinstance(pagination, dict):
+                continue
+            records = data[records_key]
+            total = pagination.get("count", page_offset + len(records))
+            if min(offset + limit, total) > page_offset + len(records):
+                continue
+            data[records_key] = records[offset - page_offset:offset - page_offset + limit]
+            cursor = _cursor(url, dict(params, limit=limit), fields, offset, data[records_key], total)
+            data["pagination"] = _pagination(url, params, offset, limit, total, cursor)
+            return data
+        return None
+
+
+def _pagination(url: str, params: dict, offset: int, limit: int, total: int, cursor: str | None = None) -> dict:
+    """A pagination block like Congress.gov's for the page at `offset`."""
+    query = {k: v for k, v in params.items() if k not in ("api_key", "offset", "limit")}
+    pagination = {"count": total}
+    if offset + limit < total:
+        pagination["next"] = f"{url}?{urlencode(dict(query, offset=offset + limit, limit=limit))}"
+    if offset > 0:
+        pagination["prev"] = f"{url}?{urlencode(dict(query, offset=max(offset - limit, 0), limit=limit))}"
+    if cursor is not None:
+        pagination["cursor"] = cursor
+    return pagination
+
+
+_page_index = _PageIndex()
+
+
+_inflight = {}  # cache key -> Future shared by every caller waiting on that key
+_inflight_lock = threading.Lock()
+
+
+def _wait(future: Future):
+    """Wait for a shared fetch, giving up when our own call is cancelled or out of time."""
+    scope = _scope.get()
+    while True:
+        if scope is not None:
+            scope.check()
+        try:
+            return future.result(timeout=0.1 if scope is not None else None)
+        except TimeoutError:
+            continue
+
+
+def _load(key: str, url: str, params: dict, fields: list[str] | None = None) -> dict:
+    """Fetch `key` upstream and cache it, sharing one request between concurrent callers."""
+    while True:
+        with _inflight_lock:
+            future = _inflight.get(key)
+            owner = future is None
+            if owner:
+                future = _inflight[key] = Future()
+        if not owner:
+            try:
+                return _wait(future)
+            except _Cancelled:
+                if _scope.get() is not None and _scope.get().cancelled.is_set():
+                    raise
+                # The call we joined was abandoned; fetch it ourselves.
+                continue
+        try:
+            data = _get_json(url, params, fields=fields)
+            pagination = data.get("pagination")
+            if isinstance(pagination, dict):
+                for link in ("next", "prev"):
+                    if isinstance(pagination.get(link), str):
+                        pagination[link] = _without_key(pagination[link])
+                if _records_key(data) is not None:
+                    cursor = _cursor(url, params, fields, int(params.get("offset", 0)), _records(data), pagination.get("count"))
+                    if cursor is not None:
+                        pagination["cursor"] = cursor
+            _known_ids.observe_page(url, params, data)
+            if _mirror is not None:
+                _mirror.ingest(url, data)
+            encoded = _json_dumps(data)
+            _cache.put(key, encoded)
+            if isinstance(data.get("pagination"), dict):
+                _page_index.add(key, url, params, fields)
+            if _disk_cache is not None:
+                _disk_cache.put(key, encoded)
+            result = _EncodedResult(data, encoded)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with _inflight_lock:
+                _inflight.pop(key, None)
+
+
+class _NextPagePrefetcher:
+    """
+    After page N of a list is served, fetch page N+1 in the background.
+
+    Pages land in the response cache, so an agent paging sequentially finds
+    the next page already there (or joins its in-flight request). A pending
+    prefetch is cancelled as soon as the same list is requested at any other
+    offset, and nothing is prefetched once the quota falls to the reserve.
+    """
+
+    max_streams = 256
+
+    def __init__(self, max_workers: int):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self._pending = OrderedDict()  # list key (no offset) -> (page key, scope, future)
+        self._lock = threading.Lock()
+
+    def after_page(self, key: str, url: str, params: dict, fields: list[str] | None, result: dict):
+        pagination = result.get("pagination")
+        if not isinstance(pagination, dict) or "offset" not in params:
+            return
+        stream = _cache_key(url, {k: v for k, v in params.items() if k != "offset"}, fields)
+        next_params = dict(params, offset=params["offset"] + params["limit"])
+        next_key = _cache_key(url, next_params, fields)
+
+        with self._lock:
+            previous = self._pending.pop(stream, None)
+            if previous is not None:
+                page_key, scope, future = previous
+                if page_key == key:
+                    _count("prefetch_used")
+                elif future.done():
+                    _count("prefetch_unused")
+                else:
+                    scope.cancel()
+                    future.cancel()
+                    _count("prefetch_cancelled")
+            if not pagination.get("next") or next_key in _cache or next_key in _inflight:
+                return
+            if not _quota.spend_spare():
+                _count("prefetch_skipped_quota")
+                return
+            scope = _CallScope()
+            future = self._executor.submit(self._run, next_key, url, next_params, fields, scope)
+            self._pending[stream] = (next_key, scope, future)
+            while len(self._pending) > self.max_streams:
+                self._pending.popitem(last=False)[1][1].cancel()
+
+    def _run(self, key, url, params, fields, scope):
+        token = _scope.set(scope)
+        try:
+            _load(key, url, params, fields)
+            _count("prefetch_completed")
+        except _Cancelled:
+            pass
+        except requests.exceptions.RequestException:
+            _count("prefetch_failed")
+        finally:
+            _scope.reset(token)
+
+
+_prefetcher = None
+if os.environ.get("CONGRESS_GOV_PREFETCH", "").lower() in ("1", "true", "yes"):
+    _prefetcher = _NextPagePrefetcher(max_workers=int(os.environ.get("CONGRESS_GOV_PREFETCH_WORKERS", "2")))
+
+
+# What every tool sends for a single-record lookup with default arguments, so
+# speculative detail fetches share cache keys with the agent's own follow-ups.
+_DETAIL_PARAMS = {"format": "json", "offset": 0, "limit": 20}
+
+
+def _records_key(data: dict) -> str | None:
+    """Name of the record array in a list response (None for single-record responses)."""
+    for key, value in data.items():
+        if isinstance(value, list):
+            return key
+        if key in _ENVELOPE_KEYS and isinstance(value, dict) and _records_key(value):
+            return key
+    return None
+
+
+def _records(data: dict) -> list:
+    """The record array of a list response ([] for single-record responses)."""
+    key = _records_key(data)
+    if key is None:
+        return []
+    value = data[key]
+    return _records(value) if isinstance(value, dict) else value
+
+
+class _DetailPrefetcher:
+    """
+    Warm the detail records of items returned in a list response.
+
+    Items are ranked by how often agents have looked them up before, then by
+    list position. How many are warmed per list (up to top_k) follows the
+    share of earlier speculative fetches for that endpoint that were actually
+    requested afterwards, starting from an even prior.
+    """
+
+    max_tracked = 10000
+
+    def __init__(self, top_k: int, max_workers: int):
+        self.top_k = top_k
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="detail-prefetch")
+        self._popularity = Counter()  # detail url -> lookups
+        self._speculated = OrderedDict()  # cache key -> endpoint, until looked up
+        self._issued = Counter()
+        self._used = Counter()
+        self._lock = threading.Lock()
+
+    def record_lookup(self, key: str, url: str):
+        with self._lock:
+            self._popularity[url] += 1
+            if len(self._popularity) > self.max_tracked:
+                # Halve every score so old favourites fade and the table stays bounded.
+                self._popularity = Counter({u: n // 2 for u, n in self._popularity.items() if n > 1})
+            endpoint = self._speculated.pop(key, None)
+            if endpoint is not None:
+                self._used[endpoint] += 1
+                _count("detail_prefetch_used")
+
+    def _budget(self, endpoint: str) -> int:
+        hit_rate = (self._used[endpoint] + 1) / (self._issued[endpoint] + 2)
+        return max(1, round(self.top_k * hit_rate))
+
+    def after_list(self, records: list):
+        urls = [r["url"].split("?")[0] for r in records
+                if isinstance(r, dict) and isinstance(r.get("url"), str) and r["url"].startswith(_API_BASE)]
+        if not urls:
+            return
+        endpoint = urls[0][len(_API_BASE):].split("/")[0]
+        params = dict(_DETAIL_PARAMS, api_key=congress_gov_api_key)
+
+        with self._lock:
+            budget = self._budget(endpoint)
+            ranked = sorted(enumerate(urls), key=lambda item: (-self._popularity[item[1]], item[0]))
+            for _, url in ranked:
+                if budget == 0:
+                    break
+                key = _cache_key(url, params)
+                if key in self._speculated or key in _inflight or key in _cache:
+                    continue
+                budget -= 1
+                if not _quota.spend_spare():
+                    _count("detail_prefetch_skipped_quota")
+                    break
+                self._speculated[key] = endpoint
+                while len(self._speculated) > self.max_tracked:
+                    self._speculated.popitem(last=False)
+                self._issued[endpoint] += 1
+                self._executor.submit(self._run, key, url, params)
+
+    def _run(self, key, url, params):
+        try:
+            _load(key, url, params)
+            _count("detail_prefetch_completed")
+        except requests.exceptions.RequestException:
+            _count("detail_prefetch_failed")
+
+
+_detail_prefetcher = None
+if int(os.environ.get("CONGRESS_GOV_DETAIL_PREFETCH", "0")) > 0:
+    _detail_prefetcher = _DetailPrefetcher(
+        top_k=int(os.environ["CONGRESS_GOV_DETAIL_PREFETCH"]),
+        max_workers=int(os.environ.get("CONGRESS_GOV_DETAIL_PREFETCH_WORKERS", "4"))
+    )
+
+
+class _BloomFilter:
+    """Fixed-size Bloom filter of strings: no false negatives, ~1% false positives at 100k items."""
+
+    def __init__(self, bits: int = 1 << 20, hashes: int = 7):
+        self.bits = bits
+        self.hashes = hashes
+        self._array = bytearray(bits // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self._array[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._array[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+# List parameters that page or order a list without narrowing it.
+_UNFILTERED_PARAMS = {"api_key", "format", "offset", "limit", "sort"}
+
+
+def _api_path(url: str) -> str:
+    return url[len(_API_BASE):].split("?")[0].strip("/").lower()
+
+
+class _KnownIds:
+    """
+    Detail paths (such as "bill/118/hr/1") seen in complete listings.
+
+    Once every page of a list such as /bill/118 has been seen, a lookup one
+    level below it that is not in the filter cannot exist and is rejected
+    without calling Congress.gov. Completeness expires after `ttl` seconds so
+    records added upstream since are not rejected for long.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._filter = _BloomFilter()
+        self._complete = {}  # list path -> (completed_at, depths of its record paths)
+        self._lock = threading.Lock()
+
+    def observe(self, url: str, records: list) -> set:
+        """Add the detail paths of `records`; return the depths of those under the list."""
+        prefix = _api_path(url) + "/"
+        depths = set()
+        with self._lock:
+            for record in records:
+                if isinstance(record, dict) and isinstance(record.get("url"), str) and record["url"].startswith(_API_BASE):
+                    path = _api_path(record["url"])
+                    if path.startswith(prefix):
+                        self._filter.add(path)
+                        depths.add(path.count("/") + 1)
+        return depths
+
+    def complete(self, url: str, params: dict, depths: set):
+        if self.ttl > 0 and depths and set(params) <= _UNFILTERED_PARAMS:
+            with self._lock:
+                self._complete[_api_path(url)] = (time.time(), depths)
+
+    def observe_page(self, url: str, params: dict, data: dict):
+        records = _records(data)
+        depths = self.observe(url, records)
+        total = data.get("pagination", {}).get("count") if isinstance(data.get("pagination"), dict) else None
+        if int(params.get("offset", 0)) == 0 and total is not None and total <= len(records):
+            self.complete(url, params, depths)
+
+    def rejects(self, url: str) -> bool:
+        """Whether `url` is a detail lookup that a complete listing shows cannot exist."""
+        path = _api_path(url)
+        segments = path.split("/")
+        with self._lock:
+            for i in range(1, len(segments)):
+                entry = self._complete.get("/".join(segments[:i]))
+                if entry is None:
+                    continue
+                if time.time() - entry[0] > self.ttl:
+                    del self._complete["/".join(segments[:i])]
+                    continue
+                if len(segments) in entry[1] and path not in self._filter:
+                    return True
+        return False
+
+
+_negative_cache = _ResponseCache(
+    ttl=float(os.environ.get("CONGRESS_GOV_NEGATIVE_TTL", "300")),
+    max_entries=4096
+)
+# Completeness ages out with the listing that proved it, so a record added
+# upstream since is not turned away for longer than a cached 404 would be.
+_known_ids = _KnownIds(ttl=float(os.environ.get("CONGRESS_GOV_KNOWN_IDS_TTL", _negative_cache.ttl)))
+
+
+_MIRROR_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bills (
+    congress INTEGER NOT NULL, type TEXT NOT NULL, number INTEGER NOT NULL,
+    title TEXT, origin_chamber TEXT, introduced_date TEXT, policy_area TEXT,
+    latest_action_date TEXT, latest_action_text TEXT, update_date TEXT,
+    PRIMARY KEY (congress, type, number)
+);
+CREATE INDEX IF NOT EXISTS bills_update_date ON bills (update_date);
+CREATE INDEX IF NOT EXISTS bills_policy_area ON bills (policy_area);
+
+CREATE TABLE IF NOT EXISTS actions (
+    congress INTEGER NOT NULL, type TEXT NOT NULL, number INTEGER NOT NULL,
+    action_date TEXT, action_code TEXT, action_type TEXT, source TEXT, text TEXT,
+    UNIQUE (congress, type, number, action_date, action_code, text)
+);
+CREATE INDEX IF NOT EXISTS actions_bill ON actions (congress, type, number, action_date);
+
+CREATE TABLE IF NOT EXISTS sponsors (
+    congress INTEGER NOT NULL, type TEXT NOT NULL, number INTEGER NOT NULL,
+    bioguide_id TEXT NOT NULL, party TEXT, state TEXT,
+    PRIMARY KEY (congress, type, number, bioguide_id)
+);
+CREATE INDEX IF NOT EXISTS sponsors_member ON sponsors (bioguide_id);
+
+CREATE TABLE IF NOT EXISTS cosponsors (
+    congress INTEGER NOT NULL, type TEXT NOT NULL, number INTEGER NOT NULL,
+    bioguide_id TEXT NOT NULL, party TEXT, state TEXT,
+    sponsorship_date TEXT, is_original INTEGER, withdrawn_date TEXT,
+    PRIMARY KEY (congress, type, number, bioguide_id)
+);
+CREATE INDEX IF NOT EXISTS cosponsors_member ON cosponsors (bioguide_id);
+
+CREATE TABLE IF NOT EXISTS members (
+    bioguide_id TEXT PRIMARY KEY, name TEXT, party TEXT, state TEXT, district INTEGER,
+    chamber TEXT, current_member INTEGER, update_date TEXT
+);
+CREATE INDEX IF NOT EXISTS members_party_state ON members (party, state);
+
+CREATE TABLE IF NOT EXISTS votes (
+    congress INTEGER NOT NULL, session INTEGER NOT NULL, roll_call INTEGER NOT NULL,
+    date TEXT, question TEXT, vote_type TEXT, result TEXT,
+    legislation_type TEXT, legislation_number TEXT,
+    PRIMARY KEY (congress, session, roll_call)
+);
+CREATE INDEX IF NOT EXISTS votes_date ON votes (date);
+CREATE INDEX IF NOT EXISTS votes_legislation ON votes (legislation_type, legislation_number);
+
+CREATE TABLE IF NOT EXISTS committees (
+    system_code TEXT PRIMARY KEY, name TEXT, chamber TEXT, committee_type TEXT,
+    parent_system_code TEXT, update_date TEXT
+);
+CREATE INDEX IF NOT EXISTS committees_parent ON committees (parent_system_code);
+
+CREATE TABLE IF NOT EXISTS nominations (
+    congress INTEGER NOT NULL, number INTEGER NOT NULL, part TEXT NOT NULL DEFAULT '',
+    citation TEXT, description TEXT, organization TEXT, received_date TEXT,
+    latest_action_date TEXT, latest_action_text TEXT, update_date TEXT,
+    PRIMARY KEY (congress, number, part)
+);
+CREATE INDEX IF NOT EXISTS nominations_received_date ON nominations (received_date);
+"""
+
+_MIRROR_KEYS = {
+    "bills": ("congress", "type", "number"),
+    "actions": None,
+    "sponsors": ("congress", "type", "number", "bioguide_id"),
+    "cosponsors": ("congress", "type", "number", "bioguide_id"),
+    "members": ("bioguide_id",),
+    "votes": ("congress", "session", "roll_call"),
+    "committees": ("system_code",),
+    "nominations": ("congress", "number", "part")
+}
+
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _items(value) -> list:
+    """Congress.gov nests some arrays as {"item": [...]}."""
+    if isinstance(value, dict):
+        value = value.get("item", [])
+    return [v for v in value if isinstance(v, dict)] if isinstance(value, list) else []
+
+
+def _action(record: dict) -> tuple:
+    action = record.get("latestAction") if isinstance(record.get("latestAction"), dict) else {}
+    return action.get("actionDate"), action.get("text")
+
+
+class _Mirror:
+    """
+    Typed SQLite tables of the records that pass through the server.
+
+    Every upstream response for bills (and their actions and cosponsors),
+    members, House roll-call votes, committees and nominations is upserted,
+    so the tables grow with use, warm-up and exports. Columns missing from
+    a response (a list item lacks a bill's sponsors, say) keep what an earlier
+    response stored. The database stops growing at max_bytes; responses that
+    would add rows past it are skipped (counted as mirror_full).
+    """
+
+    def __init__(self, path: str | None, max_bytes: int = 64 * 1024 * 1024):
+        # A named in-memory database is shared by every connection that opens the same URI.
+        self.uri = f"file:{path}" if path else f"file:congress_gov_mirror_{id(self)}?mode=memory&cache=shared"
+        self._conn = sqlite3.connect(self.uri, uri=True, check_same_thread=False)
+        page_size = self._conn.execute("PRAGMA page_size").fetchone()[0]
+        self._conn.execute(f"PRAGMA max_page_count = {max(max_bytes // page_size, 64)}")
+        self._conn.executescript(_MIRROR_SCHEMA)
+        self._lock = threading.Lock()
+
+    def _upsert(self, table: str, rows: list[dict]):
+        if not rows:
+            return
+        columns = list(rows[0])
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        keys = _MIRROR_KEYS[table]
+        if keys is None:
+            sql += " ON CONFLICT DO NOTHING"
+        else:
+            updates = [f"{c} = COALESCE(excluded.{c}, {c})" for c in columns if c not in keys]
+            sql += f" ON CONFLICT ({', '.join(keys)}) DO " + (f"UPDATE SET {', '.join(updates)}" if updates else "NOTHING")
+        self._conn.executemany(sql, [tuple(row[c] for c in columns) for row in rows])
+
+    def ingest(self, url: str, data: dict):
+        """Upsert the records of one Congress.gov response."""
+        segments = _api_path(url).split("/")
+        tables = {}
+        try:
+            _mirror_rows(segments, data, tables)
+        except (AttributeError, KeyError, TypeError, ValueError):
+            _count("mirror_skipped")
+            return
+        try:
+            with self._lock, self._conn:
+                for table, rows in tables.items():
+                    keys = _MIRROR_KEYS[table] or ("congress", "type", "number")
+                    self._upsert(table, [row for row in rows if all(row[k] is not None for k in keys)])
+        except sqlite3.Error as e:
+            _count("mirror_full" if getattr(e, "sqlite_errorcode", None) == sqlite3.SQLITE_FULL else "mirror_errors")
+
+    def query(self, sql: str, max_rows: int, timeout: float) -> dict:
+        """Run one read-only statement on a separate, sandboxed connection."""
+        conn = sqlite3.connect(self.uri, uri=True)
+        try:
+            conn.execute("PRAGMA query_only = ON")
+            # Shared-cache readers would otherwise wait on the ingest writer's table locks.
+            conn.execute("PRAGMA read_uncommitted = ON")
+            conn.set_authorizer(_mirror_authorizer)
+            deadline = time.monotonic() + timeout
+            conn.set_progress_handler(lambda: time.monotonic() > deadline, 10000)
+            started = time.monotonic()
+            cursor = conn.execute(sql)
+            rows = cursor.fetchmany(max_rows + 1)
+            return {
+                "columns": [column[0] for column in cursor.description or []],
+                "rows": [list(row) for row in rows[:max_rows]],
+                "truncated": len(rows) > max_rows,
+                "elapsed_ms": round((time.monotonic() - started) * 1000, 2)
+            }
+        finally:
+            conn.close()
+
+
+_MIRROR_ALLOWED = {sqlite3.SQLITE_SELECT, sqlite3.SQLITE_READ, sqlite3.SQLITE_FUNCTION, sqlite3.SQLITE_RECURSIVE}
+
+
+def _mirror_authorizer(action, arg1, arg2, db_name, source):
+    return sqlite3.SQLITE_OK if action in _MIRROR_ALLOWED else sqlite3.SQLITE_DENY
+
+
+def _bill_row(record: dict, congress: str | None = None, bill_type: str | None = None) -> dict:
+    action_date, action_text = _action(record)
+    policy_area = record.get("policyArea")
+    return {
+        "congress": _int(record.get("congress", congress)),
+        "type": str(record.get("type") or bill_type or "").lower() or None,
+        "number": _int(record.get("number")),
+        "title": record.get("title"),
+        "origin_chamber": record.get("originChamber"),
+        "introduced_date": record.get("introducedDate"),
+        "policy_area": policy_area.get("name") if isinstance(policy_area, dict) else None,
+        "latest_action_date": action_date,
+        "latest_action_text": action_text,
+        "update_date": record.get("updateDate")
+    }
+
+
+def _member_row(record: dict) -> dict:
+    terms = _items(record.get("terms"))
+    party = record.get("partyName")
+    if party is None and _items(record.get("partyHistory")):
+        party = _items(record.get("partyHistory"))[-1].get("partyName")
+    return {
+        "bioguide_id": record["bioguideId"],
+        "name": record.get("name") or record.get("directOrderName"),
+        "party": party,
+        "state": record.get("state"),
+        "district": _int(record.get("district")),
+        "chamber": terms[-1].get("chamber") if terms else None,
+        "current_member": None if record.get("currentMember") is None else int(bool(record["currentMember"])),
+        "update_date": record.get("updateDate")
+    }
+
+
+def _mirror_rows(segments: list[str], data: dict, tables: dict):
+    """Collect mirror rows, by table, from the response for the path `segments`."""
+    endpoint = segments[0]
+
+    def add(table, row):
+        tables.setdefault(table, []).append(row)
+
+    if endpoint == "bill":
+        if len(segments) == 5 and segments[4] in ("actions", "cosponsors"):
+            congress, bill_type, number = int(segments[1]), segments[2], int(segments[3])
+            bill = {"congress": congress, "type": bill_type, "number": number}
+            if segments[4] == "actions":
+                for action in _items(data.get("actions")):
+                    source = action.get("sourceSystem")
+                    add("actions", dict(bill, action_date=action.get("actionDate"), action_code=action.get("actionCode"),
+                                        action_type=action.get("type"), text=action.get("text"),
+                                        source=source.get("name") if isinstance(source, dict) else None))
+            else:
+                for cosponsor in _items(data.get("cosponsors")):
+                    add("cosponsors", dict(bill, bioguide_id=cosponsor["bioguideId"], party=cosponsor.get("party"),
+                                           state=cosponsor.get("state"), sponsorship_date=cosponsor.get("sponsorshipDate"),
+                                           is_original=_int(cosponsor.get("isOriginalCosponsor")),
+                                           withdrawn_date=cosponsor.get("sponsorshipWithdrawnDate")))
+        elif isinstance(data.get("bill"), dict):
+            row = _bill_row(data["bill"])
+            add("bills", row)
+            for sponsor in _items(data["bill"].get("sponsors")):
+                add("sponsors", {"congress": row["congress"], "type": row["type"], "number": row["number"],
+                                 "bioguide_id": sponsor["bioguideId"], "party": sponsor.get("party"),
+                                 "state": sponsor.get("state")})
+        else:
+            for bill in _items(data.get("bills")):
+                add("bills", _bill_row(bill, *segments[1:3]))
+    elif endpoint == "member":
+        members = [data["member"]] if isinstance(data.get("member"), dict) else _items(data.get("members"))
+        for member in members:
+            add("members", _member_row(member))
+    elif endpoint == "house-vote":
+        votes = [data["houseRollCallVote"]] if isinstance(data.get("houseRollCallVote"), dict) \
+            else _items(data.get("houseRollCallVotes"))
+        for vote in votes:
+            add("votes", {
+                "congress": _int(vote.get("congress")),
+                "session": _int(vote.get("sessionNumber")),
+                "roll_call": _int(vote.get("rollCallNumber")),
+                "date": vote.get("startDate"),
+                "question": vote.get("voteQuestion"),
+                "vote_type": vote.get("voteType"),
+                "result": vote.get("result"),
+                "legislation_type": vote.get("legislationType"),
+                "legislation_number": vote.get("legislationNumber")
+            })
+    elif endpoint == "committee":
+        committees = [data["committee"]] if isinstance(data.get("committee"), dict) else _items(data.get("committees"))
+        for committee in committees:
+            parent = committee.get("parent")
+            history = _items(committee.get("history"))
+            add("committees", {
+                "system_code": committee["systemCode"],
+                "name": committee.get("name") or (history[-1].get("officialName") if history else None),
+                "chamber": committee.get("chamber"),
+                "committee_type": committee.get("committeeTypeCode") or committee.get("type"),
+                "parent_system_code": parent.get("systemCode") if isinstance(parent, dict) else None,
+                "update_date": committee.get("updateDate")
+            })
+    elif endpoint == "nomination":
+        nominations = [data["nomination"]] if isinstance(data.get("nomination"), dict) else _items(data.get("nominations"))
+        for nomination in nominations:
+            action_date, action_text = _action(nomination)
+            add("nominations", {
+                "congress": _int(nomination.get("congress")),
+                "number": _int(nomination.get("number")),
+                "part": str(nomination.get("partNumber") or ""),
+                "citation": nomination.get("citation"),
+                "description": nomination.get("description"),
+                "organization": nomination.get("organization"),
+                "received_date": nomination.get("receivedDate"),
+                "latest_action_date": action_date,
+                "latest_action_text": action_text,
+                "update_date": nomination.get("updateDate")
+            })
+
+
+mirror_enabled = os.environ.get("CONGRESS_GOV_MIRROR", "0") == "1"
+_mirror = _Mirror(
+    os.environ.get("CONGRESS_GOV_MIRROR_PATH"),
+    max_bytes=int(os.environ.get("CONGRESS_GOV_MIRROR_MAX_MB", "64")) * 1024 * 1024
+) if mirror_enabled else None
+
+
+def _not_found(url: str) -> requests.exceptions.HTTPError:
+    """The error a 404 from Congress.gov would have raised, without making the request."""
+    response = requests.Response()
+    response.status_code = 404
+    response.reason = "Not Found"
+    response.url = url
+    return requests.exceptions.HTTPError(f"404 Client Error: Not Found for url: {url}", response=response)
+
+
+class _CacheUsage:
+    """Cache hits and misses per endpoint, and the most requested keys."""
+
+    max_keys = 10000
+
+    def __init__(self):
+        self._endpoints = {}  # endpoint -> Counter of hits/misses
+        self._keys = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, url: str, key: str, hit: bool):
+        endpoint = _api_path(url).split("/")[0]
+        with self._lock:
+            self._endpoints.setdefault(endpoint, Counter())["hits" if hit else "misses"] += 1
+            self._keys[key] += 1
+            if len(self._keys) > self.max_keys:
+                # Halve every count so the table stays bounded and old keys fade.
+                self._keys = Counter({k: n // 2 for k, n in self._keys.items() if n > 1})
+
+    def report(self, top: int) -> dict:
+        with self._lock:
+            endpoints = {
+                endpoint: dict(counts, hit_ratio=round(counts["hits"] / (counts["hits"] + counts["misses"]), 3))
+                for endpoint, counts in sorted(self._endpoints.items())
+            }
+            top_keys = [{"key": key, "requests": n} for key, n in self._keys.most_common(top)]
+        return {"endpoints": endpoints, "top_keys": top_keys}
+
+
+_usage = _CacheUsage()
+
+_revalidator = ThreadPoolExecutor(max_workers=2, thread_name_prefix="revalidate")
+_revalidating = set()  # cache keys with a background refresh queued or running
+_revalidating_lock = threading.Lock()
+
+
+def _revalidate(key: str, url: str, params: dict, fields: list[str] | None):
+    """Refresh an expired entry in the background, at most once at a time per key."""
+    with _revalidating_lock:
+        if key in _revalidating:
+            return
+        _revalidating.add(key)
+
+    def refresh():
+        try:
+            _load(key, url, params, fields)
+            _count("revalidations")
+        except Exception:
+            _count("revalidation_failures")
+        finally:
+            with _revalidating_lock:
+                _revalidating.discard(key)
+
+    _revalidator.submit(refresh)
+
+
+def _stale_entry(key: str, max_stale: float) -> tuple[bytes, float] | None:
+    entry = _cache.get_stale(key, max_stale)
+    if entry is None and _disk_cache is not None:
+        entry = _disk_cache.get_stale(key, max_stale)
+    return entry
+
+
+def _stale_result(entry: tuple[bytes, float], reason: str) -> dict:
+    """An expired response, flagged with its age so callers know it may be out of date."""
+    encoded, stored_at = entry
+    data = _json_loads(encoded)
+    data["cache"] = {"stale": True, "age_seconds": int(time.time() - stored_at), "reason": reason}
+    _count("stale_served")
+    return _EncodedResult(data, _json_dumps(data))
+
+
+def _fetch(url: str, params: dict, fields: list[str] | None = None, fresh: bool = False) -> dict:
+    """
+    Return a cached response, or fetch it and cache its encoded form.
+
+    An entry that expired less than stale_ttl ago is returned at once (flagged
+    as stale) while it is refreshed in the background. If the upstream is
+    unavailable, an entry up to stale_if_error past its TTL is returned instead
+    of the error. With fresh=True, as used to refresh local indexes, the
+    response is never older than the memory cache's TTL: the disk tier and
+    expired entries are skipped and upstream errors are raised.
+    """
+    if "limit" in params:
+        params = dict(params, limit=min(int(params["limit"]), _UPSTREAM_MAX_LIMIT))
+    key = _cache_key(url, params, fields)
+    encoded = _cache.get(key)
+    if encoded is None:
+        sliced = _page_index.slice(url, params, fields)
+        if sliced is not None:
+            _count("cache_slice_hits")
+            encoded = _json_dumps(sliced)
+            _cache.put(key, encoded)
+    if encoded is None and _disk_cache is not None and not fresh:
+        entry = _disk_cache.get_stale(key, max_stale=0)
+        if entry is not None:
+            _count("disk_cache_hits")
+            encoded = entry[0]
+            _cache.put(key, encoded, stored_at=entry[1])
+    if encoded is None and (_negative_cache.get(key) is not None or _known_ids.rejects(url)):
+        _count("not_found_local")
+        _usage.record(url, key, hit=True)
+        raise _not_found(url)
+    stale = None if encoded is not None or fresh or stale_ttl <= 0 else _stale_entry(key, stale_ttl)
+    _usage.record(url, key, hit=encoded is not None or stale is not None)
+    if encoded is not None:
+        _count("cache_hits")
+        result = _EncodedResult(_json_loads(encoded), encoded)
+    elif stale is not None:
+        _revalidate(key, url, params, fields)
+        result = _stale_result(stale, "revalidating")
+    else:
+        _count("cache_misses")
+        try:
+            result = _load(key, url, params, fields)
+        except requests.exceptions.RequestException as e:
+            if getattr(e.response, "status_code", None) == 404:
+                _negative_cache.put(key, b"")
+            stale = _stale_entry(key, stale_if_error) if _unavailable(e) and not fresh else None
+            if stale is None:
+                raise
+            result = _stale_result(stale, _redact(f"upstream unavailable: {e}"))
+    return result
+
+
+def _serve(url: str, params: dict, fields: list[str] | None = None) -> dict:
+    """
+    _fetch for the request a tool was asked to make, which the prefetchers then act on.
+
+    Requests tools make internally (count probes, shard and block walks,
+    expansions, index builds) go through _fetch alone, so they do not each
+    schedule a prefetch of a page nobody asked for.
+    """
+    result = _fetch(url, params, fields)
+    if "limit" in params:
+        params = dict(params, limit=min(int(params["limit"]), _UPSTREAM_MAX_LIMIT))
+    key = _cache_key(url, params, fields)
+    if _prefetcher is not None:
+        _prefetcher.after_page(key, url, params, fields, result)
+    if _detail_prefetcher is not None:
+        records = _records(result)
+        if records:
+            _detail_prefetcher.after_list(records)
+        else:
+            _detail_prefetcher.record_lookup(key, url)
+    return result
+
+
+_BYTES_PER_TOKEN = 4  # rough size of a token of JSON text
+_CURSOR_ALLOWANCE = 256  # room left in the budget for the continuation block
+
+
+class _InvalidCursor(ValueError):
+    """Raised for a continuation cursor this server did not issue."""
+
+
+def _encode_cursor(state: dict) -> str:
+    return base64.urlsafe_b64encode(_json_dumps(state)).rstrip(b"=").decode()
+
+
+def _decode_cursor(cursor: str) -> dict:
+    try:
+        state = _json_loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(state, dict) or not {"u", "p", "o", "n", "a"} <= state.keys() or not state["u"].startswith(_API_BASE):
+            raise ValueError("unexpected contents")
+        return state
+    except (ValueError, TypeError) as e:
+        raise _InvalidCursor(f"Invalid cursor: {e}") from e
+
+
+def _with_records(data: dict, records: list) -> dict:
+    """A copy of a list response with its record array replaced."""
+    key = _records_key(data)
+    value = data[key]
+    return dict(data, **{key: _with_records(value, records) if isinstance(value, dict) else records})
+
+
+# Lists documented to filter on toDateTime, with the deepest path that is
+# still such a list (bill, bill/118, bill/118/hr; not bill/118/hr/1/actions).
+# Their cursors pin later pages to the moment the first page was fetched.
+_DATED_LISTS = {
+    "bill": 3, "amendment": 3, "summaries": 3, "member": 1, "committee": 3, "committee-report": 3,
+    "committee-print": 3, "nomination": 2, "treaty": 2, "crsreport": 1
+}
+
+
+def _snapshot_params(url: str, params: dict) -> dict:
+    segments = _api_path(url).split("/")
+    if "toDateTime" in params or len(segments) > _DATED_LISTS.get(segments[0], 0):
+        return params
+    return dict(params, toDateTime=_format_datetime(datetime.now(timezone.utc)))
+
+
+def _cursor(url: str, params: dict, fields: list[str] | None, offset: int, records: list,
+            total: int | None, max_tokens: int | None = None, source: dict | None = None) -> str | None:
+    """
+    Cursor for the records after `records`, which start at `offset`; None at the end of the list.
+
+    It records the last record returned, so the next page can be lined up on
+    it even if the list shifted in between. `source` is the request of the
+    page `records` were cut from, when the cursor stops partway through it.
+    """
+    limit = int(params.get("limit", 20))
+    if not records or (total is not None and offset + len(records) >= total) or (total is None and len(records) < limit):
+        return None
+    state = {
+        "u": url,
+        "p": {k: v for k, v in _snapshot_params(url, params).items() if k not in ("api_key", "offset", "limit")},
+        "f": fields,
+        "o": offset + len(records),
+        "n": limit,
+        "a": _record_identity(records[-1]),
+        "t": max_tokens
+    }
+    if source is not None:
+        state["s"] = {k: v for k, v in source.items() if k != "api_key"}
+    return _encode_cursor(state)
+
+
+def _block_records(url: str, params: dict, fields: list[str] | None, start: int, count: int):
+    """
+    Records [start, start + count) of a list, read from full-size upstream pages.
+
+    Pages are fetched at the largest legal limit on aligned offsets, so
+    successive cursor pages are cut from the same cached responses.
+    Returns (first page, records, total).
+    """
+    first, records, total = None, [], None
+    block = start // _UPSTREAM_MAX_LIMIT
+    while True:
+        page = _fetch(url, dict(params, offset=block * _UPSTREAM_MAX_LIMIT, limit=_UPSTREAM_MAX_LIMIT), fields)
+        first = first or page
+        page_records = _records(page)
+        pagination = page.get("pagination") if isinstance(page.get("pagination"), dict) else {}
+        total = pagination.get("count", total)
+        records += page_records
+        block += 1
+        if len(page_records) < _UPSTREAM_MAX_LIMIT or block * _UPSTREAM_MAX_LIMIT >= start + count:
+            break
+    skip = start - (start // _UPSTREAM_MAX_LIMIT) * _UPSTREAM_MAX_LIMIT
+    return first, records[skip:skip + count], total
+
+
+def _rest_of_source(state: dict, params: dict) -> tuple | None:
+    """
+    The records after the cursor from the cached page it was cut from, or None.
+
+    A cursor into a budget-trimmed page continues with the rest of that page
+    while it is still cached, without a new upstream request.
+    """
+    source = state.get("s")
+    if source is None:
+        return None
+    url, fields, offset, anchor = state["u"], state.get("f"), state["o"], state["a"]
+    source = dict(source, api_key=congress_gov_api_key)
+    encoded = _cache.get(_cache_key(url, source, fields))
+    if encoded is None:
+        return None
+    page = _json_loads(encoded)
+    records = _records(page)
+    i = offset - int(source.get("offset", 0))
+    if not 0 < i < len(records) or _record_identity(records[i - 1]) != anchor:
+        return None
+    _count("cursor_source_hits")
+    data = _with_records(page, records[i:i + state["n"]])
+    pagination = page.get("pagination") if isinstance(page.get("pagination"), dict) else {}
+    data["pagination"] = {"count": pagination.get("count")}
+    return data, offset, url, dict(params, offset=offset, limit=state["n"]), fields, source
+
+
+def _resume(state: dict) -> tuple[dict, int, str, dict, list[str] | None, dict | None]:
+    """
+    The page a cursor points at, with its offset, url, params, fields and source page request.
+
+    The rest of a budget-trimmed page is served from that cached page.
+    Otherwise the record before the cursor's offset should be the last one
+    returned. If updates moved records out of the snapshot, the list has
+    shifted up; the last record is found again a little further back and the
+    page starts right after it, so nothing is skipped or repeated.
+    """
+    url, fields, offset, limit, anchor = state["u"], state.get("f"), state["o"], state["n"], state["a"]
+    params = dict(state["p"], api_key=congress_gov_api_key)
+    rest = _rest_of_source(state, params)
+    if rest is not None:
+        return rest
+    low = max(offset - 1, 0)
+    for _ in range(4):
+        _, window, _ = _block_records(url, params, fields, low, offset - low)
+        found = [i for i, record in enumerate(window) if _record_identity(record) == anchor]
+        if found:
+            offset = low + found[-1] + 1
+            break
+        if low == 0:
+            _count("cursor_anchor_lost")
+            break
+        low = max(low - _UPSTREAM_MAX_LIMIT, 0)
+    else:
+        _count("cursor_anchor_lost")
+    first, records, total = _block_records(url, params, fields, offset, limit)
+    data = _with_records(first, records)
+    data["pagination"] = {"count": total}
+    return data, offset, url, dict(params, offset=offset, limit=limit), fields, None
+
+
+def _fetch_within(url: str, params: dict, fields: list[str] | None = None, max_tokens: int | None = None,
+                  cursor: str | None = None) -> dict:
+    """
+    Like _fetch, but resumable from a cursor and trimmed to `max_tokens`.
+
+    With a budget, only as many records as fit are returned and the cursor in
+    the continuation block resumes at the next one. At least one record is
+    always returned so a cursor cannot stall.
+    """
+    if cursor is not None:
+        state = _decode_cursor(cursor)
+        data, offset, url, params, fields, source = _resume(state)
+        if max_tokens is None:
+            max_tokens = state.get("t")
+    else:
+        data = _serve(url, params, fields)
+        offset = int(params.get("offset", 0))
+        source = params
+        if max_tokens is None or _records_key(data) is None:
+            return data
+    page = _records(data)
+    if _records_key(data) is None:
+        return data
+
+    budget = None if max_tokens is None else max_tokens * _BYTES_PER_TOKEN
+    size = len(_json_dumps(_with_records(data, []))) + _CURSOR_ALLOWANCE
+    taken = 0
+    for record in page:
+        size += len(_json_dumps(record)) + 1
+        if taken and budget is not None and size > budget:
+            break
+        taken += 1
+    result = _with_records(data, page[:taken])
+
+    pagination = data.get("pagination") if isinstance(data.get("pagination"), dict) else {}
+    total = pagination.get("count")
+    if taken < len(page):
+        total_known = total if total is not None else offset + len(page) + 1
+        next_cursor = _cursor(url, params, fields, offset, page[:taken], total_known, max_tokens, source)
+    else:
+        next_cursor = _cursor(url, params, fields, offset, page, total, max_tokens)
+    if isinstance(result.get("pagination"), dict):
+        result["pagination"] = {k: v for k, v in result["pagination"].items() if k != "cursor"}
+    if next_cursor is not None:
+        continuation = {"cursor": next_cursor}
+        if total is not None:
+            continuation["remaining"] = total - offset - taken
+        result["continuation"] = continuation
+    return result
+
+
+_PAGE_LIMIT = 250
+_SHARD_RECORDS = 500
+_DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+def _parse_datetime(value: str) -> datetime:
+    return datetime.strptime(value, _DATETIME_FORMAT).replace(tzinfo=timezone.utc)
+
+
+def _format_datetime(value: datetime) -> str:
+    return value.strftime(_DATETIME_FORMAT)
+
+
+class _Calendar:
+    """
+    Congress and session start/end dates, from the /congress list.
+
+    Spans are kept sorted by start date, so the congress or session holding a
+    date is found by bisection.
+    """
+
+    def __init__(self, congresses: list[dict]):
+        spans, sessions = [], []
+        for record in congresses:
+            number = _int(record.get("number"))
+            if number is None:
+                continue
+            by_session = {}
+            for session in record.get("sessions") or []:
+                start = _iso_date(session.get("startDate"))
+                if start is None or _int(session.get("number")) is None:
+                    continue
+                first, last = by_session.get(session["number"], (start, start))
+                end = _iso_date(session.get("endDate"))
+                by_session[session["number"]] = (min(first, start),
+                                                 None if end is None or last is None else max(last, end))
+            starts = [span[0] for span in by_session.values()]
+            start = min(starts) if starts else _iso_date(f"{record.get('startYear')}-01-03")
+            if start is None:
+                continue
+            spans.append((start, number))
+            sessions += [(first, last, number, _int(session)) for session, (first, last) in by_session.items()]
+        spans.sort()
+        sessions.sort(key=lambda session: session[0])
+        self._starts = [start for start, _ in spans]
+        self._congresses = [number for _, number in spans]
+        self._session_starts = [session[0] for session in sessions]
+        self._sessions = sessions
+
+    def congress(self, day) -> int | None:
+        """The congress in office on `day` (each runs until the next one starts)."""
+        i = bisect.bisect_right(self._starts, day) - 1
+        return self._congresses[i] if i >= 0 else None
+
+    def congress_span(self, number: int):
+        """(first, last) day of a congress; last is None for the current one."""
+        i = self._congresses.index(number)
+        last = self._starts[i + 1] - timedelta(days=1) if i + 1 < len(self._starts) else None
+        return self._starts[i], last
+
+    def session(self, day) -> tuple[int, int] | None:
+        """(congress, session) in session on `day`, or None between sessions."""
+        i = bisect.bisect_right(self._session_starts, day) - 1
+        if i < 0:
+            return None
+        _, last, congress, session = self._sessions[i]
+        return (congress, session) if last is None or day <= last else None
+
+    def congresses(self, first, last) -> list[int]:
+        """Congresses in office at any point from `first` to `last`."""
+        lo = max(bisect.bisect_right(self._starts, first) - 1, 0)
+        hi = bisect.bisect_right(self._starts, last)
+        return self._congresses[lo:hi]
+
+    def sessions(self, first, last) -> list[dict]:
+        """Sessions that overlap `first`..`last`, in date order."""
+        lo = max(bisect.bisect_right(self._session_starts, first) - 1, 0)
+        hi = bisect.bisect_right(self._session_starts, last)
+        return [{
+            "congress": congress,
+            "session": session,
+            "startDate": start.isoformat(),
+            "endDate": end.isoformat() if end else None
+        } for start, end, congress, session in self._sessions[lo:hi] if end is None or end >= first]
+
+
+def _iso_date(value):
+    try:
+        return datetime.strptime(str(value)[:10], "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+calendar_ttl = float(os.environ.get("CONGRESS_GOV_CALENDAR_TTL", 86400))
+_calendar = None
+_calendar_lock = threading.Lock()
+
+
+def _get_calendar() -> _Calendar:
+    """The calendar index, rebuilt from the (cached) /congress list every calendar_ttl seconds."""
+    global _calendar
+    with _calendar_lock:
+        if _calendar is None or time.monotonic() - _calendar[0] > calendar_ttl:
+            records, offset = [], 0
+            while True:
+                page = _fetch(_API_BASE + "congress", {
+                    "api_key": congress_gov_api_key, "format": "json", "offset": offset, "limit": _UPSTREAM_MAX_LIMIT
+                })
+                page_records = _records(page)
+                records += page_records
+                offset += len(page_records)
+                if len(page_records) < _UPSTREAM_MAX_LIMIT:
+                    break
+            _calendar = (time.monotonic(), _Calendar(records))
+        return _calendar[1]
+
+
+_RELATIVE_SPAN = re.compile(r"^(?:last|past) (\d+) (day|week|month|year)s?$")
+_CONGRESS_SPAN = re.compile(r"^(?:(\d+)(?:st|nd|rd|th)? congress|congress (\d+))(?:,? session (\d+))?$")
+_RANGE_SEPARATOR = re.compile(r"\s*\.\.\s*|\s+(?:to|through|until|-)\s+")
+
+
+def _months_before(day, months: int):
+    month = day.year * 12 + day.month - 1 - months
+    return day.replace(year=month // 12, month=month % 12 + 1, day=1)
+
+
+def _date_span(term: str, today, calendar):
+    """(first, last) day described by one term of a date range. Raises ValueError."""
+    term = term.strip().lower()
+    if term == "today":
+        return today, today
+    if term == "yesterday":
+        return today - timedelta(days=1), today - timedelta(days=1)
+    if term in ("this year", "last year"):
+        year = today.year - (term == "last year")
+        return today.replace(year=year, month=1, day=1), today.replace(year=year, month=12, day=31)
+    if term in ("this month", "last month"):
+        first = _months_before(today, term == "last month")
+        return first, _months_before(first, -1) - timedelta(days=1)
+    if term in ("this congress", "current congress"):
+        term = f"congress {calendar.congress(today)}"
+    match = _RELATIVE_SPAN.match(term)
+    if match:
+        count, unit = int(match.group(1)), match.group(2)
+        if unit in ("day", "week"):
+            return today - timedelta(days=count * (7 if unit == "week" else 1)), today
+        return _months_before(today, count * (12 if unit == "year" else 1)), today
+    match = _CONGRESS_SPAN.match(term)
+    if match:
+        number = int(match.group(1) or match.group(2))
+        if number not in calendar._congresses:
+            raise ValueError(f"Unknown congress: {number}")
+        span = _open_span(calendar.congress_span(number), today)
+        if match.group(3):
+            sessions = [s for s in calendar.sessions(*span) if s["congress"] == number]
+            index = next((i for i, s in enumerate(sessions) if s["session"] == int(match.group(3))), None)
+            if index is None:
+                raise ValueError(f"Unknown session: {term}")
+            # Upstream end dates are the day the next session or congress begins, which is not part of this one.
+            first, last = _iso_date(sessions[index]["startDate"]), span[1]
+            if index + 1 < len(sessions):
+                last = _iso_date(sessions[index + 1]["startDate"]) - timedelta(days=1)
+            end = _iso_date(sessions[index]["endDate"])
+            return first, max(first, min(last, end)) if end else last
+        return span
+    for pattern, last in (("%Y-%m-%d", lambda d: d), ("%Y-%m", lambda d: _months_before(d, -1) - timedelta(days=1)),
+                          ("%Y", lambda d: d.replace(month=12, day=31))):
+        try:
+            first = datetime.strptime(term, pattern).date()
+        except ValueError:
+            continue
+        return first, last(first)
+    raise ValueError(f"Unrecognized date: {term!r}")
+
+
+def _open_span(span, today):
+    return span[0], span[1] or max(today, span[0])
+
+
+def _resolve_dates(dates: str, today=None) -> dict:
+    """
+    Resolve a natural date range to dates, upstream timestamps and the congresses and sessions it covers.
+
+    Accepts a date, month or year ("2024-03-05", "2024-03", "2024"), "today", "yesterday",
+    "this/last month|year", "last N days|weeks|months|years", "118th congress", "congress 118
+    session 2", "this congress", "since <term>", or two terms joined by "..", "to", "through"
+    or "until". Raises ValueError for anything else.
+    """
+    today = today or datetime.now(timezone.utc).date()
+    calendar = _get_calendar()
+    text = dates.strip().lower()
+    if text.startswith("since "):
+        first, last = _date_span(text[len("since "):], today, calendar)[0], today
+    else:
+        terms = _RANGE_SEPARATOR.split(text, maxsplit=1)
+        first = _date_span(terms[0], today, calendar)[0]
+        last = _date_span(terms[-1], today, calendar)[1]
+    if last < first:
+        raise ValueError(f"Date range ends before it starts: {dates!r}")
+    return {
+        "from": first.isoformat(),
+        "to": last.isoformat(),
+        "from_datetime": f"{first.isoformat()}T00:00:00Z",
+        "to_datetime": f"{last.isoformat()}T23:59:59Z",
+        "congresses": calendar.congresses(first, last),
+        "sessions": calendar.sessions(first, last)
+    }
+
+
+def _record_identity(record) -> str:
+    if isinstance(record, dict) and isinstance(record.get("url"), str):
+        return record["url"].split("?")[0]
+    return _json_dumps(record).decode()
+
+
+def _window_count(url: str, start: datetime, end: datetime) -> int:
+    params = {
+        "api_key": congress_gov_api_key,
+        "format": "json",
+        "offset": 0,
+        "limit": 1,
+        "fromDateTime": _format_datetime(start),
+        "toDateTime": _format_datetime(end)
+    }
+    return _fetch(url, params).get("pagination", {}).get("count", 0)
+
+
+def _plan_shards(url: str, start: datetime, end: datetime) -> list[tuple[datetime, datetime, int]]:
+    """
+    Split [start, end] into sub-windows of at most _SHARD_RECORDS records each.
+
+    Each window is cut into as many equal slices as its record count calls
+    for; slices that are still too dense (updates cluster) are split again.
+    Windows are inclusive and one second apart, so no record is in two.
+    """
+    shards = []
+    pending = [(start, end, _window_count(url, start, end))]
+    while pending:
+        dense = []
+        for window in pending:
+            low, high, count = window
+            if count <= _SHARD_RECORDS or high - low < timedelta(seconds=2):
+                if count:
+                    shards.append(window)
+            else:
+                dense.append(window)
+        slices = []
+        for low, high, count in dense:
+            parts = min(-(-count // _SHARD_RECORDS), int((high - low).total_seconds()))
+            step = (high - low) / parts
+            edges = [low + step * i for i in range(parts)] + [high + timedelta(seconds=1)]
+            edges = [edge.replace(microsecond=0) for edge in edges]
+            slices += [(a, b - timedelta(seconds=1)) for a, b in zip(edges, edges[1:]) if a < b]
+        counts = _fanout_map(lambda window: _window_count(url, *window), slices)
+        pending = [(low, high, count) for (low, high), count in zip(slices, counts)]
+    return sorted(shards)
+
+
+def _fetch_shard(url: str, shard: tuple[datetime, datetime, int]) -> tuple[str | None, list]:
+    low, high, count = shard
+    key, records = None, []
+    for offset in range(0, count, _PAGE_LIMIT):
+        page = _fetch(url, {
+            "api_key": congress_gov_api_key,
+            "format": "json",
+            "offset": offset,
+            "limit": _PAGE_LIMIT,
+            "fromDateTime": _format_datetime(low),
+            "toDateTime": _format_datetime(high)
+        })
+        key = key or _records_key(page)
+        records += _records(page)
+    return key, records
+
+
+export_dir = os.path.abspath(os.environ.get("CONGRESS_GOV_EXPORT_DIR", "exports"))
+_EXPORT_FORMATS = ("jsonl", "csv", "parquet")
+_PARQUET_PART_RECORDS = 10000
+
+
+def _iter_pages(url: str, params: dict, offset: int = 0):
+    """Yield (offset, records, total) for every page of a list endpoint, starting at `offset`."""
+    walked_all = offset == 0
+    depths = set()
+    while True:
+        page = _get_json(url, dict(params, offset=offset, limit=_PAGE_LIMIT))
+        records = _records(page)
+        depths |= _known_ids.observe(url, records)
+        if _mirror is not None:
+            _mirror.ingest(url, page)
+        total = page.get("pagination", {}).get("count", offset + len(records))
+        yield offset, records, total
+        offset += len(records)
+        if not records or offset >= total:
+            if walked_all:
+                _known_ids.complete(url, params, depths)
+            return
+
+
+def _flat_value(value):
+    if isinstance(value, (dict, list)):
+        return _json_dumps(value).decode()
+    return value
+
+
+class _JSONLWriter:
+    def __init__(self, path: str, resume_at: int | None):
+        self.path = path
+        self._file = open(path, "r+b" if resume_at is not None else "wb")
+        self._file.truncate(resume_at or 0)
+        self._file.seek(0, os.SEEK_END)
+
+    def write(self, records: list):
+        self._file.write(b"".join(_json_dumps(record) + b"\n" for record in records))
+        self._file.flush()
+
+    def position(self) -> int:
+        return self._file.tell()
+
+    def close(self):
+        self._file.close()
+
+
+class _CSVWriter:
+    """
+    CSV with nested values JSON-encoded.
+
+    Columns are added to the header as later pages bring new fields (earlier
+    rows simply leave them empty). Positions are measured from the end of the
+    header, so a checkpoint stays valid when the header grows.
+    """
+
+    def __init__(self, path: str, resume_at: int | None):
+        self.path = path
+        self.columns = []
+        self._header_bytes = 0
+        # Binary, so checkpoints are byte offsets that seek() and truncate() honour exactly.
+        self._file = open(path, "r+b" if resume_at is not None else "w+b")
+        if resume_at is not None:
+            header = self._file.readline()
+            self.columns = next(csv.reader([header.decode("utf-8")]), []) if header else []
+            self._header_bytes = len(header)
+        self._file.truncate(self._header_bytes + (resume_at or 0))
+        self._file.seek(0, os.SEEK_END)
+
+    def write(self, records: list):
+        rows = [{k: _flat_value(v) for k, v in r.items()} for r in records if isinstance(r, dict)]
+        if not rows:
+            return
+        added = [key for key in dict.fromkeys(key for row in rows for key in row) if key not in self.columns]
+        if added:
+            self._widen(self.columns + added)
+        text = io.StringIO()
+        csv.DictWriter(text, self.columns).writerows(rows)
+        self._file.write(text.getvalue().encode("utf-8"))
+        self._file.flush()
+
+    def _widen(self, columns: list):
+        """Rewrite the file with a wider header; the rows are copied unchanged."""
+        text = io.StringIO()
+        csv.writer(text).writerow(columns)
+        header = text.getvalue().encode("utf-8")
+        self._file.flush()
+        self._file.seek(self._header_bytes)
+        with open(self.path + ".tmp", "wb") as f:
+            f.write(header)
+            shutil.copyfileobj(self._file, f)
+        self._file.close()
+        os.replace(self.path + ".tmp", self.path)
+        self._file = open(self.path, "r+b")
+        self._file.seek(0, os.SEEK_END)
+        self.columns = columns
+        self._header_bytes = len(header)
+
+    def position(self) -> int:
+        return self._file.tell() - self._header_bytes
+
+    def close(self):
+        self._file.close()
+
+
+class _ParquetWriter:
+    """
+    A directory of Parquet part files. Each part is written to a temporary
+    name and renamed once complete, so a resumed export simply adds parts.
+    All columns are strings so the schema cannot drift between pages.
+    """
+
+    def __init__(self, path: str, resume_at: int | None):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise EnvironmentError("Parquet export requires pyarrow (uv pip install pyarrow)")
+        self._pa, self._pq = pyarrow, pyarrow.parquet
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self._part = resume_at or len([name for name in os.listdir(path) if name.endswith(".parquet")])
+        self._rows = []
+
+    def write(self, records: list):
+        self._rows += [r for r in records if isinstance(r, dict)]
+        if len(self._rows) >= _PARQUET_PART_RECORDS:
+            self._flush()
+
+    def _flush(self):
+        if not self._rows:
+            return
+        columns = list(dict.fromkeys(key for row in self._rows for key in row))
+        table = self._pa.table({
+            column: self._pa.array(
+                [None if row.get(column) is None else str(_flat_value(row[column])) for row in self._rows],
+                type=self._pa.string()
+            )
+            for column in columns
+        })
+        name = os.path.join(self.path, f"part-{self._part:05d}.parquet")
+        self._pq.write_table(table, name + ".tmp")
+        os.replace(name + ".tmp", name)
+        self._part += 1
+        self._rows = []
+
+    def position(self) -> int | None:
+        # Only flushed parts are durable; buffered rows are re-fetched on resume.
+        return self._part if not self._rows else None
+
+    def close(self):
+        self._flush()
+
+
+_EXPORT_WRITERS = {"jsonl": _JSONLWriter, "csv": _CSVWriter, "parquet": _ParquetWriter}
+
+
+def _export(url: str, params: dict, output: str, fmt: str, resume: bool = True, progress=None) -> dict:
+    """
+    Stream every page of a list endpoint to `output` with bounded memory.
+
+    A checkpoint next to the output records the next offset and the durable
+    position of the writer after each flushed page; with `resume`, a matching
+    checkpoint continues from there (truncating anything written after it).
+    `progress(written, total)` is called after every page.
+    """
+    checkpoint_path = output + ".checkpoint.json"
+    query = {k: v for k, v in params.items() if k != "api_key"}
+    state = {"url": url, "params": query, "format": fmt, "next_offset": 0, "written": 0, "position": None}
+    if resume and os.path.exists(checkpoint_path) and os.path.exists(output):
+        with open(checkpoint_path, encoding="utf-8") as f:
+            saved = json.load(f)
+        if all(saved.get(k) == state[k] for k in ("url", "params", "format")):
+            state = saved
+
+    writer = _EXPORT_WRITERS[fmt](output, state["position"])
+    total = None
+    try:
+        for offset, records, total in _iter_pages(url, params, state["next_offset"]):
+            writer.write(records)
+            state["next_offset"] = offset + len(records)
+            state["written"] += len(records)
+            position = writer.position()
+            if position is not None:
+                state["position"] = position
+                with open(checkpoint_path + ".tmp", "w", encoding="utf-8") as f:
+                    json.dump(state, f)
+                os.replace(checkpoint_path + ".tmp", checkpoint_path)
+            if progress is not None:
+                progress(state["written"], total)
+    finally:
+        writer.close()
+
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    return {"output": output, "format": fmt, "records": state["written"], "total": total}
+
+
+def _export_target(endpoint: str, congress: int | None, record_type: str | None,
+                   from_datetime: str | None, to_datetime: str | None) -> tuple[str, dict]:
+    url = _API_BASE + endpoint.strip("/")
+    if congress:
+        url += f"/{congress}"
+        if record_type:
+            url += f"/{record_type}"
+    params = {"api_key": congress_gov_api_key, "format": "json"}
+    if from_datetime:
+        params["fromDateTime"] = from_datetime
+    if to_datetime:
+        params["toDateTime"] = to_datetime
+    return url, params
+
 
 @mcp.tool()
 async def get_swagger():
     url = "https://raw.githubusercontent.com/LibraryOfCongress/api.congress.gov/refs/heads/main/Documentation/swagger.json"
-    return requests.get(url).json()
+    return await _call(_get_json, url, {})
 
 
 @mcp.tool()
@@ -34,7 +2532,10 @@ async def get_bills(
     limit: int = 20,
     from_datetime: str | None = None,
     to_datetime: str | None = None,
-    sort: str = "updateDate+desc"
+    sort: str = "updateDate+desc",
+    fields: list[str] | None = None,
+    max_tokens: int | None = None,
+    cursor: str | None = None
 ) -> dict:
     """
     Retrieve a list of bills. Full documentation for this endpoint -> https://github.com/LibraryOfCongress/api.congress.gov/blob/main/Documentation/BillEndpoint.md
@@ -56,6 +2557,9 @@ async def get_bills(
         from_datetime: Start timestamp (YYYY-MM-DDTHH:MM:SSZ format)
         to_datetime: End timestamp (YYYY-MM-DDTHH:MM:SSZ format)
         sort: Sort order ('updateDate+asc' or 'updateDate+desc')
+        fields: Only return these fields of each listed bill (e.g., ["number", "title", "latestAction"])
+        max_tokens: Return only as many records as fit in about this many tokens, with a continuation cursor for the rest
+        cursor: Continuation cursor from a previous response; resumes where it stopped (other arguments are ignored)
 
     Returns:
         dict: Bill data from Congress.gov API
@@ -74,7 +2578,7 @@ async def get_bills(
         "api_key": congress_gov_api_key,
         "format": "json",
         "offset": offset,
-        "limit": min(limit, 100)  # Enforce API max limit
+        "limit": min(limit, 250)  # API max limit for bills
     }
 
     if from_datetime:
@@ -85,9 +2589,10 @@ async def get_bills(
         params["sort"] = sort
 
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
+        return await _call(_fetch_within, url, params, fields, max_tokens, cursor)
+
+    except _InvalidCursor as e:
+        return {"error": str(e), "status_code": None}
 
     except requests.exceptions.RequestException as e:
         return {
@@ -147,9 +2652,7 @@ async def get_amendments(
         params["toDateTime"] = to_datetime
 
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
+        return await _call(_serve, url, params)
 
     except requests.exceptions.RequestException as e:
         return {
@@ -166,7 +2669,10 @@ async def get_summaries(
     limit: int = 20,
     from_datetime: str | None = None,
     to_datetime: str | None = None,
-    sort: str = "updateDate+desc"
+    sort: str = "updateDate+desc",
+    fields: list[str] | None = None,
+    max_tokens: int | None = None,
+    cursor: str | None = None
 ) -> dict:
     """
     Retrieve bill summaries from the Congress.gov API. Full documentation for this endpoint -> https://github.com/LibraryOfCongress/api.congress.gov/blob/main/Documentation/SummariesEndpoint.md
@@ -187,6 +2693,9 @@ async def get_summaries(
         from_datetime: Start timestamp (YYYY-MM-DDTHH:MM:SSZ format)
         to_datetime: End timestamp (YYYY-MM-DDTHH:MM:SSZ format)
         sort: Sort order ('updateDate+asc' or 'updateDate+desc')
+        fields: Only return these fields of each listed summary (e.g., ["bill", "actionDate", "text"])
+        max_tokens: Return only as many records as fit in about this many tokens, with a continuation cursor for the rest
+        cursor: Continuation cursor from a previous response; resumes where it stopped (other arguments are ignored)
 
     Returns:
         dict: Summary data from Congress.gov API
@@ -213,9 +2722,10 @@ async def get_summaries(
         params["toDateTime"] = to_datetime
 
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
+        return await _call(_fetch_within, url, params, fields, max_tokens, cursor)
+
+    except _InvalidCursor as e:
+        return {"error": str(e), "status_code": None}
 
     except requests.exceptions.RequestException as e:
         return {
@@ -255,9 +2765,7 @@ async def get_congress(
     }
 
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
+        return await _call(_serve, url, params)
 
     except requests.exceptions.RequestException as e:
         return {
@@ -310,9 +2818,7 @@ async def get_members(
         params["currentMember"] = str(current_member).lower()
 
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
+        return await _call(_serve, url, params)
 
     except requests.exceptions.RequestException as e:
         return {
@@ -321,6 +2827,21 @@ async def get_members(
         }
 
 
+def _house_votes_held(resolved: dict, params: dict, offset: int, limit: int) -> dict:
+    """The House roll calls held within resolved dates, newest first, from their sessions' full vote lists."""
+    votes = []
+    for s in resolved["sessions"]:
+        for vote in _list_all(f"{_API_BASE}house-vote/{s['congress']}/{s['session']}", params):
+            if resolved["from"] <= str(vote.get("startDate") or "")[:10] <= resolved["to"]:
+                votes.append(vote)
+    votes.sort(key=lambda vote: str(vote.get("startDate") or ""), reverse=True)
+    return {
+        "houseRollCallVotes": votes[offset:offset + limit],
+        "pagination": {"count": len(votes)},
+        "dates": resolved
+    }
+
+
 @mcp.tool()
 async def get_house_votes(
     congress: int | None = None,
@@ -329,7 +2850,8 @@ async def get_house_votes(
     offset: int = 0,
     limit: int = 20,
     from_datetime: str | None = None,
-    to_datetime: str | None = None
+    to_datetime: str | None = None,
+    dates: str | None = None
 ) -> dict:
     """
     Retrieve House vote information from the Congress.gov API. Full documentation for this endpoint -> https://github.com/LibraryOfCongress/api.congress.gov/blob/main/Documentation/HouseRollCallVoteEndpoint.md
@@ -342,10 +2864,41 @@ async def get_house_votes(
         limit: Maximum records to return (max 250, default 20)
         from_datetime: Start timestamp (YYYY-MM-DDTHH:MM:SSZ format)
         to_datetime: End timestamp (YYYY-MM-DDTHH:MM:SSZ format)
+        dates: When the votes were held, in place of congress, session and roll_call_number (e.g., "2024-03",
+            "last 30 days", "118th congress session 2"); must fall within one congress. Only votes held in the
+            range are returned, newest first, with the resolved range under "dates"
 
     Returns:
         dict: House vote data from Congress.gov API
     """
+    if dates:
+        if congress or session or roll_call_number:
+            return {"error": "Pass either dates or congress/session/roll_call_number, not both", "status_code": None}
+        try:
+            resolved = await _call(_resolve_dates, dates)
+        except ValueError as e:
+            return {"error": f"Invalid dates: {str(e)}", "status_code": None}
+        except requests.exceptions.RequestException as e:
+            return {
+                "error": f"Failed to resolve dates: {str(e)}",
+                "status_code": getattr(e.response, "status_code", None)
+            }
+        if len(resolved["congresses"]) != 1:
+            return {
+                "error": f"Dates span congresses {resolved['congresses']}; query each congress separately",
+                "status_code": None,
+                "sessions": resolved["sessions"]
+            }
+        window = {"fromDateTime": from_datetime, "toDateTime": to_datetime}
+        try:
+            return await _call(_house_votes_held, resolved, {k: v for k, v in window.items() if v},
+                               offset, min(limit, 250))
+        except requests.exceptions.RequestException as e:
+            return {
+                "error": f"Failed to retrieve house vote information: {str(e)}",
+                "status_code": getattr(e.response, "status_code", None)
+            }
+
     base_url = "https://api.congress.gov/v3/house-vote"
 
     url = base_url
@@ -369,9 +2922,7 @@ async def get_house_votes(
         params["toDateTime"] = to_datetime
 
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
+        return await _call(_serve, url, params)
 
     except requests.exceptions.RequestException as e:
         return {
@@ -420,9 +2971,7 @@ async def get_committees(
         params["toDateTime"] = to_datetime
 
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
+        return await _call(_serve, url, params)
 
     except requests.exceptions.RequestException as e:
         return {
@@ -482,9 +3031,7 @@ async def get_committee_reports(
         params["toDateTime"] = to_datetime
 
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
+        return await _call(_serve, url, params)
 
     except requests.exceptions.RequestException as e:
         return {
@@ -544,9 +3091,7 @@ async def get_committee_prints(
         params["toDateTime"] = to_datetime
 
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
+        return await _call(_serve, url, params)
 
     except requests.exceptions.RequestException as e:
         return {
@@ -599,9 +3144,7 @@ async def get_committee_meetings(
         params["toDateTime"] = to_datetime
 
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
+        return await _call(_serve, url, params)
 
     except requests.exceptions.RequestException as e:
         return {
@@ -658,9 +3201,7 @@ async def get_hearings(
         params["toDateTime"] = to_datetime
 
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
+        return await _call(_serve, url, params)
 
     except requests.exceptions.RequestException as e:
         return {
@@ -677,7 +3218,10 @@ async def get_congressional_record(
     offset: int = 0,
     limit: int = 20,
     from_datetime: str | None = None,
-    to_datetime: str | None = None
+    to_datetime: str | None = None,
+    fields: list[str] | None = None,
+    max_tokens: int | None = None,
+    cursor: str | None = None
 ) -> dict:
     """
     Retrieve congressional record information from the Congress.gov API. Full documentation for this endpoint -> https://github.com/LibraryOfCongress/api.congress.gov/blob/main/Documentation/DailyCongressionalRecordEndpoint.md
@@ -694,6 +3238,9 @@ async def get_congressional_record(
         limit: Maximum records to return (max 250, default 20)
         from_datetime: Start timestamp (YYYY-MM-DDTHH:MM:SSZ format)
         to_datetime: End timestamp (YYYY-MM-DDTHH:MM:SSZ format)
+        fields: Only return these fields of each listed issue (e.g., ["Volume", "Issue", "PublishDate"])
+        max_tokens: Return only as many records as fit in about this many tokens, with a continuation cursor for the rest
+        cursor: Continuation cursor from a previous response; resumes where it stopped (other arguments are ignored)
 
     Returns:
         dict: Congressional record data from Congress.gov API
@@ -721,9 +3268,10 @@ async def get_congressional_record(
         params["toDateTime"] = to_datetime
 
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
+        return await _call(_fetch_within, url, params, fields, max_tokens, cursor)
+
+    except _InvalidCursor as e:
+        return {"error": str(e), "status_code": None}
 
     except requests.exceptions.RequestException as e:
         return {
@@ -776,9 +3324,7 @@ async def get_daily_congressional_record(
         params["toDateTime"] = to_datetime
 
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
+        return await _call(_serve, url, params)
 
     except requests.exceptions.RequestException as e:
         return {
@@ -835,9 +3381,7 @@ async def get_bound_congressional_record(
         params["toDateTime"] = to_datetime
 
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
+        return await _call(_serve, url, params)
 
     except requests.exceptions.RequestException as e:
         return {
@@ -898,9 +3442,7 @@ async def get_house_communication(
         params["toDateTime"] = to_datetime
 
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
+        return await _call(_serve, url, params)
 
     except requests.exceptions.RequestException as e:
         return {
@@ -953,9 +3495,7 @@ async def get_house_requirement(
         params["toDateTime"] = to_datetime
 
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
+        return await _call(_serve, url, params)
 
     except requests.exceptions.RequestException as e:
         return {
@@ -1015,9 +3555,7 @@ async def get_senate_communication(
         params["toDateTime"] = to_datetime
 
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
+        return await _call(_serve, url, params)
 
     except requests.exceptions.RequestException as e:
         return {
@@ -1070,9 +3608,7 @@ async def get_nomination(
         params["toDateTime"] = to_datetime
 
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
+        return await _call(_serve, url, params)
 
     except requests.exceptions.RequestException as e:
         return {
@@ -1121,9 +3657,7 @@ async def get_crsreport(
         params["toDateTime"] = to_datetime
 
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
+        return await _call(_serve, url, params)
 
     except requests.exceptions.RequestException as e:
         return {
@@ -1176,9 +3710,7 @@ async def get_treaty(
         params["toDateTime"] = to_datetime
 
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
+        return await _call(_serve, url, params)
 
     except requests.exceptions.RequestException as e:
         return {
@@ -1187,5 +3719,1532 @@ async def get_treaty(
         }
 
 
+@mcp.tool()
+async def resolve_dates(dates: str) -> dict:
+    """
+    Resolve a natural date range to the congresses and sessions it covers and to upstream timestamps.
+
+    Args:
+        dates: A date, month or year ("2024-03-05", "2024-03", "2024"), "today", "last 30 days",
+            "this year", "118th congress", "congress 118 session 2", "this congress", "since 2023-06",
+            or two of these joined by "to" or ".." (e.g., "2023-01 to 2024-06")
+
+    Returns:
+        dict: First and last day, fromDateTime/toDateTime values, and the congresses and sessions in the range
+    """
+    try:
+        return await _call(_resolve_dates, dates)
+    except ValueError as e:
+        return {"error": f"Invalid dates: {str(e)}", "status_code": None}
+    except requests.exceptions.RequestException as e:
+        return {
+            "error": f"Failed to resolve dates: {str(e)}",
+            "status_code": getattr(e.response, "status_code", None)
+        }
+
+
+@mcp.tool()
+async def get_records_in_range(
+    endpoint: str,
+    from_datetime: str | None = None,
+    to_datetime: str | None = None,
+    congress: int | None = None,
+    record_type: str | None = None,
+    max_records: int = 1000,
+    sort: str = "updateDate+desc",
+    dates: str | None = None
+) -> dict:
+    """
+    Retrieve every record of a list endpoint updated within a time window, without deep offsets.
+
+    The window is split into sub-windows sized by record density, fetched in parallel and
+    merged by updateDate, with records that moved between sub-windows during the walk
+    returned only once.
+
+    Args:
+        endpoint: List endpoint, e.g. "bill", "amendment", "summaries", "member", "nomination",
+            "committee-report", "hearing", "treaty", "crsreport"
+        from_datetime: Start timestamp (YYYY-MM-DDTHH:MM:SSZ format)
+        to_datetime: End timestamp (YYYY-MM-DDTHH:MM:SSZ format)
+        congress: Congress number (e.g., 118 for 118th Congress)
+        record_type: Type segment that follows the congress in the path (e.g., "hr" for bills,
+            "samdt" for amendments, "house" for hearings)
+        max_records: Maximum records to return (max 5000, default 1000)
+        sort: Sort order ('updateDate+asc' or 'updateDate+desc')
+        dates: The window as a natural date range, in place of from_datetime and to_datetime
+            (e.g., "last 7 days", "2024-03", "2024-01-01 to 2024-06-30")
+
+    Returns:
+        dict: Merged records, the total number in the window and the number of sub-windows fetched
+    """
+    if dates:
+        try:
+            resolved = await _call(_resolve_dates, dates)
+        except ValueError as e:
+            return {"error": f"Invalid dates: {str(e)}", "status_code": None}
+        except requests.exceptions.RequestException as e:
+            return {
+                "error": f"Failed to resolve dates: {str(e)}",
+                "status_code": getattr(e.response, "status_code", None)
+            }
+        from_datetime, to_datetime = resolved["from_datetime"], resolved["to_datetime"]
+    if not from_datetime or not to_datetime:
+        return {"error": "Either dates or both from_datetime and to_datetime are required", "status_code": None}
+    url = _API_BASE + endpoint.strip("/")
+    if congress:
+        url += f"/{congress}"
+        if record_type:
+            url += f"/{record_type}"
+    max_records = min(max_records, 5000)
+    newest_first = sort != "updateDate+asc"
+
+    try:
+        start, end = _parse_datetime(from_datetime), _parse_datetime(to_datetime)
+    except ValueError as e:
+        return {"error": f"Invalid timestamp: {str(e)}", "status_code": None}
+
+    def fetch_shards():
+        shards = _plan_shards(url, start, end)
+        # Only fetch the sub-windows nearest the requested end of the window.
+        needed, covered = [], 0
+        for shard in (reversed(shards) if newest_first else shards):
+            if covered >= max_records:
+                break
+            needed.append(shard)
+            covered += shard[2]
+        return shards, needed, _fanout_map(lambda shard: _fetch_shard(url, shard), needed)
+
+    try:
+        shards, needed, fetched = await _call(fetch_shards)
+    except requests.exceptions.RequestException as e:
+        return {
+            "error": f"Failed to retrieve records in range: {str(e)}",
+            "status_code": getattr(e.response, "status_code", None)
+        }
+
+    def update_date(record):
+        return str(record.get("updateDate", "")) if isinstance(record, dict) else ""
+
+    streams = [sorted(records, key=update_date, reverse=newest_first) for _, records in fetched]
+    merged, seen = [], set()
+    for record in heapq.merge(*streams, key=update_date, reverse=newest_first):
+        identity = _record_identity(record)
+        if identity in seen:
+            continue
+        seen.add(identity)
+        merged.append(record)
+        if len(merged) >= max_records:
+            break
+
+    records_key = next((key for key, _ in fetched if key), "records")
+    return {
+        records_key: merged,
+        "pagination": {"count": sum(shard[2] for shard in shards), "returned": len(merged)},
+        "shards": len(needed)
+    }
+
+
+@mcp.tool()
+async def export_records(
+    endpoint: str,
+    output_path: str,
+    format: str = "jsonl",
+    congress: int | None = None,
+    record_type: str | None = None,
+    from_datetime: str | None = None,
+    to_datetime: str | None = None,
+    resume: bool = True,
+    ctx: Context = None
+) -> dict:
+    """
+    Export every record of a list endpoint to a JSONL, CSV or Parquet file on the server.
+
+    Pages are streamed straight to the file, and an interrupted export resumes from its checkpoint.
+
+    Args:
+        endpoint: List endpoint, e.g. "bill", "nomination", "crsreport", "member"
+        output_path: File name inside the server's export directory (a directory for Parquet)
+        format: Output format ('jsonl', 'csv' or 'parquet')
+        congress: Congress number (e.g., 118 for 118th Congress)
+        record_type: Type segment that follows the congress in the path (e.g., "hr" for bills)
+        from_datetime: Start timestamp (YYYY-MM-DDTHH:MM:SSZ format)
+        to_datetime: End timestamp (YYYY-MM-DDTHH:MM:SSZ format)
+        resume: Continue from an existing checkpoint for the same export (default true)
+
+    Returns:
+        dict: Output path, number of records written and the endpoint's total count
+    """
+    if format not in _EXPORT_FORMATS:
+        return {"error": f"Unsupported export format: {format}", "status_code": None}
+    output = os.path.abspath(os.path.join(export_dir, output_path))
+    if os.path.commonpath([output, export_dir]) != export_dir:
+        return {"error": f"Export path must be inside {export_dir}", "status_code": None}
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+
+    url, params = _export_target(endpoint, congress, record_type, from_datetime, to_datetime)
+    loop = asyncio.get_running_loop()
+
+    def report_progress(written, total):
+        asyncio.run_coroutine_threadsafe(ctx.report_progress(written, total), loop)
+
+    try:
+        return await _call(_export, url, params, output, format, resume,
+                           report_progress if ctx is not None else None, deadline=None)
+    except (requests.exceptions.RequestException, EnvironmentError) as e:
+        return {
+            "error": f"Failed to export records: {str(e)}",
+            "status_code": getattr(getattr(e, "response", None), "status_code", None)
+        }
+
+
+_MAX_COUNT_CELLS = 500
+
+
+@mcp.tool()
+async def aggregate_counts(
+    endpoint: str,
+    congresses: list[int],
+    record_types: list[str] | None = None,
+    from_datetime: str | None = None,
+    to_datetime: str | None = None
+) -> dict:
+    """
+    Count records for every combination of congress and record type, without paging through them.
+
+    Each cell is answered by one limit=1 request whose pagination count is read; the requests run
+    in parallel and are cached.
+
+    Args:
+        endpoint: List endpoint, e.g. "bill", "amendment", "summaries", "hearing", "committee-report"
+        congresses: Congress numbers (e.g., [117, 118])
+        record_types: Type segment that follows the congress in the path (e.g., ["hr", "s"] for bills,
+            ["house", "senate"] for hearings); omit to count each congress as a whole
+        from_datetime: Only count records updated at or after this timestamp (YYYY-MM-DDTHH:MM:SSZ format)
+        to_datetime: Only count records updated at or before this timestamp (YYYY-MM-DDTHH:MM:SSZ format)
+
+    Returns:
+        dict: Counts keyed by congress then record type, per-congress and overall totals, and any failed cells
+    """
+    cells = [(congress, record_type) for congress in congresses for record_type in (record_types or [None])]
+    if len(cells) > _MAX_COUNT_CELLS:
+        return {"error": f"Too many cells: {len(cells)} (max {_MAX_COUNT_CELLS})", "status_code": None}
+
+    def probe(cell):
+        url, params = _export_target(endpoint, cell[0], cell[1], from_datetime, to_datetime)
+        try:
+            return _fetch(url, dict(params, offset=0, limit=1)).get("pagination", {}).get("count", 0), None
+        except requests.exceptions.RequestException as e:
+            return None, {"congress": cell[0], "record_type": cell[1], "error": _redact(str(e)),
+                          "status_code": getattr(e.response, "status_code", None)}
+
+    try:
+        results = await _call(_fanout_map, probe, cells)
+    except requests.exceptions.RequestException as e:
+        return {
+            "error": f"Failed to retrieve counts: {str(e)}",
+            "status_code": getattr(e.response, "status_code", None)
+        }
+
+    counts, totals, errors = {}, {}, []
+    for (congress, record_type), (count, error) in zip(cells, results):
+        if error is not None:
+            errors.append(error)
+            continue
+        if record_type is None:
+            counts[str(congress)] = count
+        else:
+            counts.setdefault(str(congress), {})[record_type] = count
+        totals[str(congress)] = totals.get(str(congress), 0) + count
+    return {"endpoint": endpoint, "counts": counts, "totals": totals, "total": sum(totals.values()), "errors": errors}
+
+
+def _field_values(record, path: list[str]) -> list:
+    """Values at a dotted path; lists along the way contribute every element."""
+    values = [record]
+    for name in path:
+        step = []
+        for value in values:
+            for item in value if isinstance(value, list) else [value]:
+                if isinstance(item, dict) and name in item:
+                    step.append(item[name])
+        values = step
+    return [item for value in values for item in (value if isinstance(value, list) else [value])]
+
+
+def _comparable(actual, expected):
+    """Compare numeric strings (bill numbers, congresses) as numbers when the condition's value is one."""
+    if isinstance(expected, (int, float)) and not isinstance(expected, bool) and isinstance(actual, str):
+        try:
+            return float(actual)
+        except ValueError:
+            return None
+    return actual
+
+
+def _ordered(compare):
+    def op(actual, expected):
+        actual = _comparable(actual, expected)
+        try:
+            return actual is not None and compare(actual, expected)
+        except TypeError:
+            return False
+    return op
+
+
+_FILTER_OPS = {
+    "eq": _ordered(lambda a, b: a == b),
+    "ne": _ordered(lambda a, b: a != b),
+    "lt": _ordered(lambda a, b: a < b),
+    "le": _ordered(lambda a, b: a <= b),
+    "gt": _ordered(lambda a, b: a > b),
+    "ge": _ordered(lambda a, b: a >= b),
+    "in": lambda a, b: a in b,
+    "contains": lambda a, b: isinstance(a, str) and b.casefold() in a.casefold(),
+    "regex": lambda a, b: isinstance(a, str) and b.search(a) is not None,
+    "exists": lambda a, b: True
+}
+
+
+def _compile_filter(where: list[dict], match: str):
+    """
+    Turn [{"field": ..., "op": ..., "value": ...}, ...] into a record predicate.
+
+    A condition holds if any value at its field path satisfies it; `match`
+    combines conditions with "all" (and) or "any" (or). Raises ValueError for
+    a malformed condition.
+    """
+    if match not in ("all", "any"):
+        raise ValueError(f"match must be 'all' or 'any', not {match!r}")
+    conditions = []
+    for condition in where:
+        op = condition.get("op", "eq")
+        if op not in _FILTER_OPS or not condition.get("field"):
+            raise ValueError(f"Invalid filter condition: {condition}")
+        expected = condition.get("value")
+        if op == "regex":
+            try:
+                expected = re.compile(expected, re.IGNORECASE)
+            except (re.error, TypeError) as e:
+                raise ValueError(f"Invalid regex {condition.get('value')!r}: {e}")
+        elif op == "contains" and not isinstance(expected, str):
+            raise ValueError(f"contains needs a string value: {condition}")
+        elif op == "in" and not isinstance(expected, list):
+            raise ValueError(f"in needs a list value: {condition}")
+        conditions.append((condition["field"].split("."), _FILTER_OPS[op], expected))
+    combine = all if match == "all" else any
+
+    def predicate(record) -> bool:
+        return combine(any(test(value, expected) for value in _field_values(record, path))
+                       for path, test, expected in conditions)
+
+    return predicate
+
+
+def _scan_pages(url: str, params: dict, offset: int, reads_past=None):
+    """
+    Yield (records, total) for a list from `offset` on, one full-size page at a time.
+
+    Pages are fetched on aligned offsets through the cache, so scans share
+    them with cursor pages and with each other. The next page is fetched
+    while the caller scans the current one if reads_past(n), asked before a
+    page of n records is yielded, says the caller will likely read past it:
+    a started fetch cannot be cancelled, so a scan that stops early would
+    otherwise pay for a full page it never reads.
+    """
+    def fetch(block):
+        return _fetch(url, dict(params, offset=block * _UPSTREAM_MAX_LIMIT, limit=_UPSTREAM_MAX_LIMIT))
+
+    def submit(block):
+        return _fanout.submit(contextvars.copy_context().run, fetch, block)
+
+    block = offset // _UPSTREAM_MAX_LIMIT
+    skip = offset - block * _UPSTREAM_MAX_LIMIT
+    pending = None
+    try:
+        while True:
+            page = fetch(block) if pending is None else pending.result()
+            pending = None
+            records = _records(page)
+            pagination = page.get("pagination") if isinstance(page.get("pagination"), dict) else {}
+            total = pagination.get("count", block * _UPSTREAM_MAX_LIMIT + len(records))
+            block += 1
+            more = len(records) == _UPSTREAM_MAX_LIMIT and block * _UPSTREAM_MAX_LIMIT < total
+            if more and (reads_past is None or reads_past(len(records) - skip)):
+                pending = submit(block)
+            yield records[skip:], total
+            if not more:
+                return
+            skip = 0
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+def _filter_scan(url: str, params: dict, predicate, limit: int, max_scan: int, offset: int,
+                 fields: list[str] | None) -> dict:
+    """Scan a list from `offset` until `limit` records match or `max_scan` records were read."""
+    matches, scanned, total = [], 0, offset
+
+    def reads_past(available):
+        # Matches expected in the next `available` records at the rate seen so far,
+        # counted as if the next record matched so an unscanned list expects a full page.
+        expected = available * (len(matches) + 1) / (scanned + 1)
+        return scanned + available < max_scan and len(matches) + expected < limit
+
+    for records, total in _scan_pages(url, params, offset, reads_past):
+        for record in records:
+            if len(matches) >= limit or scanned >= max_scan:
+                break
+            scanned += 1
+            if predicate(record):
+                matches.append(_project(record, fields))
+        if len(matches) >= limit or scanned >= max_scan:
+            break
+    next_offset = offset + scanned
+    return {
+        "records": matches,
+        "matched": len(matches),
+        "scanned": scanned,
+        "total": total,
+        "next_offset": next_offset if next_offset < total else None
+    }
+
+
+@mcp.tool()
+async def filter_records(
+    endpoint: str,
+    where: list[dict],
+    match: str = "all",
+    limit: int = 20,
+    max_scan: int = 5000,
+    offset: int = 0,
+    congress: int | None = None,
+    record_type: str | None = None,
+    from_datetime: str | None = None,
+    to_datetime: str | None = None,
+    fields: list[str] | None = None
+) -> dict:
+    """
+    Return the records of a list endpoint that match conditions the API cannot filter on, such as latest action text or origin chamber.
+
+    Pages are scanned in order and the scan stops at the `limit`-th match, so only matches are returned.
+    Conditions apply to the fields of the listed records, e.g. {"field": "latestAction.text", "op": "contains", "value": "became public law"}.
+    Ops: eq, ne, lt, le, gt, ge (numeric strings compare as numbers against a numeric value; ISO dates compare as
+    strings), in (value is a list), contains (case-insensitive substring), regex (case-insensitive search) and exists.
+    A dotted field that passes through a list matches if any element does.
+
+    Args:
+        endpoint: List endpoint, e.g. "bill", "member", "nomination", "committee-report"
+        where: Conditions, each {"field": dotted path, "op": operator, "value": operand}
+        match: "all" to require every condition, "any" to require at least one (default "all")
+        limit: Number of matching records to return (max 250, default 20)
+        max_scan: Maximum records to read before stopping (max 50000, default 5000)
+        offset: Position in the list to start scanning from; pass next_offset to continue
+        congress: Congress number (e.g., 118 for 118th Congress)
+        record_type: Type segment that follows the congress in the path (e.g., "hr" for bills)
+        from_datetime: Start timestamp (YYYY-MM-DDTHH:MM:SSZ format)
+        to_datetime: End timestamp (YYYY-MM-DDTHH:MM:SSZ format)
+        fields: Record fields to return (all if omitted)
+
+    Returns:
+        dict: Matching records, records scanned, the list's total and the offset to continue scanning from (null at the end)
+    """
+    try:
+        predicate = _compile_filter(where, match)
+    except ValueError as e:
+        return {"error": str(e), "status_code": None}
+    url, params = _export_target(endpoint, congress, record_type, from_datetime, to_datetime)
+    try:
+        return await _call(_filter_scan, url, params, predicate, min(limit, 250), min(max_scan, 50000), offset, fields)
+    except requests.exceptions.RequestException as e:
+        return {
+            "error": f"Failed to filter records: {str(e)}",
+            "status_code": getattr(e.response, "status_code", None)
+        }
+
+
+def _relation_tree(relations: list[str]) -> dict:
+    """["committees.reports", "sponsors"] -> {"committees": {"reports": {}}, "sponsors": {}}."""
+    tree = {}
+    for relation in relations:
+        node = tree
+        for name in relation.split("."):
+            if name:
+                node = node.setdefault(name, {})
+    return tree
+
+
+def _detail_record(data: dict):
+    """The record of a single-record response, or the records of a list response."""
+    if _records_key(data) is not None:
+        return _records(data)
+    for key, value in data.items():
+        if key not in ("request", "pagination", "cache") and isinstance(value, dict):
+            return value
+    return data
+
+
+def _record_url(record) -> str | None:
+    if isinstance(record, dict) and isinstance(record.get("url"), str) and record["url"].startswith(_API_BASE):
+        return record["url"].split("?")[0]
+    return None
+
+
+class _Expansion:
+    """
+    Follow relations out from one record, a level at a time.
+
+    Everything one level needs (details of listed items, linked lists, the
+    relation's own sub-resource) is fetched in one concurrent batch; a URL is
+    fetched at most once per expansion and through the response cache. Linked
+    lists are read page by page; every page counts against max_requests, and
+    a list cut short by the cap is reported in `partial`.
+    """
+
+    def __init__(self, max_requests: int):
+        self.max_requests = max_requests
+        self.requests = 0
+        self.results = {}  # url -> record(s) or {"error": ...}
+        self.errors = []
+        self.partial = []
+        self.truncated = False
+        self._lock = threading.Lock()
+
+    def _claim(self) -> bool:
+        """Take one request from the budget; False (and truncated) once it is spent."""
+        with self._lock:
+            if self.requests >= self.max_requests:
+                self.truncated = True
+                return False
+            self.requests += 1
+            return True
+
+    def _fetch_pages(self, url: str):
+        params = dict(_DETAIL_PARAMS, api_key=congress_gov_api_key, limit=_UPSTREAM_MAX_LIMIT)
+        page = _fetch(url, params)
+        records = _detail_record(page)
+        if not isinstance(records, list):
+            return records
+        records = list(records)
+        total = (page.get("pagination") or {}).get("count", len(records))
+        while len(records) < total:
+            if not self._claim():
+                self.partial.append({"url": _relative_id(url), "returned": len(records), "remaining": total - len(records)})
+                break
+            more = _records(_fetch(url, dict(params, offset=len(records))))
+            if not more:
+                break
+            records += more
+        return records
+
+    def fetch_all(self, urls):
+        pending = [url for url in dict.fromkeys(urls) if url not in self.results]
+        pending = [url for url in pending if self._claim()]
+
+        def fetch(url):
+            try:
+                return self._fetch_pages(url)
+            except requests.exceptions.RequestException as e:
+                error = {"error": _redact(str(e)), "status_code": getattr(e.response, "status_code", None)}
+                self.errors.append(dict(error, url=_relative_id(url)))
+                return error
+
+        for url, result in zip(pending, _fanout_map(fetch, pending)):
+            self.results[url] = result
+
+    def linked(self, url: str, default=None):
+        """A copy of what was fetched for `url`, so records shared by several parents expand independently."""
+        return copy.deepcopy(self.results[url]) if url in self.results else default
+
+    def detail(self, record: dict):
+        """Merge the detail response fetched for a listed `record` into it."""
+        fetched = self.results.get(_record_url(record))
+        if isinstance(fetched, dict) and "error" not in fetched:
+            record.update(copy.deepcopy(fetched))
+
+    def run(self, record: dict, tree: dict) -> dict:
+        level = [(record, tree)]
+        while level:
+            # Listed items only carry a summary; fetch the details of those
+            # whose relations are not in the summary.
+            self.fetch_all(_record_url(r) for r, subtree in level
+                           if _record_url(r) and any(name not in r for name in subtree))
+            for r, subtree in level:
+                if any(name not in r for name in subtree):
+                    self.detail(r)
+
+            wanted = []
+            for r, subtree in level:
+                for name in subtree:
+                    value = r.get(name)
+                    if isinstance(value, list):
+                        wanted += [_record_url(item) for item in value if _record_url(item)]
+                    elif _record_url(value):
+                        wanted.append(_record_url(value))
+                    elif value is None and _record_url(r):
+                        wanted.append(f"{_record_url(r)}/{name}")
+            self.fetch_all(wanted)
+
+            next_level = []
+            for r, subtree in level:
+                for name, child_tree in subtree.items():
+                    value = r.get(name)
+                    if isinstance(value, list):
+                        for item in value:
+                            if isinstance(item, dict):
+                                self.detail(item)
+                    elif _record_url(value):
+                        value = self.linked(_record_url(value), value)
+                    elif value is None and _record_url(r):
+                        value = self.linked(f"{_record_url(r)}/{name}")
+                    r[name] = value
+                    if child_tree:
+                        children = value if isinstance(value, list) else [value]
+                        next_level += [(child, child_tree) for child in children if isinstance(child, dict) and "error" not in child]
+            level = next_level
+        return record
+
+
+@mcp.tool()
+async def expand_record(
+    root: str,
+    relations: list[str],
+    max_requests: int = 100
+) -> dict:
+    """
+    Fetch a record and the records it links to, in one call, e.g. a bill with its sponsors, committees and their reports.
+
+    Relations name fields of the record; dotted paths expand further (e.g. "committees.reports").
+    Linked records are replaced by their full details, linked lists (such as a bill's "committees"
+    or "actions") by their records, and a relation the record does not list is looked up as a
+    sub-resource of its URL. Each level of the graph is fetched concurrently and through the cache.
+
+    Args:
+        root: Record to start from, as a path (e.g., "bill/118/hr/1", "member/A000374") or Congress.gov URL
+        relations: Fields to expand (e.g., ["sponsors", "cosponsors", "committees.reports"])
+        max_requests: Maximum upstream lookups for the expansion (max 500, default 100)
+
+    Returns:
+        dict: The linked record, the number of lookups, whether the lookup cap was reached, linked lists the
+            cap cut short (with how many records were left out), and per-URL errors
+    """
+    url = root if root.startswith(_API_BASE) else _API_BASE + root.strip("/")
+    url = url.split("?")[0]
+    expansion = _Expansion(min(max_requests, 500))
+
+    def expand():
+        record = _detail_record(_fetch(url, dict(_DETAIL_PARAMS, api_key=congress_gov_api_key)))
+        if not isinstance(record, dict):
+            record = {_api_path(url).split("/")[0]: record}
+        return expansion.run(dict(record), _relation_tree(relations))
+
+    try:
+        record = await _call(expand)
+    except requests.exceptions.RequestException as e:
+        return {
+            "error": f"Failed to expand record: {str(e)}",
+            "status_code": getattr(e.response, "status_code", None)
+        }
+    return {
+        "root": _relative_id(url),
+        "record": record,
+        "requests": expansion.requests,
+        "truncated": expansion.truncated,
+        "partial": expansion.partial,
+        "errors": expansion.errors
+    }
+
+
+vote_index_ttl = float(os.environ.get("CONGRESS_GOV_VOTE_INDEX_TTL", 900))
+
+
+def _list_all(url: str, params: dict | None = None, fresh: bool = False, before_page=None) -> list:
+    """Every record of a short list endpoint, read in full-size pages through the cache."""
+    records, offset = [], 0
+    while True:
+        if before_page is not None:
+            before_page()
+        page = _fetch(url, dict(params or {}, api_key=congress_gov_api_key, format="json", offset=offset, limit=_UPSTREAM_MAX_LIMIT),
+                      fresh=fresh)
+        page_records = _records(page)
+        records += page_records
+        offset += len(page_records)
+        total = (page.get("pagination") or {}).get("count", offset)
+        if not page_records or offset >= total:
+            return records
+
+
+def _roll_call_results(congress: int, session: int, roll_call: int) -> tuple[dict, list]:
+    """(vote, member results) for one House roll call."""
+    url = f"{_API_BASE}house-vote/{congress}/{session}/{roll_call}/members"
+    vote, results, offset = {}, [], 0
+    while True:
+        page = _fetch(url, {"api_key": congress_gov_api_key, "format": "json", "offset": offset, "limit": _UPSTREAM_MAX_LIMIT},
+                      fresh=True)
+        vote = page.get("houseRollCallVoteMemberVotes") or vote
+        page_results = vote.get("results") or []
+        results += page_results
+        offset += len(page_results)
+        total = (page.get("pagination") or {}).get("count", offset)
+        if not page_results or offset >= total:
+            return vote, results
+
+
+class _SessionVotes:
+    """
+    An inverted index of one session's House roll calls: bioguide ID -> {roll call: position}.
+
+    Roll calls are added incrementally; a roll call whose updateDate changes
+    upstream is indexed again.
+    """
+
+    def __init__(self):
+        self.roll_calls = {}  # roll call number -> vote summary
+        self.updated = {}  # roll call number -> updateDate it was indexed at
+        self.positions = {}  # bioguide ID -> {roll call number: voteCast}
+        self.members = {}  # bioguide ID -> name, party and state
+        self.listed = {}  # roll call number -> updateDate from the latest vote list
+        self.listed_at = None
+        self.lock = threading.Lock()
+
+    def pending(self) -> list[int]:
+        """Listed roll calls not indexed yet or changed since, newest first."""
+        return sorted((roll for roll, updated in self.listed.items()
+                       if roll not in self.updated or self.updated[roll] != updated), reverse=True)
+
+    def add(self, roll_call: int, updated, vote: dict, results: list):
+        for positions in self.positions.values():
+            positions.pop(roll_call, None)
+        self.roll_calls[roll_call] = {
+            "roll_call": roll_call,
+            "date": vote.get("startDate"),
+            "question": vote.get("voteQuestion"),
+            "result": vote.get("result"),
+            "vote_type": vote.get("voteType"),
+            "legislation": " ".join(str(vote[key]) for key in ("legislationType", "legislationNumber") if vote.get(key)) or None
+        }
+        for result in results:
+            bioguide_id = result.get("bioguideID") or result.get("bioguideId")
+            if not bioguide_id:
+                continue
+            self.positions.setdefault(bioguide_id, {})[roll_call] = result.get("voteCast")
+            self.members[bioguide_id] = {
+                "name": " ".join(part for part in (result.get("firstName"), result.get("lastName")) if part),
+                "party": result.get("voteParty"),
+                "state": result.get("voteState")
+            }
+        self.updated[roll_call] = updated
+
+
+_vote_index = {}  # (congress, session) -> _SessionVotes
+_vote_index_lock = threading.Lock()
+
+
+def _sync_votes(congress: int, session: int, max_fetch: int) -> _SessionVotes:
+    """
+    Bring a session's vote index up to date, fetching at most `max_fetch` roll calls' member results.
+
+    The session's roll-call list is read again once it is vote_index_ttl
+    seconds old; member results are fetched in parallel through the cache.
+    Both skip expired cache entries, so a roll call is never indexed from an
+    older copy than its listed updateDate. Requests run outside index.lock,
+    which is only taken to read the listing and to merge, so readers of the
+    session never wait on upstream.
+    """
+    with _vote_index_lock:
+        index = _vote_index.setdefault((congress, session), _SessionVotes())
+    with index.lock:
+        relist = index.listed_at is None or time.monotonic() - index.listed_at > vote_index_ttl
+    if relist:
+        votes = _list_all(f"{_API_BASE}house-vote/{congress}/{session}", fresh=True)
+        listed = {roll: vote.get("updateDate") for vote in votes if (roll := _int(vote.get("rollCallNumber"))) is not None}
+        with index.lock:
+            index.listed, index.listed_at = listed, time.monotonic()
+    with index.lock:
+        batch = [(roll, index.listed[roll]) for roll in index.pending()[:max(max_fetch, 0)]]
+    fetched = _fanout_map(lambda item: _roll_call_results(congress, session, item[0]), batch)
+    with index.lock:
+        for (roll, updated), (vote, results) in zip(batch, fetched):
+            # A concurrent relist may have seen a newer version; leave the roll call pending for it.
+            if index.listed.get(roll) == updated:
+                index.add(roll, updated, vote, results)
+                _count("vote_index_roll_calls")
+    return index
+
+
+def _latest_session(calendar: _Calendar, congress: int, today) -> int:
+    """The session of `congress` in progress on `today`, or else the latest one to have started (1 if none)."""
+    if congress not in calendar._congresses:
+        return 1
+    first, last = calendar.congress_span(congress)
+    sessions = [s["session"] for s in calendar.sessions(first, min(last or today, today)) if s["congress"] == congress]
+    return sessions[-1] if sessions else 1
+
+
+def _member_votes(bioguide_id: str, congress: int, session: int, position: str | None,
+                  limit: int, max_fetch: int) -> dict:
+    index = _sync_votes(congress, session, max_fetch)
+    with index.lock:
+        positions = dict(index.positions.get(bioguide_id, {}))
+        member = index.members.get(bioguide_id)
+        votes = [dict(index.roll_calls[roll], position=cast) for roll, cast in sorted(positions.items(), reverse=True)]
+        indexed, listed, pending = len(index.updated), len(index.listed), len(index.pending())
+    counts = Counter(vote["position"] for vote in votes)
+    if position:
+        votes = [vote for vote in votes if str(vote["position"]).lower() == position.lower()]
+    return {
+        "bioguide_id": bioguide_id,
+        "member": member,
+        "congress": congress,
+        "session": session,
+        "summary": {
+            "roll_calls": len(positions),
+            "positions": dict(counts),
+            "missed": counts.get("Not Voting", 0),
+            "missed_vote_rate": round(counts.get("Not Voting", 0) / len(positions), 4) if positions else None
+        },
+        "votes": votes[:limit],
+        "index": {"indexed": indexed, "roll_calls": listed, "complete": pending == 0}
+    }
+
+
+@mcp.tool()
+async def get_member_votes(
+    bioguide_id: str,
+    congress: int | None = None,
+    session: int | None = None,
+    position: str | None = None,
+    limit: int = 50,
+    max_fetch: int = 100
+) -> dict:
+    """
+    Retrieve how a House member voted on every roll call of a session, with their missed-vote rate.
+
+    Answers come from a local index of the session's roll calls. Each call first adds up to
+    `max_fetch` roll calls not yet indexed (newest first); while `index.complete` is false the
+    record covers only the roll calls indexed so far, and calling again continues the index.
+
+    Args:
+        bioguide_id: Member bioguide ID (e.g., "P000197")
+        congress: Congress number (e.g., 118); defaults to the congress in session today
+        session: Session number (1 or 2); defaults to the session in progress, or the congress's latest session
+        position: Only return votes with this position (e.g., "Yea", "Nay", "Present", "Not Voting")
+        limit: Maximum votes to list, newest first (default 50)
+        max_fetch: Maximum roll calls to add to the index during this call (default 100)
+
+    Returns:
+        dict: Member, position counts, missed-vote rate, the member's votes and how complete the index is
+    """
+    try:
+        if congress is None or session is None:
+            today = datetime.now(timezone.utc).date()
+            calendar = await _call(_get_calendar)
+            congress = congress or calendar.congress(today)
+            session = session or _latest_session(calendar, congress, today)
+        return await _call(_member_votes, bioguide_id.upper(), congress, session, position, limit, max_fetch)
+    except requests.exceptions.RequestException as e:
+        return {
+            "error": f"Failed to retrieve member votes: {str(e)}",
+            "status_code": getattr(e.response, "status_code", None)
+        }
+
+
+def _bill_participants(url: str, before_request=None) -> tuple[list, list]:
+    """
+    (sponsors, cosponsors still on the bill) for one bill; the cosponsor list is skipped when empty.
+
+    before_request, if given, is called ahead of every request (the detail and each cosponsor page).
+    """
+    if before_request is not None:
+        before_request()
+    bill = _fetch(url, dict(_DETAIL_PARAMS, api_key=congress_gov_api_key), fresh=True).get("bill") or {}
+    cosponsors = []
+    if _int((bill.get("cosponsors") or {}).get("count")):
+        cosponsors = [c for c in _list_all(f"{url}/cosponsors", fresh=True, before_page=before_request) if not c.get("sponsorshipWithdrawnDate")]
+    return bill.get("sponsors") or [], cosponsors
+
+
+_MIN_BIPARTISAN_BILLS = 10
+
+# Builders get their own workers so a congress's worth of bill lookups never
+# queues ahead of the interactive tools on _fanout.
+_network_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("CONGRESS_GOV_NETWORK_WORKERS", "4")),
+    thread_name_prefix="cosponsors"
+)
+
+
+class _CosponsorGraph:
+    """
+    An immutable snapshot of a congress's sponsor-cosponsor network in CSR form.
+
+    Row i of (indptr, indices, weights) lists member i's collaborators sorted
+    by the number of bills they share, so degree, bipartisanship and the top
+    collaborators are read without scanning the graph.
+    """
+
+    def __init__(self, members: dict, edges: Counter, bills: int):
+        self.ids = sorted(members)
+        self.index = {bioguide_id: i for i, bioguide_id in enumerate(self.ids)}
+        self.members = members
+        self.bills = bills
+        rows = [[] for _ in self.ids]
+        for (a, b), weight in edges.items():
+            rows[self.index[a]].append((weight, self.index[b]))
+            rows[self.index[b]].append((weight, self.index[a]))
+        self.indptr, self.indices, self.weights = array("I", [0]), array("I"), array("I")
+        self.strength, self.bipartisan = array("I"), array("d")
+        for i, row in enumerate(rows):
+            row.sort(key=lambda edge: (-edge[0], edge[1]))
+            self.indices.extend(j for _, j in row)
+            self.weights.extend(weight for weight, _ in row)
+            self.indptr.append(len(self.indices))
+            total = sum(weight for weight, _ in row)
+            party = members[self.ids[i]].get("party")
+            across = sum(weight for weight, j in row if members[self.ids[j]].get("party") != party)
+            self.strength.append(total)
+            self.bipartisan.append(across / total if total else 0.0)
+        self.edges = len(edges)
+        members_by = range(len(self.ids))
+        self.by_degree = sorted(members_by, key=lambda i: self.indptr[i] - self.indptr[i + 1])
+        self.by_bipartisanship = sorted((i for i in members_by if self.strength[i] >= _MIN_BIPARTISAN_BILLS),
+                                        key=lambda i: -self.bipartisan[i])
+
+    def member(self, bioguide_id: str, top: int) -> dict | None:
+        i = self.index.get(bioguide_id)
+        if i is None:
+            return None
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return dict(self.members[bioguide_id], **{
+            "bioguide_id": bioguide_id,
+            "degree": end - start,
+            "shared_bills": self.strength[i],
+            "bipartisanship": round(self.bipartisan[i], 4),
+            "top_collaborators": [
+                dict(self.members[self.ids[j]], bioguide_id=self.ids[j], shared_bills=weight)
+                for j, weight in zip(self.indices[start:min(end, start + top)], self.weights[start:min(end, start + top)])
+            ]
+        })
+
+
+class _CosponsorNetwork:
+    """
+    Builds the cosponsorship network of one congress in the background.
+
+    Bills are walked a page at a time; each page's bill details and cosponsor
+    lists are fetched in parallel on _network_executor. Every request, list
+    pages included, is paid for from spare quota: the builder waits while the
+    quota is at its reserve, until stop(). After every page a new graph
+    snapshot is published. A refresh walks the list again and re-reads only
+    bills whose updateDate changed, skipping expired cache entries.
+    """
+
+    def __init__(self, congress: int):
+        self.congress = congress
+        self.members = {}  # bioguide ID -> name, party and state
+        self.edges = Counter()  # (bioguide ID, bioguide ID), sorted -> shared bills
+        self.bills = {}  # bill URL -> (updateDate, sponsor/cosponsor pairs)
+        self.graph = _CosponsorGraph({}, Counter(), 0)
+        self.state = "idle"
+        self.listed = 0
+        self.errors = 0
+        self.error = None
+        self.updated_at = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, refresh: bool):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        if self.state == "complete" and not refresh:
+            return
+        self._stop.clear()
+        self.state = "building"
+        self._thread = threading.Thread(target=self.run, name=f"cosponsors-{self.congress}", daemon=True)
+        self._thread.start()
+
+    def run(self):
+        try:
+            url = f"{_API_BASE}bill/{self.congress}"
+            offset, total = 0, None
+            while total is None or offset < total:
+                self._spend()
+                page = _fetch(url, {"api_key": congress_gov_api_key, "format": "json", "offset": offset,
+                                    "limit": _UPSTREAM_MAX_LIMIT, "sort": "updateDate+asc"}, fresh=True)
+                records = _records(page)
+                total = (page.get("pagination") or {}).get("count", offset + len(records))
+                self.listed = total
+                if not records:
+                    break
+                offset += len(records)
+                stale = [(_record_url(bill), bill.get("updateDate")) for bill in records if _record_url(bill)]
+                stale = [(bill_url, updated) for bill_url, updated in stale
+                         if bill_url not in self.bills or self.bills[bill_url][0] != updated]
+                fetched = list(_network_executor.map(self._participants, [bill_url for bill_url, _ in stale]))
+                for (bill_url, updated), participants in zip(stale, fetched):
+                    if participants is None:
+                        self.errors += 1
+                    else:
+                        self._add(bill_url, updated, *participants)
+                self._publish()
+            self.state = "complete"
+        except _Cancelled:
+            self.state = "stopped"
+        except Exception as e:
+            self.state, self.error = "failed", _redact(str(e))
+            _count("cosponsor_network_failures")
+
+    def _spend(self):
+        """Claim spare quota for one request, waiting at the reserve; raises _Cancelled once stopped."""
+        while not _quota.spend_spare():
+            if self._stop.wait(60):
+                raise _Cancelled()
+        if self._stop.is_set():
+            raise _Cancelled()
+
+    def stop(self):
+        """Stop the build before its next request; the snapshot published so far is kept."""
+        self._stop.set()
+        if self._thread is not None and self._thread.is_alive():
+            self.state = "stopping"
+
+    def _participants(self, bill_url: str):
+        try:
+            return _bill_participants(bill_url, self._spend)
+        except requests.exceptions.RequestException:
+            return None
+
+    def _add(self, bill_url: str, updated, sponsors: list, cosponsors: list):
+        _, old_pairs = self.bills.get(bill_url, (None, ()))
+        for pair in old_pairs:
+            self.edges[pair] -= 1
+            if self.edges[pair] <= 0:
+                del self.edges[pair]
+        for member in sponsors + cosponsors:
+            if member.get("bioguideId"):
+                self.members[member["bioguideId"]] = {
+                    "name": member.get("fullName"), "party": member.get("party"), "state": member.get("state")
+                }
+        pairs = {tuple(sorted((s["bioguideId"], c["bioguideId"])))
+                 for s in sponsors for c in cosponsors
+                 if s.get("bioguideId") and c.get("bioguideId") and s["bioguideId"] != c["bioguideId"]}
+        self.edges.update(pairs)
+        self.bills[bill_url] = (updated, tuple(pairs))
+
+    def _publish(self):
+        self.graph = _CosponsorGraph(dict(self.members), Counter(self.edges), len(self.bills))
+        self.updated_at = _format_datetime(datetime.now(timezone.utc))
+
+    def status(self) -> dict:
+        return {
+            "congress": self.congress,
+            "state": self.state,
+            "bills_listed": self.listed,
+            "bills_processed": self.graph.bills,
+            "members": len(self.graph.ids),
+            "edges": self.graph.edges,
+            "fetch_errors": self.errors,
+            "error": self.error,
+            "updated_at": self.updated_at
+        }
+
+
+_networks = {}  # congress -> _CosponsorNetwork
+_networks_lock = threading.Lock()
+
+
+def _network(congress: int) -> _CosponsorNetwork:
+    with _networks_lock:
+        return _networks.setdefault(congress, _CosponsorNetwork(congress))
+
+
+@mcp.tool()
+async def build_cosponsor_network(congress: int, refresh: bool = False, stop: bool = False) -> dict:
+    """
+    Start building the sponsor-cosponsor network of a congress in the background.
+
+    Every bill's sponsors and cosponsors are fetched (in parallel, from spare rate-limit quota
+    only) and linked; query the network with get_cosponsor_network while it builds.
+
+    Args:
+        congress: Congress number (e.g., 118 for 118th Congress)
+        refresh: Walk the bills again once built, re-reading bills updated since (default false)
+        stop: Stop a running build instead; the network built so far stays queryable and a later
+            call resumes it (default false)
+
+    Returns:
+        dict: Build state and progress
+    """
+    network = _network(congress)
+    if stop:
+        network.stop()
+    else:
+        network.start(refresh)
+    return network.status()
+
+
+@mcp.tool()
+async def get_cosponsor_network(
+    congress: int,
+    bioguide_id: str | None = None,
+    top: int = 10
+) -> dict:
+    """
+    Retrieve a member's position in a congress's cosponsorship network, or the network's most bipartisan members.
+
+    Two members are linked by every bill one sponsored and the other cosponsored. Degree is the number
+    of distinct collaborators, bipartisanship the share of shared bills with members of another party
+    (the overview ranks members with at least 10 shared bills).
+
+    Args:
+        congress: Congress number (e.g., 118 for 118th Congress); build it first with build_cosponsor_network
+        bioguide_id: Member bioguide ID (e.g., "A000374"); omit for a network overview
+        top: Number of collaborators (or members, in the overview) to list (default 10)
+
+    Returns:
+        dict: Build status, plus the member's degree, bipartisanship and top collaborators, or the most
+            connected and most bipartisan members
+    """
+    network = _network(congress)
+    graph = network.graph
+    result = {"network": network.status()}
+    if bioguide_id:
+        member = graph.member(bioguide_id.upper(), top)
+        if member is None:
+            return dict(result, error=f"{bioguide_id} is not in the network (yet)", status_code=None)
+        return dict(result, member=member)
+    return dict(result,
+                most_connected=[graph.member(graph.ids[i], 0) for i in graph.by_degree[:top]],
+                most_bipartisan=[graph.member(graph.ids[i], 0) for i in graph.by_bipartisanship[:top]])
+
+
+committee_tree_ttl = float(os.environ.get("CONGRESS_GOV_COMMITTEE_TREE_TTL", 3600))
+
+
+def _system_code(code: str) -> str:
+    """Normalize a committee code; a bare committee code ("hsag") means the full committee ("hsag00")."""
+    code = code.strip().lower()
+    return code + "00" if len(code) == 4 else code
+
+
+class _CommitteeTree:
+    """
+    The committees of one congress, keyed by system code, with parent and subcommittee links.
+
+    Built from the congress's committee list, which embeds each committee's
+    parent and subcommittees; a committee that is only referenced is read
+    from its detail endpoint. A refresh lists only committees updated since
+    the newest updateDate already seen, skipping expired cache entries.
+    """
+
+    def __init__(self, congress: int):
+        self.congress = congress
+        self.nodes = {}  # system code -> committee
+        self.latest = None  # newest updateDate seen, as a fromDateTime value
+        self.refreshed_at = None
+        self.lock = threading.Lock()
+
+    def refresh(self) -> "_CommitteeTree":
+        with self.lock:
+            if self.refreshed_at is not None and time.monotonic() - self.refreshed_at <= committee_tree_ttl:
+                return self
+            params = {"fromDateTime": self.latest} if self.latest else None
+            records = _list_all(f"{_API_BASE}committee/{self.congress}", params, fresh=True)
+            for record in records:
+                self._merge(record)
+            missing = sorted({code for node in self.nodes.values()
+                              for code in node["subcommittees"] + [node["parent"]] if code and code not in self.nodes})
+            details = _fanout_map(self._detail, missing)
+            for record in details:
+                if record is not None:
+                    self._merge(record)
+            self._link()
+            self.refreshed_at = time.monotonic()
+            _count("committee_tree_refreshes")
+        return self
+
+    def _detail(self, code: str):
+        chamber = {"h": "house", "s": "senate", "j": "joint"}.get(code[:1])
+        if chamber is None:
+            return None
+        try:
+            return _fetch(f"{_API_BASE}committee/{chamber}/{code}", dict(_DETAIL_PARAMS, api_key=congress_gov_api_key),
+                          fresh=True).get("committee")
+        except requests.exceptions.RequestException:
+            _count("committee_tree_detail_errors")
+            return None
+
+    def _merge(self, record: dict):
+        code = record.get("systemCode")
+        if not code:
+            return
+        code = code.lower()
+        node = self.nodes.setdefault(code, {"systemCode": code, "subcommittees": [], "parent": None})
+        history = record.get("history") or [{}]
+        node.update({
+            "name": record.get("name") or history[0].get("officialName") or history[0].get("libraryOfCongressName") or node.get("name"),
+            "chamber": record.get("chamber") or node.get("chamber"),
+            "type": record.get("committeeTypeCode") or record.get("type") or node.get("type"),
+            "updateDate": record.get("updateDate") or node.get("updateDate")
+        })
+        if "parent" in record:
+            node["parent"] = ((record.get("parent") or {}).get("systemCode") or "").lower() or None
+        if "subcommittees" in record:
+            node["subcommittees"] = sorted({sub["systemCode"].lower() for sub in record.get("subcommittees") or []
+                                            if sub.get("systemCode")})
+        updated = str(node.get("updateDate") or "")[:19]
+        if len(updated) == 19 and (self.latest is None or updated + "Z" > self.latest):
+            self.latest = updated + "Z"
+
+    def _link(self):
+        """Make parent and subcommittee links agree in both directions."""
+        for code, node in self.nodes.items():
+            parent = self.nodes.get(node["parent"]) if node["parent"] else None
+            if parent is not None and code not in parent["subcommittees"]:
+                parent["subcommittees"] = sorted(parent["subcommittees"] + [code])
+            for sub in node["subcommittees"]:
+                if sub in self.nodes and not self.nodes[sub]["parent"]:
+                    self.nodes[sub]["parent"] = code
+
+    def summary(self, code: str) -> dict:
+        node = self.nodes.get(code)
+        return {"systemCode": code, "name": node.get("name") if node else None}
+
+    def lookup(self, code: str) -> dict | None:
+        node = self.nodes.get(code)
+        if node is None:
+            return None
+        return dict(node,
+                    parent=self.summary(node["parent"]) if node["parent"] else None,
+                    subcommittees=[self.summary(sub) for sub in node["subcommittees"]])
+
+    def tree(self, chamber: str | None) -> list:
+        def build(code):
+            node = self.nodes[code]
+            return {
+                "systemCode": code,
+                "name": node.get("name"),
+                "chamber": node.get("chamber"),
+                "type": node.get("type"),
+                "subcommittees": [build(sub) for sub in node["subcommittees"] if sub in self.nodes]
+            }
+        roots = [code for code, node in sorted(self.nodes.items()) if node["parent"] not in self.nodes]
+        if chamber is not None:
+            roots = [code for code in roots if str(self.nodes[code].get("chamber", "")).lower() == chamber.lower()]
+        return [build(code) for code in roots]
+
+
+_committee_trees = {}  # congress -> _CommitteeTree
+_committee_trees_lock = threading.Lock()
+
+
+def _committee_tree(congress: int | None) -> _CommitteeTree:
+    if congress is None:
+        congress = _get_calendar().congress(datetime.now(timezone.utc).date())
+    with _committee_trees_lock:
+        tree = _committee_trees.setdefault(congress, _CommitteeTree(congress))
+    return tree.refresh()
+
+
+def _committee_tree_snapshot(congress: int | None, chamber: str | None) -> dict:
+    tree = _committee_tree(congress)
+    with tree.lock:
+        return {"congress": tree.congress, "committees": tree.tree(chamber), "count": len(tree.nodes)}
+
+
+def _committee_lookup(congress: int | None, code: str) -> tuple[int, dict | None]:
+    tree = _committee_tree(congress)
+    with tree.lock:
+        return tree.congress, tree.lookup(code)
+
+
+@mcp.tool()
+async def get_committee_tree(
+    congress: int | None = None,
+    chamber: str | None = None
+) -> dict:
+    """
+    Retrieve every committee of a congress with its subcommittees nested beneath it.
+
+    Served from an in-memory tree built once per congress and refreshed with only the committees
+    updated since (every CONGRESS_GOV_COMMITTEE_TREE_TTL seconds).
+
+    Args:
+        congress: Congress number (e.g., 118 for 118th Congress); defaults to the current congress
+        chamber: Only committees of this chamber ('House', 'Senate' or 'Joint')
+
+    Returns:
+        dict: Full committees, each with its nested subcommittees, and the number of committees in the tree
+    """
+    try:
+        return await _call(_committee_tree_snapshot, congress, chamber)
+    except requests.exceptions.RequestException as e:
+        return {
+            "error": f"Failed to retrieve committee tree: {str(e)}",
+            "status_code": getattr(e.response, "status_code", None)
+        }
+
+
+@mcp.tool()
+async def resolve_committee(
+    system_code: str,
+    congress: int | None = None
+) -> dict:
+    """
+    Look up a committee or subcommittee by system code, with its parent committee and subcommittees.
+
+    Args:
+        system_code: Committee system code (e.g., "hsag15" for a subcommittee, "hsag00" or "hsag" for the full committee)
+        congress: Congress number (e.g., 118 for 118th Congress); defaults to the current congress
+
+    Returns:
+        dict: The committee's name, chamber, type, parent (null for a full committee) and subcommittees
+    """
+    try:
+        congress, committee = await _call(_committee_lookup, congress, _system_code(system_code))
+    except requests.exceptions.RequestException as e:
+        return {
+            "error": f"Failed to retrieve committee tree: {str(e)}",
+            "status_code": getattr(e.response, "status_code", None)
+        }
+    if committee is None:
+        return {"error": f"No committee {system_code} in congress {congress}", "status_code": None}
+    return dict(committee, congress=congress)
+
+
+mirror_query_timeout = float(os.environ.get("CONGRESS_GOV_MIRROR_QUERY_TIMEOUT", "5"))
+
+
+@mcp.tool()
+async def query_mirror(
+    sql: str,
+    max_rows: int = 1000
+) -> dict:
+    """
+    Run a read-only SQL query (SQLite) over the local mirror of Congress.gov records this server has fetched.
+
+    The mirror fills as tools, exports and warm-up fetch data; it holds only what has been fetched.
+    Tables:
+        bills(congress, type, number, title, origin_chamber, introduced_date, policy_area,
+              latest_action_date, latest_action_text, update_date)
+        actions(congress, type, number, action_date, action_code, action_type, source, text)
+        sponsors(congress, type, number, bioguide_id, party, state)
+        cosponsors(congress, type, number, bioguide_id, party, state, sponsorship_date, is_original, withdrawn_date)
+        members(bioguide_id, name, party, state, district, chamber, current_member, update_date)
+        votes(congress, session, roll_call, date, question, vote_type, result, legislation_type, legislation_number)
+        committees(system_code, name, chamber, committee_type, parent_system_code, update_date)
+        nominations(congress, number, part, citation, description, organization, received_date,
+                    latest_action_date, latest_action_text, update_date)
+    Bill types are lowercase (e.g., 'hr'); bills join to actions, sponsors and cosponsors on (congress, type, number).
+
+    Args:
+        sql: A single SELECT statement (e.g., "SELECT party, COUNT(*) FROM cosponsors WHERE congress = 118 GROUP BY party")
+        max_rows: Maximum rows to return (max 10000, default 1000)
+
+    Returns:
+        dict: Column names, rows, whether rows were cut off at max_rows, and the query time in milliseconds
+    """
+    if _mirror is None:
+        return {"error": "The local mirror is disabled (set CONGRESS_GOV_MIRROR=1 to enable it)", "status_code": None}
+    try:
+        return await asyncio.to_thread(_mirror.query, sql, min(max_rows, 10000), mirror_query_timeout)
+    except sqlite3.Error as e:
+        return {"error": f"Query failed: {str(e)}", "status_code": None}
+
+
+@mcp.tool()
+async def get_next_page(
+    cursor: str,
+    max_tokens: int | None = None
+) -> dict:
+    """
+    Continue any list from a cursor, instead of computing offsets.
+
+    List responses carry a cursor in `pagination.cursor` (or `continuation.cursor` when trimmed
+    to a token budget). Pages are read from full-size upstream pages, and are pinned to when the
+    first page was fetched, so successive pages neither skip nor repeat records.
+
+    Args:
+        cursor: Cursor from a previous list response
+        max_tokens: Return only as many records as fit in about this many tokens
+
+    Returns:
+        dict: The next page, with a continuation cursor unless it is the last
+    """
+    try:
+        return await _call(_fetch_within, None, {}, None, max_tokens, cursor)
+
+    except _InvalidCursor as e:
+        return {"error": str(e), "status_code": None}
+
+    except requests.exceptions.RequestException as e:
+        return {
+            "error": f"Failed to retrieve next page: {str(e)}",
+            "status_code": getattr(e.response, "status_code", None)
+        }
+
+
+admin_tools = os.environ.get("CONGRESS_GOV_ADMIN_TOOLS", "0") == "1"
+
+
+def _key_matches(key: str, stored_at: float, endpoint: str | None, path_prefix: str | None,
+                 older_than: float | None) -> bool:
+    path = _api_path(key.split("#")[0])
+    if endpoint is not None and path.split("/")[0] != endpoint.strip("/").lower():
+        return False
+    if path_prefix is not None:
+        prefix = path_prefix.strip("/").lower()
+        if path != prefix and not path.startswith(prefix + "/"):
+            return False
+    return older_than is None or time.time() - stored_at >= older_than
+
+
+def _split_key(key: str) -> tuple[str, dict, list[str] | None]:
+    """The (url, params, fields) a cache key was built from."""
+    request, _, fields = key.partition("#")
+    url, _, query = request.partition("?")
+    params = dict(parse_qsl(query), api_key=congress_gov_api_key)
+    return url, params, fields.split(",") if fields else None
+
+
+async def get_cache_stats(top: int = 10) -> dict:
+    """
+    Show the response cache: size of each tier, hit ratio per endpoint and the most requested keys.
+
+    Args:
+        top: Number of most requested cache keys to list (default 10)
+
+    Returns:
+        dict: Per-tier sizes and counts, per-endpoint hits, misses and hit ratio, top keys and server counters
+    """
+    with _metrics_lock:
+        metrics = dict(_metrics)
+    return {
+        "tiers": {
+            "memory": _cache.stats(),
+            "disk": _disk_cache.stats() if _disk_cache is not None else None,
+            "negative": _negative_cache.stats()
+        },
+        **_usage.report(top),
+        "metrics": metrics
+    }
+
+
+async def invalidate_cache(
+    endpoint: str | None = None,
+    path_prefix: str | None = None,
+    older_than_seconds: float | None = None
+) -> dict:
+    """
+    Drop cached responses from every cache tier. Conditions combine; with none given, everything is dropped.
+
+    Args:
+        endpoint: Only entries of this endpoint (e.g., "bill", "member")
+        path_prefix: Only entries at or below this path (e.g., "/bill/118/hr/1")
+        older_than_seconds: Only entries stored at least this many seconds ago
+
+    Returns:
+        dict: Number of entries removed from each tier
+    """
+    def predicate(key, stored_at):
+        return _key_matches(key, stored_at, endpoint, path_prefix, older_than_seconds)
+
+    removed = {"memory": _cache.invalidate(predicate), "negative": _negative_cache.invalidate(predicate)}
+    if _disk_cache is not None:
+        removed["disk"] = await asyncio.to_thread(_disk_cache.invalidate, predicate)
+    return {"removed": removed}
+
+
+async def refresh_cache(
+    endpoint: str | None = None,
+    path_prefix: str | None = None
+) -> dict:
+    """
+    Fetch cached responses again from Congress.gov and replace them in the cache.
+
+    Args:
+        endpoint: Only entries of this endpoint (e.g., "bill", "member")
+        path_prefix: Only entries at or below this path (e.g., "/bill/118")
+
+    Returns:
+        dict: Number of entries refreshed and the errors for any that failed
+    """
+    keys = [key for key in _cache.keys() if _key_matches(key, time.time(), endpoint, path_prefix, None)]
+
+    def refresh(key):
+        try:
+            _load(key, *_split_key(key))
+            return None
+        except requests.exceptions.RequestException as e:
+            return {"key": key, "error": _redact(str(e))}
+
+    try:
+        results = await _call(_fanout_map, refresh, keys, deadline=None)
+    except requests.exceptions.RequestException as e:
+        return {"error": f"Failed to refresh cache: {str(e)}", "status_code": getattr(e.response, "status_code", None)}
+    errors = [result for result in results if result is not None]
+    return {"refreshed": len(keys) - len(errors), "errors": errors}
+
+
+if admin_tools:
+    for _admin_tool in (get_cache_stats, invalidate_cache, refresh_cache):
+        mcp.tool()(_admin_tool)
+
+
+# Reference data nearly every session starts with, loaded right after startup.
+_WARM_DATASETS = {
+    "congress": lambda: get_congress(),
+    "calendar": lambda: resolve_dates("today"),
+    "committees": lambda: get_committees(),
+    "members": lambda: get_members(current_member=True)
+}
+
+warm_datasets = [name.strip() for name in os.environ.get("CONGRESS_GOV_WARM", ",".join(_WARM_DATASETS)).split(",") if name.strip()]
+for name in warm_datasets:
+    if name not in _WARM_DATASETS:
+        raise EnvironmentError(f"CONGRESS_GOV_WARM: unknown dataset {name!r}; choose from {', '.join(_WARM_DATASETS)}")
+
+
+async def _warm_up(names: list[str]):
+    """Run the default calls for `names` so their responses are cached before the first request."""
+    results = await asyncio.gather(*(_WARM_DATASETS[name]() for name in names))
+    for result in results:
+        _count("warm_failures" if "error" in result else "warm_loaded")
+
+
+def _start_warm_up() -> threading.Thread | None:
+    """Warm the cache in a background thread so tool registration is not held up."""
+    if not warm_datasets:
+        return None
+    thread = threading.Thread(target=asyncio.run, args=(_warm_up(warm_datasets),), name="warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+def _export_main(argv: list[str]):
+    parser = argparse.ArgumentParser(prog="server.py export", description="Export a Congress.gov list endpoint.")
+    parser.add_argument("endpoint", help='List endpoint, e.g. "bill" or "nomination"')
+    parser.add_argument("--output", "-o", required=True)
+    parser.add_argument("--format", "-f", choices=_EXPORT_FORMATS, default="jsonl")
+    parser.add_argument("--congress", type=int)
+    parser.add_argument("--record-type")
+    parser.add_argument("--from-datetime")
+    parser.add_argument("--to-datetime")
+    parser.add_argument("--no-resume", action="store_true")
+    args = parser.parse_args(argv)
+
+    def progress(written, total):
+        print(f"\r{written}/{total} records", end="", file=sys.stderr, flush=True)
+
+    url, params = _export_target(args.endpoint, args.congress, args.record_type, args.from_datetime, args.to_datetime)
+    result = _export(url, params, args.output, args.format, not args.no_resume, progress)
+    print(file=sys.stderr)
+    print(json.dumps(result))
+
+
 if __name__ == "__main__":
-    mcp.run()
+    if sys.argv[1:2] == ["export"]:
+        _export_main(sys.argv[2:])
+    else:
+        _start_warm_up()
+        mcp.run()
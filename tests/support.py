@@ -0,0 +1,30 @@
+"""Scaffolding shared by the tests that run without calling the API."""
+from unittest import mock
+import server
+
+
+def isolate(test, **overrides):
+    """
+    Give `test` fresh, empty copies of server's module-level caches and indexes, restored when it ends.
+
+    A new module-level cache or index only needs adding here. `overrides`
+    replace these defaults or patch further attributes (e.g. a TTL).
+    """
+    state = dict(
+        _cache=server._ResponseCache(ttl=60, max_entries=64),
+        _negative_cache=server._ResponseCache(ttl=0, max_entries=8),
+        _known_ids=server._KnownIds(ttl=0),
+        _page_index=server._PageIndex(),
+        _usage=server._CacheUsage(),
+        _disk_cache=None,
+        _prefetcher=None,
+        _detail_prefetcher=None,
+        _mirror=None,
+        _calendar=None,
+        _vote_index={},
+        _networks={},
+        _committee_trees={}
+    )
+    patcher = mock.patch.multiple(server, **dict(state, **overrides))
+    patcher.start()
+    test.addCleanup(patcher.stop)
@@ -0,0 +1,57 @@
+import unittest
+import asyncio
+from unittest import mock
+import server
+from tests.support import isolate
+from server import get_bills, get_cache_stats, invalidate_cache, refresh_cache
+
+
+class TestAdminTools(unittest.TestCase):
+    """Test the cache admin tools without calling the API"""
+
+    def setUp(self):
+        isolate(self, _cache=server._ResponseCache(ttl=60, max_entries=32))
+        self.page = {"bills": [{"number": "1"}], "pagination": {"count": 1}}
+        with mock.patch.object(server, "_get_json", return_value=self.page):
+            asyncio.run(get_bills(congress=118))
+            asyncio.run(get_bills(congress=118))
+            asyncio.run(get_bills(congress=118, bill_type="hr", bill_number=1))
+            asyncio.run(server.get_members(bioguide_id="A000374"))
+
+    def test_cache_stats(self):
+        """Test that stats report tier sizes, per-endpoint hit ratios and top keys"""
+        result = asyncio.run(get_cache_stats(top=1))
+
+        self.assertEqual(result["tiers"]["memory"]["entries"], 3)
+        self.assertEqual(result["endpoints"]["bill"], {"hits": 1, "misses": 2, "hit_ratio": 0.333})
+        self.assertEqual(result["top_keys"][0]["requests"], 2)
+        self.assertNotIn("api_key", result["top_keys"][0]["key"])
+
+    def test_invalidate_by_path_prefix(self):
+        """Test that a path prefix removes the entries at and below it only"""
+        result = asyncio.run(invalidate_cache(path_prefix="/bill/118/hr/1"))
+
+        self.assertEqual(result["removed"]["memory"], 1)
+        self.assertEqual(len(server._cache.keys()), 2)
+
+    def test_invalidate_by_endpoint_and_age(self):
+        """Test that endpoint and age conditions combine"""
+        self.assertEqual(asyncio.run(invalidate_cache(endpoint="member", older_than_seconds=3600))["removed"]["memory"], 0)
+        self.assertEqual(asyncio.run(invalidate_cache(endpoint="member"))["removed"]["memory"], 1)
+        self.assertEqual(asyncio.run(invalidate_cache())["removed"]["memory"], 2)
+
+    def test_refresh(self):
+        """Test that refresh replaces matching entries with new upstream data"""
+        fresh = {"bill": {"number": "1", "title": "Updated"}}
+        with mock.patch.object(server, "_get_json", return_value=fresh) as get_json:
+            result = asyncio.run(refresh_cache(path_prefix="/bill/118/hr"))
+            cached = asyncio.run(get_bills(congress=118, bill_type="hr", bill_number=1))
+
+        self.assertEqual(result, {"refreshed": 1, "errors": []})
+        get_json.assert_called_once()
+        self.assertEqual(get_json.call_args.args[1]["api_key"], server.congress_gov_api_key)
+        self.assertEqual(cached, fresh)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import asyncio
+from unittest import mock
+import server
+from tests.support import isolate
+from server import aggregate_counts
+
+
+class TestAggregateCounts(unittest.TestCase):
+    """Test the aggregate_counts tool without calling the API"""
+
+    def setUp(self):
+        isolate(self)
+        self.totals = {"117/hr": 9709, "117/s": 5360, "118/hr": 10564, "118/s": 5649}
+
+    def upstream(self, url, params, fields=None):
+        cell = url.split("/bill/")[1]
+        if cell not in self.totals:
+            error = server.requests.exceptions.HTTPError("400 Client Error")
+            error.response = mock.Mock(status_code=400)
+            raise error
+        return {"bills": [{"number": "1"}], "pagination": {"count": self.totals[cell]}}
+
+    def test_count_table(self):
+        """Test that every congress and type cell is probed once with limit=1"""
+        with mock.patch.object(server, "_get_json", side_effect=self.upstream) as get_json:
+            result = asyncio.run(aggregate_counts("bill", [117, 118], ["hr", "s"]))
+
+        self.assertEqual(result["counts"], {"117": {"hr": 9709, "s": 5360}, "118": {"hr": 10564, "s": 5649}})
+        self.assertEqual(result["totals"]["118"], 16213)
+        self.assertEqual(result["total"], sum(self.totals.values()))
+        self.assertEqual(get_json.call_count, 4)
+        self.assertTrue(all(call.args[1]["limit"] == 1 for call in get_json.call_args_list))
+
+    def test_probes_are_cached(self):
+        """Test that repeating a query is answered from the cache"""
+        with mock.patch.object(server, "_get_json", side_effect=self.upstream) as get_json:
+            asyncio.run(aggregate_counts("bill", [118], ["hr"]))
+            asyncio.run(aggregate_counts("bill", [118], ["hr", "s"]))
+
+        self.assertEqual(get_json.call_count, 2)
+
+    def test_failed_cells_reported(self):
+        """Test that a failing cell is listed without failing the whole table"""
+        with mock.patch.object(server, "_get_json", side_effect=self.upstream):
+            result = asyncio.run(aggregate_counts("bill", [118], ["hr", "xx"]))
+
+        self.assertEqual(result["counts"], {"118": {"hr": 10564}})
+        self.assertEqual(result["errors"][0]["record_type"], "xx")
+
+    def test_probes_skip_prefetch(self):
+        """Test that count probes do not schedule next-page prefetches"""
+        prefetcher = server._NextPagePrefetcher(max_workers=1)
+        self.addCleanup(prefetcher._executor.shutdown)
+
+        def upstream(url, params, fields=None):
+            page = self.upstream(url, params, fields)
+            page["pagination"]["next"] = url + "?offset=1"
+            return page
+
+        with mock.patch.object(server, "_prefetcher", prefetcher), \
+                mock.patch.object(server, "_get_json", side_effect=upstream) as get_json:
+            asyncio.run(aggregate_counts("bill", [117, 118], ["hr", "s"]))
+            prefetcher._executor.shutdown(wait=True)
+
+        self.assertEqual(get_json.call_count, 4)
+        self.assertFalse(prefetcher._pending)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import asyncio
+from unittest import mock
+import server
+from tests.support import isolate
+from server import get_bills, get_congressional_record
+
+
+class TestTokenBudget(unittest.TestCase):
+    """Test budget-limited responses and continuation cursors without calling the API"""
+
+    def setUp(self):
+        isolate(self, _cache=server._ResponseCache(ttl=60, max_entries=32))
+        self.bills = [{"number": str(n), "title": "x" * 200, "url": f"https://api.congress.gov/v3/bill/118/hr/{n}?format=json"}
+                      for n in range(40)]
+        self.pages = [{"bills": self.bills[:20], "pagination": {"count": 40}}]
+
+    def upstream(self, url, params, fields=None):
+        offset, limit = int(params["offset"]), int(params["limit"])
+        return {"bills": self.bills[offset:offset + limit], "pagination": {"count": len(self.bills)}}
+
+    def test_prefix_fits_budget(self):
+        """Test that only the records fitting the budget are returned, with a cursor for the rest"""
+        with mock.patch.object(server, "_get_json", return_value=self.pages[0]):
+            result = asyncio.run(get_bills(congress=118, max_tokens=300))
+
+        self.assertLessEqual(len(server._json_dumps(result)), 300 * server._BYTES_PER_TOKEN)
+        self.assertGreater(len(result["bills"]), 0)
+        self.assertEqual(result["continuation"]["remaining"], 40 - len(result["bills"]))
+
+    def test_cursor_walks_whole_list(self):
+        """Test that following cursors returns every record once, reusing the cached page"""
+        with mock.patch.object(server, "_get_json", side_effect=self.upstream) as get_json:
+            result = asyncio.run(get_bills(congress=118, max_tokens=400))
+            numbers = [b["number"] for b in result["bills"]]
+            while "continuation" in result:
+                result = asyncio.run(get_bills(cursor=result["continuation"]["cursor"]))
+                numbers += [b["number"] for b in result["bills"]]
+                if len(numbers) < 20:
+                    # The rest of the first page comes from the cached page.
+                    self.assertEqual(get_json.call_count, 1)
+
+        self.assertEqual(numbers, [str(n) for n in range(40)])
+        # One request for the first page, one full-size block for the pages after it.
+        self.assertEqual(get_json.call_count, 2)
+        self.assertEqual(get_json.call_args_list[1].args[1]["limit"], server._UPSTREAM_MAX_LIMIT)
+
+    def test_snapshot_only_for_dated_lists(self):
+        """Test that cursors pin toDateTime only on lists that filter on it"""
+        records = [{"url": "https://api.congress.gov/v3/bill/118/hr/1?format=json"}]
+        bills = server._decode_cursor(server._cursor(server._API_BASE + "bill/118", {"limit": 1}, None, 0, records, 2))
+        actions = server._decode_cursor(server._cursor(server._API_BASE + "bill/118/hr/1/actions", {"limit": 1}, None, 0, records, 2))
+        votes = server._decode_cursor(server._cursor(server._API_BASE + "house-vote/118", {"limit": 1}, None, 0, records, 2))
+
+        self.assertIn("toDateTime", bills["p"])
+        self.assertNotIn("toDateTime", actions["p"])
+        self.assertNotIn("toDateTime", votes["p"])
+
+    def test_envelope_records(self):
+        """Test that records nested in the congressional record envelope are budgeted"""
+        page = {"Results": {"Issues": [{"Issue": str(n), "Text": "x" * 500} for n in range(10)], "IndexStart": 1}}
+        with mock.patch.object(server, "_get_json", return_value=page):
+            result = asyncio.run(get_congressional_record(max_tokens=300, limit=10))
+
+        self.assertLess(len(result["Results"]["Issues"]), 10)
+        self.assertEqual(result["Results"]["IndexStart"], 1)
+        self.assertIn("cursor", result["continuation"])
+
+    def test_invalid_cursor(self):
+        """Test that a cursor not issued by the server is rejected"""
+        result = asyncio.run(get_bills(cursor="not-a-cursor"))
+
+        self.assertIn("Invalid cursor", result["error"])
+
+    def test_no_budget_unchanged(self):
+        """Test that calls without a budget return the upstream page as is"""
+        with mock.patch.object(server, "_get_json", return_value=self.pages[0]):
+            result = asyncio.run(get_bills(congress=118))
+
+        self.assertEqual(result["bills"], self.pages[0]["bills"])
+        self.assertNotIn("continuation", result)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,314 @@
+import unittest
+import asyncio
+import tempfile
+from unittest import mock
+import server
+from tests.support import isolate
+from server import get_bills
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test the response cache and result encoding without calling the API"""
+
+    def setUp(self):
+        isolate(self, _cache=server._ResponseCache(ttl=60, max_entries=8))
+        self.page = {"bills": [{"number": "1", "title": "A bill"}], "pagination": {"count": 1}}
+
+    def test_repeat_call_served_from_cache(self):
+        """Test that an identical call does not reach the API again"""
+        with mock.patch.object(server, "_get_json", return_value=self.page) as get_json:
+            first = asyncio.run(get_bills(congress=118, limit=1))
+            second = asyncio.run(get_bills(congress=118, limit=1))
+
+        self.assertEqual(get_json.call_count, 1)
+        self.assertEqual(first, second)
+
+    def test_cached_result_keeps_encoded_bytes(self):
+        """Test that results carry encoded JSON that round-trips"""
+        with mock.patch.object(server, "_get_json", return_value=self.page):
+            result = asyncio.run(get_bills(congress=118, limit=1))
+
+        self.assertEqual(server._json_loads(server._encode_result(result)), self.page)
+
+    def test_api_key_not_in_cache_key(self):
+        """Test that the API key is stripped from cache keys"""
+        key = server._cache_key("https://api.congress.gov/v3/bill", {"api_key": "secret", "limit": 1})
+
+        self.assertNotIn("secret", key)
+
+    def test_next_page_prefetched(self):
+        """Test that the prefetcher caches page N+1 after page N is served"""
+        pages = [
+            dict(self.page, pagination={"count": 2, "next": "https://api.congress.gov/v3/bill/118?offset=1"}),
+            dict(self.page, pagination={"count": 2, "next": None})
+        ]
+        server._prefetcher = server._NextPagePrefetcher(max_workers=1)
+        try:
+            with mock.patch.object(server, "_get_json", side_effect=pages) as get_json:
+                asyncio.run(get_bills(congress=118, offset=0, limit=1))
+                server._prefetcher._executor.shutdown(wait=True)
+                asyncio.run(get_bills(congress=118, offset=1, limit=1))
+        finally:
+            server._prefetcher = None
+
+        self.assertEqual(get_json.call_count, 2)
+        self.assertEqual(get_json.call_args.args[1]["offset"], 1)
+
+    def test_list_items_warm_details(self):
+        """Test that the detail prefetcher caches the details a later lookup asks for"""
+        listing = {"bills": [{"number": "7", "url": "https://api.congress.gov/v3/bill/118/hr/7?format=json"}]}
+        detail = {"bill": {"number": "7"}}
+        server._detail_prefetcher = server._DetailPrefetcher(top_k=2, max_workers=1)
+        try:
+            with mock.patch.object(server, "_get_json", side_effect=[listing, detail]) as get_json:
+                asyncio.run(get_bills(congress=118, bill_type="hr"))
+                server._detail_prefetcher._executor.shutdown(wait=True)
+                result = asyncio.run(get_bills(congress=118, bill_type="hr", bill_number=7))
+        finally:
+            server._detail_prefetcher = None
+
+        self.assertEqual(get_json.call_count, 2)
+        self.assertEqual(result, detail)
+
+    def test_scope_cancel_closes_responses(self):
+        """Test that cancelling a call scope closes the responses it is reading"""
+        scope = server._CallScope()
+        response = mock.Mock()
+        scope.track(response)
+        scope.cancel()
+
+        response.close.assert_called_once()
+        with self.assertRaises(server._Cancelled):
+            scope.check()
+
+    def test_scope_deadline(self):
+        """Test that an expired deadline surfaces as a request timeout"""
+        scope = server._CallScope(deadline=0)
+
+        with self.assertRaises(server.requests.exceptions.Timeout):
+            scope.check()
+
+    def test_hedge_wins_over_slow_primary(self):
+        """Test that a request outlasting the p95 is raced against a duplicate"""
+        release = server.threading.Event()
+
+        def get_json_once(url, params, fields, timeout, scope, attempt_deadline):
+            if not get_json_once.calls:
+                get_json_once.calls.append("primary")
+                scope.cancelled.wait(5)
+                release.set()
+                raise server._Cancelled()
+            get_json_once.calls.append("hedge")
+            return {"bill": {"number": "1"}}
+        get_json_once.calls = []
+
+        budget = server._HedgeBudget(ratio=1)
+        budget.earn()
+        before = server._metrics["hedge_wins"]
+        with mock.patch.object(server, "_get_json_once", side_effect=get_json_once), \
+                mock.patch.object(server, "_hedge_budget", budget):
+            result = server._get_json_hedged("url", {}, None, (1, 1), None, None, threshold=0.01)
+
+        self.assertEqual(result, {"bill": {"number": "1"}})
+        self.assertEqual(get_json_once.calls, ["primary", "hedge"])
+        self.assertTrue(release.wait(1))
+        self.assertEqual(server._metrics["hedge_wins"], before + 1)
+
+    def test_hedge_budget(self):
+        """Test that hedges are capped at the configured fraction of requests"""
+        budget = server._HedgeBudget(ratio=0.5)
+        budget.earn()
+        self.assertFalse(budget.spend())
+        budget.earn()
+        self.assertTrue(budget.spend())
+        self.assertFalse(budget.spend())
+
+    def test_warm_up(self):
+        """Test that warmed reference datasets are served from the cache"""
+        with mock.patch.object(server, "_get_json", return_value=self.page) as get_json:
+            asyncio.run(server._warm_up(["congress", "members"]))
+            self.assertEqual(get_json.call_count, 2)
+            asyncio.run(server.get_congress())
+            asyncio.run(server.get_members(current_member=True))
+
+        self.assertEqual(get_json.call_count, 2)
+
+    def test_disk_cache_survives_restart(self):
+        """Test that a response written to disk is served by a fresh memory cache"""
+        with tempfile.TemporaryDirectory() as directory:
+            with mock.patch.object(server, "_disk_cache", server._DiskCache(directory, ttl=60, max_bytes=1 << 20)):
+                with mock.patch.object(server, "_get_json", return_value=self.page):
+                    asyncio.run(get_bills(congress=118))
+                server._cache = server._ResponseCache(ttl=60, max_entries=8)
+                with mock.patch.object(server, "_get_json") as get_json:
+                    result = asyncio.run(get_bills(congress=118))
+
+        get_json.assert_not_called()
+        self.assertEqual(result, self.page)
+
+    def test_stale_while_revalidate(self):
+        """Test that an expired entry is served at once and refreshed in the background"""
+        server._cache = server._ResponseCache(ttl=60, max_entries=8, keep_stale=3600)
+        fresh = {"bills": [{"number": "2", "title": "Newer"}], "pagination": {"count": 1}}
+        with mock.patch.object(server, "_get_json", return_value=self.page):
+            asyncio.run(get_bills(congress=118))
+        with mock.patch.object(server.time, "time", return_value=server.time.time() + 120):
+            with mock.patch.object(server, "_get_json", return_value=fresh) as get_json:
+                result = asyncio.run(get_bills(congress=118))
+                while server._revalidating:
+                    server.time.sleep(0.01)
+
+        self.assertEqual(result["bills"], self.page["bills"])
+        self.assertTrue(result["cache"]["stale"])
+        self.assertGreaterEqual(result["cache"]["age_seconds"], 119)
+        get_json.assert_called_once()
+        self.assertEqual(asyncio.run(get_bills(congress=118)), fresh)
+
+    def test_stale_if_error(self):
+        """Test that old data is served, flagged, when the upstream is down"""
+        server._cache = server._ResponseCache(ttl=60, max_entries=8, keep_stale=86400)
+        with mock.patch.object(server, "_get_json", return_value=self.page):
+            asyncio.run(get_bills(congress=118))
+        down = server.requests.exceptions.ConnectionError("down")
+        with mock.patch.object(server.time, "time", return_value=server.time.time() + 7200):
+            with mock.patch.object(server, "_get_json", side_effect=down):
+                result = asyncio.run(get_bills(congress=118))
+                missing = asyncio.run(get_bills(congress=117))
+
+        self.assertEqual(result["bills"], self.page["bills"])
+        self.assertIn("upstream unavailable", result["cache"]["reason"])
+        self.assertIn("error", missing)
+
+    def test_circuit_breaker(self):
+        """Test that the breaker opens after repeated failures and lets a probe through after the cooldown"""
+        breaker = server._CircuitBreaker(failures=2, cooldown=30)
+        breaker.failure()
+        breaker.check()
+        breaker.failure()
+        with self.assertRaises(server._CircuitOpen):
+            breaker.check()
+        with mock.patch.object(server.time, "monotonic", return_value=server.time.monotonic() + 31):
+            breaker.check()
+            with self.assertRaises(server._CircuitOpen):
+                breaker.check()
+        breaker.success()
+        breaker.check()
+
+    def test_negative_cache(self):
+        """Test that a 404 is remembered and not requested again"""
+        server._negative_cache = server._ResponseCache(ttl=60, max_entries=8)
+        missing = server._not_found("https://api.congress.gov/v3/bill/118/hr/99999")
+        with mock.patch.object(server, "_get_json", side_effect=missing) as get_json:
+            first = asyncio.run(get_bills(congress=118, bill_type="hr", bill_number=99999))
+            second = asyncio.run(get_bills(congress=118, bill_type="hr", bill_number=99999))
+
+        get_json.assert_called_once()
+        self.assertEqual(first, second)
+        self.assertEqual(second["status_code"], 404)
+
+    def test_known_ids_reject_missing_detail(self):
+        """Test that a complete listing lets lookups of unlisted items be rejected locally"""
+        server._known_ids = server._KnownIds(ttl=60)
+        listing = {
+            "bills": [{"number": str(n), "url": f"https://api.congress.gov/v3/bill/118/hr/{n}?format=json"} for n in (1, 2)],
+            "pagination": {"count": 2}
+        }
+        with mock.patch.object(server, "_get_json", return_value=listing):
+            asyncio.run(get_bills(congress=118, bill_type="hr"))
+        with mock.patch.object(server, "_get_json", return_value={"bill": {"number": "2"}}) as get_json:
+            missing = asyncio.run(get_bills(congress=118, bill_type="hr", bill_number=3))
+            found = asyncio.run(get_bills(congress=118, bill_type="hr", bill_number=2))
+            other = asyncio.run(get_bills(congress=118, bill_type="s", bill_number=3))
+
+        self.assertEqual(missing["status_code"], 404)
+        self.assertEqual(found, {"bill": {"number": "2"}})
+        self.assertEqual(other, {"bill": {"number": "2"}})
+        self.assertEqual(get_json.call_count, 2)
+
+    def test_known_ids_incomplete_listing(self):
+        """Test that a partial listing never rejects a lookup"""
+        known = server._KnownIds(ttl=60)
+        known.observe_page("https://api.congress.gov/v3/member", {"offset": 0, "limit": 1}, {
+            "members": [{"url": "https://api.congress.gov/v3/member/A000001?format=json"}],
+            "pagination": {"count": 2500}
+        })
+
+        self.assertFalse(known.rejects("https://api.congress.gov/v3/member/Z999999"))
+
+    def test_equivalent_requests_share_key(self):
+        """Test that defaults, parameter order and api_key do not change the cache key"""
+        url = "https://api.congress.gov/v3/bill/118"
+
+        self.assertEqual(
+            server._cache_key(url, {"api_key": "a", "format": "json", "offset": 0, "limit": 20}),
+            server._cache_key(url, {"sort": "updateDate+desc", "limit": 20, "api_key": "b"})
+        )
+        self.assertEqual(server._cache_key(url, {"limit": 1000}), server._cache_key(url, {"limit": 250}))
+        self.assertNotEqual(server._cache_key(url, {"limit": 20}), server._cache_key(url, {"limit": 20, "sort": "updateDate+asc"}))
+
+    def test_sub_page_served_from_larger_page(self):
+        """Test that a page inside a cached larger page is cut from it"""
+        page = {"bills": [{"number": str(n)} for n in range(100)], "pagination": {"count": 300}}
+        with mock.patch.object(server, "_get_json", return_value=page):
+            asyncio.run(get_bills(congress=118, limit=100))
+        with mock.patch.object(server, "_get_json") as get_json:
+            result = asyncio.run(get_bills(congress=118, offset=40, limit=10))
+
+        get_json.assert_not_called()
+        self.assertEqual([b["number"] for b in result["bills"]], [str(n) for n in range(40, 50)])
+        self.assertEqual(result["pagination"]["count"], 300)
+        self.assertIn("offset=50", result["pagination"]["next"])
+        self.assertNotIn("api_key", result["pagination"]["next"])
+
+    def test_sub_page_past_cached_page_goes_upstream(self):
+        """Test that a page reaching beyond the cached page is fetched"""
+        page = {"bills": [{"number": str(n)} for n in range(100)], "pagination": {"count": 300}}
+        with mock.patch.object(server, "_get_json", return_value=page):
+            asyncio.run(get_bills(congress=118, limit=100))
+        with mock.patch.object(server, "_get_json", return_value=self.page) as get_json:
+            asyncio.run(get_bills(congress=118, offset=95, limit=10))
+
+        get_json.assert_called_once()
+
+    def test_memory_byte_budget(self):
+        """Test that the memory tier evicts least recently used entries past its byte budget"""
+        cache = server._ResponseCache(ttl=60, max_entries=100, max_bytes=25)
+        for key in ("a", "b", "c"):
+            cache.put(key, b"x" * 10)
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("c"), b"x" * 10)
+        self.assertEqual(cache.stats()["bytes"], 20)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_disk_tier(self):
+        """Test that the disk tier compresses entries, evicts past its byte budget and reloads its index"""
+        encoded = b'{"bills":[' + b'{"title":"An act"},' * 200 + b'{}]}'
+        with tempfile.TemporaryDirectory() as directory:
+            disk = server._DiskCache(directory, ttl=60, max_bytes=200)
+            disk.put("a", encoded)
+            size = disk.stats()["bytes"]
+            self.assertLess(size, len(encoded) // 10)
+            self.assertEqual(disk.get("a"), encoded)
+
+            for key in ("b", "c", "d", "e", "f"):
+                disk.put(key, encoded + key.encode())
+            self.assertIsNone(disk.get("a"))
+            self.assertLessEqual(disk.stats()["bytes"], 200)
+
+            reopened = server._DiskCache(directory, ttl=60, max_bytes=200)
+            self.assertEqual(reopened.stats()["entries"], disk.stats()["entries"])
+            self.assertEqual(reopened.get("f"), encoded + b"f")
+
+    def test_lru_eviction(self):
+        """Test that the oldest entry is evicted past max_entries"""
+        cache = server._ResponseCache(ttl=60, max_entries=2)
+        for key in ("a", "b", "c"):
+            cache.put(key, b"{}")
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("c"), b"{}")
+
+
+if __name__ == '__main__':
+    unittest.main()
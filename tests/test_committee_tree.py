@@ -0,0 +1,130 @@
+import unittest
+import asyncio
+import threading
+from unittest import mock
+import server
+from tests.support import isolate
+from server import get_committee_tree, resolve_committee
+
+API = "https://api.congress.gov/v3/"
+
+
+def ref(code, name):
+    return {"systemCode": code, "name": name, "url": f"{API}committee/house/{code}?format=json"}
+
+
+class TestCommitteeTree(unittest.TestCase):
+    """Test the committee hierarchy cache without calling the API"""
+
+    def setUp(self):
+        isolate(self, committee_tree_ttl=0)
+        self.committees = [
+            {"systemCode": "hsag00", "name": "Agriculture Committee", "chamber": "House", "committeeTypeCode": "Standing",
+             "parent": None, "subcommittees": [ref("hsag15", "Conservation"), ref("hsag22", "Nutrition")],
+             "updateDate": "2024-01-05T10:00:00Z"},
+            {"systemCode": "hsag15", "name": "Conservation", "chamber": "House", "committeeTypeCode": "Subcommittee",
+             "parent": ref("hsag00", "Agriculture Committee"), "updateDate": "2024-01-04T10:00:00Z"},
+            {"systemCode": "ssfi00", "name": "Finance Committee", "chamber": "Senate", "committeeTypeCode": "Standing",
+             "subcommittees": [], "updateDate": "2024-01-03T10:00:00Z"}
+        ]
+        self.details = {"hsag22": {"committee": {"systemCode": "hsag22", "type": "Subcommittee",
+                                                 "history": [{"officialName": "Nutrition and Foreign Agriculture"}],
+                                                 "parent": ref("hsag00", "Agriculture Committee"),
+                                                 "updateDate": "2024-01-01T00:00:00Z"}}}
+        self.requests = []
+
+    def upstream(self, url, params, fields=None):
+        path = url[len(API):]
+        self.requests.append((path, params.get("fromDateTime")))
+        if path == "committee/118":
+            since = params.get("fromDateTime", "")
+            listed = [c for c in self.committees if c["updateDate"] >= since]
+            return {"committees": listed, "pagination": {"count": len(listed)}}
+        return self.details[path.split("/")[-1]]
+
+    def test_tree(self):
+        """Test that subcommittees are nested under their parents, including ones only referenced"""
+        with mock.patch.object(server, "_get_json", side_effect=self.upstream):
+            result = asyncio.run(get_committee_tree(118))
+            house = asyncio.run(get_committee_tree(118, chamber="house"))
+
+        self.assertEqual([c["systemCode"] for c in result["committees"]], ["hsag00", "ssfi00"])
+        agriculture = result["committees"][0]
+        self.assertEqual([s["systemCode"] for s in agriculture["subcommittees"]], ["hsag15", "hsag22"])
+        self.assertEqual(agriculture["subcommittees"][1]["name"], "Nutrition and Foreign Agriculture")
+        self.assertEqual(result["count"], 4)
+        self.assertEqual(len(house["committees"]), 1)
+
+    def test_resolve_subcommittee(self):
+        """Test that a subcommittee code resolves to its parent and a bare code to the full committee"""
+        with mock.patch.object(server, "_get_json", side_effect=self.upstream):
+            sub = asyncio.run(resolve_committee("HSAG15", 118))
+            full = asyncio.run(resolve_committee("hsag", 118))
+            missing = asyncio.run(resolve_committee("hsxx99", 118))
+
+        self.assertEqual(sub["parent"], {"systemCode": "hsag00", "name": "Agriculture Committee"})
+        self.assertEqual(len(full["subcommittees"]), 2)
+        self.assertIsNone(missing["status_code"])
+
+    def test_incremental_refresh(self):
+        """Test that refreshes list only committees updated since the newest updateDate seen"""
+        with mock.patch.object(server, "_get_json", side_effect=self.upstream):
+            asyncio.run(get_committee_tree(118))
+            self.committees.append({"systemCode": "ssfi10", "name": "Taxation", "chamber": "Senate",
+                                    "parent": {"systemCode": "ssfi00"}, "updateDate": "2024-02-01T00:00:00Z"})
+            self.requests.clear()
+            result = asyncio.run(resolve_committee("ssfi00", 118))
+
+        self.assertEqual(self.requests, [("committee/118", "2024-01-05T10:00:00Z")])
+        self.assertEqual(result["subcommittees"], [{"systemCode": "ssfi10", "name": "Taxation"}])
+
+    def test_refresh_skips_stale_entries(self):
+        """Test that a refresh reads the committee list upstream rather than from an expired cache entry"""
+        server._cache = server._ResponseCache(ttl=60, max_entries=64, keep_stale=3600)
+        with mock.patch.object(server, "_get_json", side_effect=self.upstream):
+            asyncio.run(get_committee_tree(118))
+            asyncio.run(get_committee_tree(118))
+            entries = server._cache._entries
+            for key, (stored_at, encoded) in list(entries.items()):
+                entries[key] = (stored_at - 120, encoded)
+            self.committees.append({"systemCode": "ssfi10", "name": "Taxation", "chamber": "Senate",
+                                    "parent": {"systemCode": "ssfi00"}, "updateDate": "2024-01-05T10:00:00Z"})
+            result = asyncio.run(resolve_committee("ssfi10", 118))
+
+        self.assertEqual(result["parent"]["systemCode"], "ssfi00")
+
+    def test_busy_tree_does_not_block_event_loop(self):
+        """Test that a tree that starts refreshing mid-call is waited on off the event loop"""
+        refresh = server._committee_tree
+        busy, done = threading.Event(), threading.Event()
+        self.addCleanup(done.set)
+
+        def hold(tree):
+            with tree.lock:
+                busy.set()
+                done.wait(5)
+
+        def refresh_then_busy(congress):
+            tree = refresh(congress)
+            # Another refresh takes the lock before the snapshot is read.
+            threading.Thread(target=hold, args=(tree,), daemon=True).start()
+            busy.wait()
+            return tree
+
+        async def main():
+            task = asyncio.create_task(get_committee_tree(118))
+            await asyncio.sleep(0.05)
+            loop_ran = busy.is_set() and not task.done()
+            done.set()
+            return loop_ran, await task
+
+        with mock.patch.object(server, "_get_json", side_effect=self.upstream), \
+                mock.patch.object(server, "_committee_tree", side_effect=refresh_then_busy):
+            loop_ran, result = asyncio.run(main())
+
+        self.assertTrue(loop_ran)
+        self.assertEqual(result["count"], 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
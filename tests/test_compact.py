@@ -0,0 +1,54 @@
+import unittest
+import asyncio
+import json
+from unittest import mock
+import server
+from tests.support import isolate
+
+
+class TestCompactOutput(unittest.TestCase):
+    """Test compact results and api_key redaction without calling the API"""
+
+    def setUp(self):
+        isolate(self, _cache=server._ResponseCache(ttl=60, max_entries=8))
+        self.page = {
+            "bills": [{"number": str(n), "url": f"https://api.congress.gov/v3/bill/118/hr/{n}?format=json",
+                       "latestAction": {"text": "Referred"}} for n in range(3)],
+            "pagination": {"count": 3, "next": f"https://api.congress.gov/v3/bill/118?offset=3&limit=3&format=json&api_key={server.congress_gov_api_key}"},
+            "request": {"contentType": "application/json", "format": "json"}
+        }
+
+    def call(self, compact):
+        with mock.patch.object(server, "compact_output", compact), \
+                mock.patch.object(server, "_get_json", return_value=json.loads(json.dumps(self.page))):
+            content = asyncio.run(server.mcp.call_tool("get_bills", {"congress": 118, "limit": 3}))
+        content = content[0] if isinstance(content, tuple) else content
+        return content[0].text
+
+    def test_compact_output(self):
+        """Test that compact mode drops the request echo and shortens URLs"""
+        text = self.call(compact=True)
+        result = json.loads(text)
+
+        self.assertNotIn("request", result)
+        self.assertEqual([b["url"] for b in result["bills"]], ["bill/118/hr/0", "bill/118/hr/1", "bill/118/hr/2"])
+        self.assertEqual(result["pagination"]["next"], "bill/118?offset=3&limit=3")
+        self.assertLess(len(text), len(self.call(compact=False)))
+
+    def test_api_key_never_returned(self):
+        """Test that the api_key is stripped from pagination links in every mode"""
+        for compact in (False, True):
+            self.assertNotIn("api_key", self.call(compact))
+
+    def test_api_key_redacted_from_errors(self):
+        """Test that request errors do not echo the api_key"""
+        error = server.requests.exceptions.HTTPError(
+            f"404 Client Error: Not Found for url: https://api.congress.gov/v3/bill/1?api_key={server.congress_gov_api_key}")
+        with mock.patch.object(server, "_get_json", side_effect=error):
+            result = asyncio.run(server.get_bills(congress=1))
+
+        self.assertNotIn(server.congress_gov_api_key, result["error"])
+
+
+if __name__ == '__main__':
+    unittest.main()
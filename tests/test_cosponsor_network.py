@@ -0,0 +1,135 @@
+import unittest
+import asyncio
+from unittest import mock
+import server
+from tests.support import isolate
+from server import build_cosponsor_network, get_cosponsor_network
+
+API = "https://api.congress.gov/v3/"
+
+
+def member(bioguide_id, party):
+    return {"bioguideId": bioguide_id, "fullName": bioguide_id, "party": party, "state": "CA"}
+
+
+class TestCosponsorNetwork(unittest.TestCase):
+    """Test the cosponsorship network builder without calling the API"""
+
+    def setUp(self):
+        isolate(self, _cache=server._ResponseCache(ttl=60, max_entries=256, keep_stale=3600))
+        self.members = {"D1": member("D1", "D"), "D2": member("D2", "D"), "R1": member("R1", "R"), "R2": member("R2", "R")}
+        # bill number -> (updateDate, sponsor, cosponsors)
+        self.bills = {
+            1: ("2024-01-01", "D1", ["D2", "R1"]),
+            2: ("2024-01-02", "D1", ["R1"]),
+            3: ("2024-01-03", "R1", ["R2", "D1"]),
+            4: ("2024-01-04", "R2", [])
+        }
+        self.requests = []
+
+    def upstream(self, url, params, fields=None):
+        path = url[len(API):]
+        self.requests.append(path)
+        parts = path.split("/")
+        if path == "bill/118":
+            return {"bills": [{"number": str(n), "updateDate": updated, "url": f"{API}bill/118/hr/{n}?format=json"}
+                              for n, (updated, _, _) in self.bills.items()], "pagination": {"count": len(self.bills)}}
+        updated, sponsor, cosponsors = self.bills[int(parts[3])]
+        if parts[-1] == "cosponsors":
+            return {"cosponsors": [self.members[c] for c in cosponsors], "pagination": {"count": len(cosponsors)}}
+        return {"bill": {"number": parts[3], "sponsors": [self.members[sponsor]],
+                         "cosponsors": {"count": len(cosponsors), "url": f"{API}{path}/cosponsors?format=json"}}}
+
+    def build(self, refresh=False):
+        # The builder has its own executor; the interactive tools' pool must stay free.
+        fanout = mock.Mock(submit=mock.Mock(side_effect=AssertionError("builder used _fanout")))
+        with mock.patch.object(server, "_fanout", fanout):
+            asyncio.run(build_cosponsor_network(118, refresh=refresh))
+            server._networks[118]._thread.join()
+
+    def test_member_metrics(self):
+        """Test degree, shared bills, bipartisanship and collaborator ranking"""
+        with mock.patch.object(server, "_get_json", side_effect=self.upstream):
+            self.build()
+            result = asyncio.run(get_cosponsor_network(118, "d1"))
+
+        self.assertEqual(result["network"]["state"], "complete")
+        self.assertEqual(result["network"]["bills_processed"], 4)
+        d1 = result["member"]
+        self.assertEqual(d1["degree"], 2)
+        self.assertEqual(d1["shared_bills"], 4)
+        self.assertEqual(d1["bipartisanship"], 0.75)
+        self.assertEqual(d1["top_collaborators"][0]["bioguide_id"], "R1")
+        self.assertEqual(d1["top_collaborators"][0]["shared_bills"], 3)
+
+    def test_bills_without_cosponsors_skip_list(self):
+        """Test that a bill with no cosponsors costs only its detail request"""
+        with mock.patch.object(server, "_get_json", side_effect=self.upstream):
+            self.build()
+
+        self.assertNotIn("bill/118/hr/4/cosponsors", self.requests)
+        self.assertIn("bill/118/hr/4", self.requests)
+
+    def test_refresh_rereads_changed_bills(self):
+        """Test that a refresh replaces the edges of bills updated since the last walk"""
+        with mock.patch.object(server, "_get_json", side_effect=self.upstream):
+            self.build()
+            self.bills[2] = ("2024-02-01", "D1", ["D2"])
+            entries = server._cache._entries
+            for key, (stored_at, encoded) in list(entries.items()):
+                entries[key] = (stored_at - 120, encoded)  # expired, but within the stale window
+            self.requests.clear()
+            self.build(refresh=True)
+            result = asyncio.run(get_cosponsor_network(118, "D1"))
+
+        self.assertEqual(sorted(self.requests), ["bill/118", "bill/118/hr/2", "bill/118/hr/2/cosponsors"])
+        collaborators = {c["bioguide_id"]: c["shared_bills"] for c in result["member"]["top_collaborators"]}
+        self.assertEqual(collaborators, {"R1": 2, "D2": 2})
+
+    def test_waits_for_quota_until_stopped(self):
+        """Test that the builder waits at the quota reserve and stops when asked, keeping its snapshot"""
+        quota = server._Quota(reserve=100)
+        quota.update({"X-RateLimit-Remaining": "50"})
+        with mock.patch.object(server, "_quota", quota), \
+                mock.patch.object(server, "_get_json", side_effect=self.upstream):
+            asyncio.run(build_cosponsor_network(118))
+            network = server._networks[118]
+            self.assertEqual(network.state, "building")
+            stopping = asyncio.run(build_cosponsor_network(118, stop=True))
+            network._thread.join(timeout=5)
+
+        self.assertEqual(stopping["state"], "stopping")
+        self.assertEqual(network.state, "stopped")
+        self.assertEqual(self.requests, [])
+
+    def test_quota_charged_per_request(self):
+        """Test that list pages, bill details and cosponsor pages each claim one unit of spare quota"""
+        quota = server._Quota(reserve=0)
+        quota.update({"X-RateLimit-Remaining": "1000"})
+        with mock.patch.object(server, "_quota", quota), \
+                mock.patch.object(server, "_get_json", side_effect=self.upstream):
+            self.build()
+
+        self.assertEqual(len(self.requests), 1 + 4 + 3)
+        self.assertEqual(1000 - quota.remaining, len(self.requests))
+
+    def test_quota_estimate_expires(self):
+        """Test that the remaining-quota count is forgotten once its hour has passed"""
+        quota = server._Quota(reserve=100, window=3600)
+        quota.update({"X-RateLimit-Remaining": "50"})
+        self.assertFalse(quota.spend_spare())
+        quota.updated_at -= 3600
+
+        self.assertTrue(quota.spend_spare())
+        self.assertIsNone(quota.remaining)
+
+    def test_unknown_member(self):
+        """Test that a member outside the network is reported"""
+        result = asyncio.run(get_cosponsor_network(117, "X000001"))
+
+        self.assertEqual(result["network"]["state"], "idle")
+        self.assertIn("not in the network", result["error"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import unittest
+import asyncio
+import threading
+from unittest import mock
+import server
+from tests.support import isolate
+from server import expand_record
+
+API = "https://api.congress.gov/v3/"
+
+
+class TestExpandRecord(unittest.TestCase):
+    """Test the expand_record tool without calling the API"""
+
+    def setUp(self):
+        isolate(self)
+        self.upstream_data = {
+            "bill/118/hr/1": {"bill": {
+                "number": "1",
+                "sponsors": [{"bioguideId": "S000001", "url": API + "member/S000001?format=json"}],
+                "committees": {"count": 2, "url": API + "bill/118/hr/1/committees?format=json"},
+                "url": API + "bill/118/hr/1?format=json"
+            }},
+            "member/S000001": {"member": {"bioguideId": "S000001", "partyHistory": [{"partyAbbreviation": "R"}]}},
+            "bill/118/hr/1/committees": {"committees": [
+                {"systemCode": "hsii00", "url": API + "committee/house/hsii00?format=json"},
+                {"systemCode": "hsag00", "url": API + "committee/house/hsag00?format=json"}
+            ], "pagination": {"count": 2}},
+            "committee/house/hsii00": {"committee": {"systemCode": "hsii00", "url": API + "committee/house/hsii00?format=json"}},
+            "committee/house/hsii00/reports": {"reports": [{"citation": "H. Rept. 118-1"}], "pagination": {"count": 1}},
+            "committee/house/hsag00": {"committee": {"systemCode": "hsag00", "reports": {"count": 0, "url": API + "committee/house/hsag00/reports?format=json"}}},
+            "committee/house/hsag00/reports": {"reports": [], "pagination": {"count": 0}}
+        }
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def upstream(self, url, params, fields=None):
+        path = url[len(API):]
+        with self.lock:
+            self.calls.append(path)
+        if path == "bill/118/hr/1/cosponsors":
+            offset = int(params["offset"])
+            return {"cosponsors": [{"bioguideId": f"C{n:06d}"} for n in range(offset, min(offset + int(params["limit"]), 600))],
+                    "pagination": {"count": 600}}
+        if path not in self.upstream_data:
+            error = server.requests.exceptions.HTTPError("404 Client Error")
+            error.response = mock.Mock(status_code=404)
+            raise error
+        return self.upstream_data[path]
+
+    def test_expand_nested_relations(self):
+        """Test that linked records, linked lists and sub-resources are expanded in place"""
+        with mock.patch.object(server, "_get_json", side_effect=self.upstream):
+            result = asyncio.run(expand_record("bill/118/hr/1", ["sponsors", "committees.reports"]))
+
+        record = result["record"]
+        self.assertEqual(record["sponsors"][0]["partyHistory"][0]["partyAbbreviation"], "R")
+        self.assertEqual([c["systemCode"] for c in record["committees"]], ["hsii00", "hsag00"])
+        self.assertEqual(record["committees"][0]["reports"], [{"citation": "H. Rept. 118-1"}])
+        self.assertEqual(record["committees"][1]["reports"], [])
+        self.assertEqual(result["errors"], [])
+        self.assertFalse(result["truncated"])
+
+    def test_each_url_fetched_once(self):
+        """Test that the expansion and a repeat of it share upstream lookups"""
+        with mock.patch.object(server, "_get_json", side_effect=self.upstream):
+            asyncio.run(expand_record("bill/118/hr/1", ["sponsors", "committees.reports"]))
+            first = len(self.calls)
+            asyncio.run(expand_record(API + "bill/118/hr/1", ["sponsors", "committees"]))
+
+        self.assertEqual(len(self.calls), len(set(self.calls)))
+        self.assertEqual(len(self.calls), first)
+
+    def test_missing_relation_reported(self):
+        """Test that a relation without a sub-resource is reported rather than failing the call"""
+        with mock.patch.object(server, "_get_json", side_effect=self.upstream):
+            result = asyncio.run(expand_record("bill/118/hr/1", ["hearings"]))
+
+        self.assertEqual(result["record"]["hearings"]["status_code"], 404)
+        self.assertEqual(result["errors"][0]["url"], "bill/118/hr/1/hearings")
+
+    def test_request_cap(self):
+        """Test that expansion stops at max_requests"""
+        with mock.patch.object(server, "_get_json", side_effect=self.upstream):
+            result = asyncio.run(expand_record("bill/118/hr/1", ["committees.reports"], max_requests=2))
+
+        self.assertTrue(result["truncated"])
+        self.assertLessEqual(result["requests"], 2)
+
+    def test_long_lists_paged(self):
+        """Test that linked lists longer than a page are read in full, or reported when the cap cuts them"""
+        with mock.patch.object(server, "_get_json", side_effect=self.upstream):
+            full = asyncio.run(expand_record("bill/118/hr/1", ["cosponsors"]))
+            capped = asyncio.run(expand_record("bill/118/hr/1", ["cosponsors"], max_requests=3))
+
+        self.assertEqual(len(full["record"]["cosponsors"]), 600)
+        self.assertEqual(full["record"]["cosponsors"][-1]["bioguideId"], "C000599")
+        self.assertEqual(full["requests"], 4)  # the root's detail, then three pages
+        self.assertEqual(full["partial"], [])
+        self.assertEqual(len(capped["record"]["cosponsors"]), 500)
+        self.assertTrue(capped["truncated"])
+        self.assertEqual(capped["partial"], [{"url": "bill/118/hr/1/cosponsors", "returned": 500, "remaining": 100}])
+
+    def test_missing_root(self):
+        """Test that a missing root record is returned as an error"""
+        with mock.patch.object(server, "_get_json", side_effect=self.upstream):
+            result = asyncio.run(expand_record("bill/118/hr/9999", ["sponsors"]))
+
+        self.assertEqual(result["status_code"], 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
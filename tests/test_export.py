@@ -0,0 +1,175 @@
+import unittest
+import asyncio
+import csv
+import json
+import os
+import tempfile
+import time
+from unittest import mock
+import server
+from tests.support import isolate
+from server import export_records
+
+
+class TestExportRecordsAPI(unittest.TestCase):
+    """Test the export_records tool with real API calls"""
+
+    def setUp(self):
+        """Add a small delay between tests and export into a scratch directory"""
+        time.sleep(0.5)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.export_dir = server.export_dir
+        server.export_dir = self.tmp.name
+
+    def tearDown(self):
+        server.export_dir = self.export_dir
+        self.tmp.cleanup()
+
+    def test_export_records_jsonl(self):
+        """Test exporting one day of bill updates to JSONL"""
+        result = asyncio.run(export_records(
+            "bill", "bills.jsonl", congress=118,
+            from_datetime="2024-03-01T00:00:00Z", to_datetime="2024-03-02T00:00:00Z"
+        ))
+
+        self.assertIsInstance(result, dict)
+        if "error" not in result:
+            with open(result["output"]) as f:
+                lines = [json.loads(line) for line in f]
+            self.assertEqual(len(lines), result["records"])
+            self.assertFalse(os.path.exists(result["output"] + ".checkpoint.json"))
+
+    def test_export_records_csv(self):
+        """Test exporting nominations to CSV"""
+        result = asyncio.run(export_records(
+            "nomination", "nominations.csv", format="csv", congress=118,
+            from_datetime="2024-03-01T00:00:00Z", to_datetime="2024-03-15T00:00:00Z"
+        ))
+
+        self.assertIsInstance(result, dict)
+        if "error" not in result:
+            self.assertEqual(result["format"], "csv")
+            self.assertTrue(os.path.exists(result["output"]))
+
+    def test_export_records_rejects_outside_path(self):
+        """Test that exports cannot escape the export directory"""
+        result = asyncio.run(export_records("bill", "../bills.jsonl"))
+
+        self.assertIn("error", result)
+
+    def test_export_records_rejects_unknown_format(self):
+        """Test that an unsupported format returns an error"""
+        result = asyncio.run(export_records("bill", "bills.xml", format="xml"))
+
+        self.assertIn("error", result)
+
+
+class TestExportCheckpoints(unittest.TestCase):
+    """Test export checkpoints, resume and CSV headers without calling the API"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        isolate(self, export_dir=self.tmp.name)
+        self.bills = [{"number": str(n), "title": f"Bill {n}"} for n in range(600)]
+        self.fail_at = None
+        self.offsets = []
+
+    def upstream(self, url, params, fields=None):
+        offset, limit = int(params["offset"]), int(params["limit"])
+        self.offsets.append(offset)
+        if offset == self.fail_at:
+            raise server.requests.exceptions.ConnectionError("connection reset")
+        return {"bills": self.bills[offset:offset + limit], "pagination": {"count": len(self.bills)}}
+
+    def export(self, output, **kwargs):
+        with mock.patch.object(server, "_get_json", side_effect=self.upstream):
+            return asyncio.run(export_records("bill", output, congress=118, **kwargs))
+
+    def test_interrupted_export_resumes(self):
+        """Test that an interrupted export keeps a checkpoint and continues from it"""
+        self.fail_at = 500
+        failed = self.export("bills.jsonl")
+        path = os.path.join(self.tmp.name, "bills.jsonl")
+        with open(path + ".checkpoint.json") as f:
+            checkpoint = json.load(f)
+
+        self.assertIn("error", failed)
+        self.assertEqual((checkpoint["next_offset"], checkpoint["written"]), (500, 500))
+
+        self.fail_at, self.offsets = None, []
+        result = self.export("bills.jsonl")
+        with open(path) as f:
+            numbers = [json.loads(line)["number"] for line in f]
+
+        self.assertEqual(self.offsets, [500])
+        self.assertEqual(result["records"], 600)
+        self.assertEqual(numbers, [str(n) for n in range(600)])
+        self.assertFalse(os.path.exists(path + ".checkpoint.json"))
+
+    def test_resume_truncates_unflushed_tail(self):
+        """Test that bytes written after the last checkpoint are discarded on resume"""
+        self.fail_at = 250
+        self.export("bills.jsonl")
+        path = os.path.join(self.tmp.name, "bills.jsonl")
+        with open(path, "a") as f:
+            f.write('{"number": "partial')
+
+        self.fail_at = None
+        self.export("bills.jsonl")
+        with open(path) as f:
+            numbers = [json.loads(line)["number"] for line in f]
+
+        self.assertEqual(numbers, [str(n) for n in range(600)])
+
+    def test_resume_false_starts_over(self):
+        """Test that resume=False ignores an existing checkpoint"""
+        self.fail_at = 500
+        self.export("bills.jsonl")
+        self.fail_at, self.offsets = None, []
+        result = self.export("bills.jsonl", resume=False)
+
+        self.assertEqual(self.offsets, [0, 250, 500])
+        self.assertEqual(result["records"], 600)
+
+    def test_csv_header_widens(self):
+        """Test that fields first seen on later pages are added to the CSV header, across a resume"""
+        for bill in self.bills[300:]:
+            bill["policyArea"] = {"name": "Taxation"}
+        for bill in self.bills[550:]:
+            bill["sponsor"] = "A000001"
+        self.fail_at = 500
+        self.export("bills.csv", format="csv")
+        self.fail_at = None
+        self.export("bills.csv", format="csv")
+        with open(os.path.join(self.tmp.name, "bills.csv"), newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+
+        self.assertEqual(len(rows), 600)
+        self.assertEqual(list(rows[0]), ["number", "title", "policyArea", "sponsor"])
+        self.assertEqual([row["number"] for row in rows], [str(n) for n in range(600)])
+        self.assertIn(rows[0]["policyArea"], ("", None))
+        self.assertEqual(json.loads(rows[400]["policyArea"]), {"name": "Taxation"})
+        self.assertEqual(rows[599]["sponsor"], "A000001")
+
+    def test_csv_resume_with_multibyte_text(self):
+        """Test that a CSV export of non-ASCII records resumes at the right byte, dropping a partial row"""
+        for bill in self.bills:
+            bill["title"] = f"Ley de protección — café № {bill['number']} 🇺🇸"
+        self.fail_at = 250
+        self.export("bills.csv", format="csv")
+        path = os.path.join(self.tmp.name, "bills.csv")
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("250,Ley de protecci")
+
+        self.fail_at = None
+        self.export("bills.csv", format="csv")
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+
+        self.assertEqual([row["number"] for row in rows], [str(n) for n in range(600)])
+        self.assertEqual(rows[599]["title"], "Ley de protección — café № 599 🇺🇸")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import unittest
+import asyncio
+import threading
+from unittest import mock
+import server
+from tests.support import isolate
+from server import filter_records
+
+
+class TestFilterRecords(unittest.TestCase):
+    """Test the filter_records tool without calling the API"""
+
+    def setUp(self):
+        isolate(self)
+        self.bills = [{
+            "number": str(n),
+            "originChamber": "Senate" if n % 3 == 0 else "House",
+            "latestAction": {"actionDate": f"2024-01-{n % 28 + 1:02d}", "text": "Became Public Law No: 118-1." if n % 100 == 7 else "Referred to the Committee."}
+        } for n in range(600)]
+        self.offsets = []
+        self.lock = threading.Lock()
+
+    def upstream(self, url, params, fields=None):
+        offset, limit = int(params["offset"]), int(params["limit"])
+        with self.lock:
+            self.offsets.append(offset)
+        return {"bills": self.bills[offset:offset + limit], "pagination": {"count": len(self.bills)}}
+
+    def test_stops_at_limit(self):
+        """Test that the scan stops at the limit-th match and reports where it stopped"""
+        where = [{"field": "latestAction.text", "op": "contains", "value": "public law"}]
+        with mock.patch.object(server, "_get_json", side_effect=self.upstream):
+            result = asyncio.run(filter_records("bill", where, limit=2, congress=118))
+
+        self.assertEqual([b["number"] for b in result["records"]], ["7", "107"])
+        self.assertEqual(result["scanned"], 108)
+        self.assertEqual(result["next_offset"], 108)
+        self.assertEqual(result["total"], 600)
+
+    def test_continue_from_next_offset(self):
+        """Test that continuing from next_offset finds the remaining matches across pages"""
+        where = [{"field": "latestAction.text", "op": "regex", "value": r"public law no: \d+-\d+"}]
+        with mock.patch.object(server, "_get_json", side_effect=self.upstream):
+            first = asyncio.run(filter_records("bill", where, limit=3))
+            rest = asyncio.run(filter_records("bill", where, limit=10, offset=first["next_offset"]))
+
+        numbers = [b["number"] for b in first["records"] + rest["records"]]
+        self.assertEqual(numbers, [str(n) for n in range(600) if n % 100 == 7])
+        self.assertIsNone(rest["next_offset"])
+        self.assertEqual(rest["scanned"], 600 - first["next_offset"])
+
+    def test_combined_conditions(self):
+        """Test comparisons, numeric coercion and any/all matching"""
+        where = [{"field": "originChamber", "op": "eq", "value": "Senate"}, {"field": "number", "op": "lt", "value": 10}]
+        with mock.patch.object(server, "_get_json", side_effect=self.upstream):
+            both = asyncio.run(filter_records("bill", where, limit=250, fields=["number"]))
+            either = asyncio.run(filter_records("bill", where, match="any", limit=250, max_scan=30))
+
+        self.assertEqual(both["records"], [{"number": "0"}, {"number": "3"}, {"number": "6"}, {"number": "9"}])
+        self.assertEqual(both["scanned"], 600)
+        self.assertEqual(either["scanned"], 30)
+        self.assertEqual(either["matched"], 10 + 6)
+        self.assertEqual(either["next_offset"], 30)
+
+    def test_pages_cached(self):
+        """Test that repeated scans reuse the cached full-size pages"""
+        where = [{"field": "originChamber", "op": "eq", "value": "House"}]
+        with mock.patch.object(server, "_get_json", side_effect=self.upstream):
+            asyncio.run(filter_records("bill", where, limit=250))
+            fetched = sorted(self.offsets)
+            asyncio.run(filter_records("bill", where, limit=5, offset=260))
+
+        self.assertEqual(fetched[:2], [0, 250])
+        self.assertEqual(len(self.offsets), len(set(self.offsets)))
+
+    def test_prefetch_only_when_needed(self):
+        """Test that the next page is fetched ahead only when the matches so far suggest it will be read"""
+        dense = [{"field": "originChamber", "op": "eq", "value": "House"}]
+        sparse = [{"field": "latestAction.text", "op": "contains", "value": "public law"}]
+        ahead = []
+
+        def submit(fn, fetch, block):
+            ahead.append(block)
+            future = server.Future()
+            future.set_result(fn(fetch, block))
+            return future
+
+        def blocks_ahead(*args, **kwargs):
+            ahead.clear()
+            asyncio.run(filter_records(*args, **kwargs))
+            return list(ahead)
+
+        with mock.patch.object(server, "_fanout", mock.Mock(submit=submit)), \
+                mock.patch.object(server, "_get_json", side_effect=self.upstream):
+            self.assertEqual(blocks_ahead("bill", dense, limit=20), [])
+            self.assertEqual(blocks_ahead("bill", sparse, limit=10, max_scan=450, congress=117), [])
+            self.assertEqual(blocks_ahead("bill", sparse, limit=10, congress=118), [2])
+
+        self.assertEqual(self.offsets, [0, 0, 250, 0, 250, 500])
+
+    def test_invalid_condition(self):
+        """Test that malformed conditions are rejected before any request"""
+        with mock.patch.object(server, "_get_json", side_effect=self.upstream) as get_json:
+            bad_op = asyncio.run(filter_records("bill", [{"field": "number", "op": "like", "value": "1"}]))
+            bad_regex = asyncio.run(filter_records("bill", [{"field": "number", "op": "regex", "value": "("}]))
+
+        self.assertIsNone(bad_op["status_code"])
+        self.assertIn("Invalid regex", bad_regex["error"])
+        get_json.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
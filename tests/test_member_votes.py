@@ -0,0 +1,131 @@
+import unittest
+import asyncio
+import threading
+from datetime import date
+from unittest import mock
+import server
+from tests.support import isolate
+from server import get_member_votes
+
+
+class TestMemberVotes(unittest.TestCase):
+    """Test the House voting record index without calling the API"""
+
+    def setUp(self):
+        isolate(self, _cache=server._ResponseCache(ttl=60, max_entries=256), vote_index_ttl=0)
+        self.votes = {roll: "2024-03-01T00:00:00Z" for roll in range(1, 11)}
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def cast(self, member, roll):
+        if member == "A000001":
+            return "Not Voting" if roll % 5 == 0 else "Yea"
+        return "Nay"
+
+    def upstream(self, url, params, fields=None):
+        path = url.split("/v3/")[1]
+        with self.lock:
+            self.requests.append(path)
+        parts = path.split("/")
+        if len(parts) == 3:
+            return {"houseRollCallVotes": [{"rollCallNumber": roll, "updateDate": updated} for roll, updated in self.votes.items()],
+                    "pagination": {"count": len(self.votes)}}
+        roll = int(parts[3])
+        return {"houseRollCallVoteMemberVotes": {
+            "rollCallNumber": roll,
+            "startDate": f"2024-03-{roll:02d}T12:00:00-05:00",
+            "voteQuestion": "On Passage",
+            "result": "Passed",
+            "legislationType": "HR",
+            "legislationNumber": str(roll),
+            "results": [{"bioguideID": member, "firstName": "A", "lastName": member, "voteCast": self.cast(member, roll),
+                         "voteParty": "D", "voteState": "CA"} for member in ("A000001", "B000002")]
+        }}
+
+    def test_voting_record(self):
+        """Test positions, missed-vote rate and newest-first order"""
+        with mock.patch.object(server, "_get_json", side_effect=self.upstream):
+            result = asyncio.run(get_member_votes("a000001", congress=118, session=2))
+
+        self.assertEqual(result["summary"]["roll_calls"], 10)
+        self.assertEqual(result["summary"]["missed"], 2)
+        self.assertEqual(result["summary"]["missed_vote_rate"], 0.2)
+        self.assertEqual(result["votes"][0]["roll_call"], 10)
+        self.assertEqual(result["votes"][0]["legislation"], "HR 10")
+        self.assertEqual(result["member"]["party"], "D")
+        self.assertTrue(result["index"]["complete"])
+
+    def test_incremental_index(self):
+        """Test that the index fills in batches and only fetches new or changed roll calls"""
+        with mock.patch.object(server, "_get_json", side_effect=self.upstream):
+            partial = asyncio.run(get_member_votes("A000001", congress=118, session=2, max_fetch=4))
+            self.assertFalse(partial["index"]["complete"])
+            self.assertEqual([v["roll_call"] for v in partial["votes"]], [10, 9, 8, 7])
+
+            asyncio.run(get_member_votes("A000001", congress=118, session=2))
+            self.votes[11] = "2024-03-11T00:00:00Z"
+            self.votes[3] = "2024-03-12T00:00:00Z"
+            server._cache = server._ResponseCache(ttl=60, max_entries=256)
+            self.requests.clear()
+            result = asyncio.run(get_member_votes("B000002", congress=118, session=2, position="nay"))
+
+        member_requests = sorted(path for path in self.requests if path.endswith("/members"))
+        self.assertEqual(member_requests, ["house-vote/118/2/11/members", "house-vote/118/2/3/members"])
+        self.assertEqual(result["summary"]["roll_calls"], 11)
+        self.assertEqual(len(result["votes"]), 11)
+
+    def test_refresh_skips_stale_entries(self):
+        """Test that a changed roll call is indexed from upstream, not from an expired cache entry"""
+        server._cache = server._ResponseCache(ttl=60, max_entries=256, keep_stale=3600)
+        with mock.patch.object(server, "_get_json", side_effect=self.upstream):
+            asyncio.run(get_member_votes("B000002", congress=118, session=2))
+            entries = server._cache._entries
+            for key, (stored_at, encoded) in list(entries.items()):
+                entries[key] = (stored_at - 120, encoded)
+            self.votes[3] = "2024-03-12T00:00:00Z"
+            self.cast = lambda member, roll: "Yea" if roll == 3 else "Nay"
+            result = asyncio.run(get_member_votes("B000002", congress=118, session=2, position="yea"))
+
+        self.assertEqual([v["roll_call"] for v in result["votes"]], [3])
+        self.assertEqual(result["summary"]["positions"], {"Yea": 1, "Nay": 9})
+
+    def test_index_unlocked_during_fetches(self):
+        """Test that the session index is not locked while roll calls are fetched"""
+        locked = []
+
+        def upstream(url, params, fields=None):
+            index = server._vote_index.get((118, 2))
+            locked.append(index is not None and index.lock.locked())
+            return self.upstream(url, params, fields)
+
+        with mock.patch.object(server, "_get_json", side_effect=upstream):
+            result = asyncio.run(get_member_votes("A000001", congress=118, session=2))
+
+        self.assertTrue(result["index"]["complete"])
+        self.assertEqual(len(locked), 11)
+        self.assertFalse(any(locked))
+
+    def test_default_session(self):
+        """Test that the default session is the one in progress, or else the congress's latest"""
+        sessions = [("2023-01-03", "2024-01-03"), ("2024-01-03", "2024-12-20")]
+        calendar = server._Calendar([{"number": 118, "startYear": "2023", "sessions": [
+            {"number": n, "startDate": start, "endDate": end} for n, (start, end) in enumerate(sessions, 1)
+        ]}, {"number": 119, "startYear": "2025", "sessions": []}])
+
+        self.assertEqual(server._latest_session(calendar, 118, date(2023, 6, 1)), 1)
+        self.assertEqual(server._latest_session(calendar, 118, date(2024, 6, 1)), 2)
+        self.assertEqual(server._latest_session(calendar, 118, date(2024, 12, 28)), 2)
+        self.assertEqual(server._latest_session(calendar, 118, date(2026, 1, 1)), 2)
+        self.assertEqual(server._latest_session(calendar, 119, date(2025, 1, 2)), 1)
+
+    def test_unknown_member(self):
+        """Test that a member absent from every roll call has an empty record"""
+        with mock.patch.object(server, "_get_json", side_effect=self.upstream):
+            result = asyncio.run(get_member_votes("Z999999", congress=118, session=2))
+
+        self.assertEqual(result["votes"], [])
+        self.assertIsNone(result["summary"]["missed_vote_rate"])
+
+
+if __name__ == '__main__':
+    unittest.main()
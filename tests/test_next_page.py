@@ -0,0 +1,69 @@
+import unittest
+import asyncio
+from unittest import mock
+import server
+from tests.support import isolate
+from server import get_bills, get_next_page
+
+
+class TestNextPage(unittest.TestCase):
+    """Test cursor pagination without calling the API"""
+
+    def setUp(self):
+        isolate(self)
+        self.bills = [{"number": str(n), "url": f"https://api.congress.gov/v3/bill/118/hr/{n}?format=json"} for n in range(600)]
+        self.requests = []
+
+    def upstream(self, url, params, fields=None):
+        self.requests.append(dict(params))
+        offset, limit = int(params["offset"]), int(params["limit"])
+        return {"bills": self.bills[offset:offset + limit], "pagination": {"count": len(self.bills)}}
+
+    def numbers(self, result):
+        return [int(bill["number"]) for bill in result["bills"]]
+
+    def test_walk_with_cursor(self):
+        """Test that following cursors visits every record once, using full-size upstream pages"""
+        with mock.patch.object(server, "_get_json", side_effect=self.upstream):
+            result = asyncio.run(get_bills(congress=118, limit=100))
+            seen = self.numbers(result)
+            cursor = result["pagination"]["cursor"]
+            while cursor:
+                result = asyncio.run(get_next_page(cursor))
+                seen += self.numbers(result)
+                cursor = result.get("continuation", {}).get("cursor")
+
+        self.assertEqual(seen, list(range(600)))
+        self.assertTrue(all(int(p["limit"]) == 250 for p in self.requests[1:]))
+        self.assertTrue(all("toDateTime" in p for p in self.requests[1:]))
+
+    def test_no_gap_when_list_shifts(self):
+        """Test that a record leaving the snapshot does not cause a skipped record"""
+        with mock.patch.object(server, "_get_json", side_effect=self.upstream):
+            first = asyncio.run(get_bills(congress=118, limit=100))
+            second = asyncio.run(get_next_page(first["pagination"]["cursor"]))
+            # Bill 50 is updated after the snapshot and drops out of the pinned list.
+            del self.bills[50]
+            server._cache = server._ResponseCache(ttl=60, max_entries=64)
+            third = asyncio.run(get_next_page(second["continuation"]["cursor"]))
+
+        self.assertEqual(self.numbers(second), list(range(100, 200)))
+        self.assertEqual(self.numbers(third), list(range(200, 300)))
+
+    def test_last_page_has_no_cursor(self):
+        """Test that the end of the list carries no cursor"""
+        self.bills = self.bills[:10]
+        with mock.patch.object(server, "_get_json", side_effect=self.upstream):
+            result = asyncio.run(get_bills(congress=118, limit=20))
+
+        self.assertNotIn("cursor", result["pagination"])
+
+    def test_invalid_cursor(self):
+        """Test that a malformed cursor is rejected"""
+        result = asyncio.run(get_next_page("bm90IGEgY3Vyc29y"))
+
+        self.assertIn("Invalid cursor", result["error"])
+
+
+if __name__ == '__main__':
+    unittest.main()
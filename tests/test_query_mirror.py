@@ -0,0 +1,102 @@
+import unittest
+import asyncio
+from unittest import mock
+import server
+from tests.support import isolate
+from server import query_mirror
+
+BASE = "https://api.congress.gov/v3/"
+
+
+class TestQueryMirror(unittest.TestCase):
+    """Test the local mirror and the query_mirror tool without calling the API"""
+
+    def setUp(self):
+        isolate(self, _mirror=server._Mirror(None))
+        server._mirror.ingest(BASE + "bill/118/hr", {"bills": [
+            {"congress": 118, "type": "HR", "number": str(n), "title": f"Bill {n}", "updateDate": "2024-01-02",
+             "latestAction": {"actionDate": "2024-01-01", "text": "Referred"}} for n in (1, 2)
+        ]})
+        server._mirror.ingest(BASE + "bill/118/hr/1", {"bill": {
+            "congress": 118, "type": "HR", "number": "1", "introducedDate": "2023-01-09",
+            "policyArea": {"name": "Taxation"},
+            "sponsors": [{"bioguideId": "A000001", "party": "R", "state": "TX"}]
+        }})
+        server._mirror.ingest(BASE + "bill/118/hr/1/cosponsors", {"cosponsors": [
+            {"bioguideId": "B000002", "party": "R", "state": "OH", "isOriginalCosponsor": True, "sponsorshipDate": "2023-01-09"},
+            {"bioguideId": "C000003", "party": "D", "state": "CA", "isOriginalCosponsor": False, "sponsorshipDate": "2023-02-01"},
+            {"bioguideId": "D000004", "party": "D", "state": "NY", "isOriginalCosponsor": False, "sponsorshipDate": "2023-02-03"}
+        ]})
+        server._mirror.ingest(BASE + "member", {"members": [
+            {"bioguideId": "A000001", "name": "Doe, Jane", "partyName": "Republican", "state": "Texas",
+             "terms": {"item": [{"chamber": "House of Representatives"}]}}
+        ]})
+
+    def query(self, sql, **kwargs):
+        return asyncio.run(query_mirror(sql, **kwargs))
+
+    def test_join_and_aggregate(self):
+        """Test cosponsors per party per bill, joined to the bill"""
+        result = self.query(
+            "SELECT b.number, c.party, COUNT(*) FROM bills b JOIN cosponsors c USING (congress, type, number) "
+            "GROUP BY b.number, c.party ORDER BY c.party"
+        )
+
+        self.assertEqual(result["columns"], ["number", "party", "COUNT(*)"])
+        self.assertEqual(result["rows"], [[1, "D", 2], [1, "R", 1]])
+
+    def test_detail_merges_with_list_row(self):
+        """Test that a detail response fills in a bill a list response created, keeping the list's columns"""
+        result = self.query("SELECT title, policy_area, latest_action_text FROM bills WHERE number = 1")
+
+        self.assertEqual(result["rows"], [["Bill 1", "Taxation", "Referred"]])
+
+    def test_responses_are_mirrored(self):
+        """Test that responses loaded by the tools are added to the mirror"""
+        page = {"nominations": [{"congress": 118, "number": 55, "partNumber": "00", "citation": "PN55"}]}
+        with mock.patch.object(server, "_get_json", return_value=page):
+            asyncio.run(server.get_nomination(congress=118))
+
+        self.assertEqual(self.query("SELECT citation FROM nominations")["rows"], [["PN55"]])
+
+    def test_read_only(self):
+        """Test that writes, attaches and pragmas are refused"""
+        for sql in ("DELETE FROM bills", "INSERT INTO members (bioguide_id) VALUES ('X')",
+                    "ATTACH DATABASE ':memory:' AS other", "PRAGMA query_only = OFF", "DROP TABLE bills"):
+            self.assertIn("error", self.query(sql), sql)
+        self.assertEqual(self.query("SELECT COUNT(*) FROM bills")["rows"], [[2]])
+
+    def test_max_rows(self):
+        """Test that results are cut off at max_rows"""
+        result = self.query("SELECT * FROM cosponsors", max_rows=2)
+
+        self.assertEqual(len(result["rows"]), 2)
+        self.assertTrue(result["truncated"])
+
+    def test_timeout(self):
+        """Test that a runaway query is interrupted"""
+        with mock.patch.object(server, "mirror_query_timeout", 0.05):
+            result = self.query("WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) SELECT COUNT(*) FROM n")
+
+        self.assertIn("interrupted", result["error"])
+
+    def test_size_bound(self):
+        """Test that a full mirror skips new records and keeps the ones it has"""
+        mirror = server._Mirror(None, max_bytes=0)
+        metrics = mock.patch.object(server, "_metrics", server.Counter())
+        metrics.start()
+        self.addCleanup(metrics.stop)
+        for page in range(40):
+            mirror.ingest(BASE + "bill/118/hr", {"bills": [
+                {"congress": 118, "type": "HR", "number": str(page * 100 + n), "title": "x" * 200} for n in range(100)
+            ]})
+        stored = mirror.query("SELECT COUNT(*) FROM bills", 1, 5)["rows"][0][0]
+
+        self.assertGreater(stored, 0)
+        self.assertLess(stored, 4000)
+        self.assertGreater(server._metrics["mirror_full"], 0)
+        self.assertEqual(server._metrics["mirror_errors"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
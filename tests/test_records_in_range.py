@@ -0,0 +1,122 @@
+import unittest
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+import server
+from tests.support import isolate
+from server import get_records_in_range
+
+START = datetime(2024, 3, 1, tzinfo=timezone.utc)
+
+
+class TestRecordsInRangeAPI(unittest.TestCase):
+    """Test the get_records_in_range tool with real API calls"""
+
+    def setUp(self):
+        """Add a small delay between tests to be respectful to the API"""
+        time.sleep(0.5)
+
+    def test_get_records_in_range_amendments(self):
+        """Test a one-day window of amendment updates"""
+        result = asyncio.run(get_records_in_range(
+            "amendment", "2024-03-01T00:00:00Z", "2024-03-02T00:00:00Z", max_records=50
+        ))
+
+        self.assertIsInstance(result, dict)
+        if "error" not in result:
+            self.assertIn("amendments", result)
+            self.assertLessEqual(len(result["amendments"]), 50)
+            self.assertEqual(result["pagination"]["returned"], len(result["amendments"]))
+
+    def test_get_records_in_range_sorted_and_unique(self):
+        """Test that merged records are ordered by updateDate and de-duplicated"""
+        result = asyncio.run(get_records_in_range(
+            "bill", "2024-03-01T00:00:00Z", "2024-03-08T00:00:00Z", congress=118, max_records=300
+        ))
+
+        self.assertIsInstance(result, dict)
+        if "error" not in result:
+            bills = result["bills"]
+            dates = [bill.get("updateDate", "") for bill in bills]
+            self.assertEqual(dates, sorted(dates, reverse=True))
+            urls = [bill["url"] for bill in bills]
+            self.assertEqual(len(urls), len(set(urls)))
+
+    def test_get_records_in_range_invalid_timestamp(self):
+        """Test that a malformed timestamp returns an error"""
+        result = asyncio.run(get_records_in_range("bill", "2024-03-01", "2024-03-08T00:00:00Z"))
+
+        self.assertIn("error", result)
+
+
+class TestRecordsInRange(unittest.TestCase):
+    """Test sharding, merging and de-duplication without calling the API"""
+
+    def setUp(self):
+        isolate(self, _cache=server._ResponseCache(ttl=60, max_entries=256))
+        # 1200 bills updated over two days, clustered in the first hour of the second day.
+        times = [START + timedelta(minutes=3 * i) for i in range(400)] + \
+                [START + timedelta(days=1, seconds=4 * i) for i in range(800)]
+        self.bills = [{"number": str(n), "updateDate": server._format_datetime(t),
+                       "url": f"https://api.congress.gov/v3/bill/118/hr/{n}?format=json"} for n, t in enumerate(times)]
+        self.moving = None
+
+    def upstream(self, url, params, fields=None):
+        low, high = params["fromDateTime"], params["toDateTime"]
+        matching = [b for b in self.bills if low <= b["updateDate"] <= high]
+        offset, limit = int(params["offset"]), int(params["limit"])
+        page = matching[offset:offset + limit]
+        if self.moving is not None and limit > 1 and offset == 0:
+            # A record updated mid-walk is listed by the sub-window it moved into as well.
+            page = page + [self.moving]
+        return {"bills": page, "pagination": {"count": len(matching)}}
+
+    def test_plan_shards(self):
+        """Test that sub-windows tile the window, hold at most _SHARD_RECORDS each and count every record once"""
+        end = START + timedelta(days=2)
+        with mock.patch.object(server, "_get_json", side_effect=self.upstream):
+            shards = server._plan_shards("https://api.congress.gov/v3/bill", START, end)
+
+        self.assertGreater(len(shards), 2)
+        self.assertTrue(all(count <= server._SHARD_RECORDS for _, _, count in shards))
+        self.assertEqual(sum(count for _, _, count in shards), len(self.bills))
+        for (_, high, _), (low, _, _) in zip(shards, shards[1:]):
+            self.assertLess(high, low)
+
+    def test_merge_order(self):
+        """Test that records from every sub-window are merged in updateDate order, both directions"""
+        with mock.patch.object(server, "_get_json", side_effect=self.upstream):
+            newest = asyncio.run(get_records_in_range("bill", "2024-03-01T00:00:00Z", "2024-03-03T00:00:00Z", max_records=5000))
+            oldest = asyncio.run(get_records_in_range("bill", "2024-03-01T00:00:00Z", "2024-03-03T00:00:00Z",
+                                                      max_records=5000, sort="updateDate+asc"))
+
+        dates = [bill["updateDate"] for bill in newest["bills"]]
+        self.assertEqual(len(dates), len(self.bills))
+        self.assertEqual(dates, sorted(dates, reverse=True))
+        self.assertEqual([bill["number"] for bill in oldest["bills"]], [bill["number"] for bill in self.bills])
+        self.assertGreater(newest["shards"], 2)
+
+    def test_moved_record_returned_once(self):
+        """Test that a record listed by two sub-windows is returned once"""
+        self.moving = dict(self.bills[0], updateDate="2024-03-02T23:59:00Z")
+        with mock.patch.object(server, "_get_json", side_effect=self.upstream):
+            result = asyncio.run(get_records_in_range("bill", "2024-03-01T00:00:00Z", "2024-03-03T00:00:00Z", max_records=5000))
+
+        urls = [bill["url"] for bill in result["bills"]]
+        self.assertEqual(len(urls), len(set(urls)))
+        self.assertEqual(len(urls), len(self.bills))
+
+    def test_max_records_fetches_nearest_shards(self):
+        """Test that only the sub-windows needed for max_records are fetched"""
+        with mock.patch.object(server, "_get_json", side_effect=self.upstream) as get_json:
+            result = asyncio.run(get_records_in_range("bill", "2024-03-01T00:00:00Z", "2024-03-03T00:00:00Z", max_records=100))
+
+        self.assertEqual(len(result["bills"]), 100)
+        self.assertEqual(result["shards"], 1)
+        self.assertEqual(result["bills"][0]["number"], str(len(self.bills) - 1))
+        self.assertLess(sum(1 for call in get_json.call_args_list if call.args[1]["limit"] > 1), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import unittest
+import asyncio
+from datetime import date
+from unittest import mock
+import server
+from tests.support import isolate
+from server import get_house_votes, resolve_dates
+
+
+def congress(number, start_year, sessions):
+    return {
+        "number": number,
+        "startYear": str(start_year),
+        "endYear": str(start_year + 1),
+        "sessions": [{"chamber": chamber, "number": n, "startDate": start, **({"endDate": end} if end else {})}
+                     for n, start, end in sessions for chamber in ("House of Representatives", "Senate")]
+    }
+
+
+class TestResolveDates(unittest.TestCase):
+    """Test the congress/session calendar index without calling the API"""
+
+    def setUp(self):
+        isolate(self)
+        self.congresses = [
+            congress(119, 2025, [(1, "2025-01-03", None)]),
+            congress(118, 2023, [(1, "2023-01-03", "2024-01-03"), (2, "2024-01-03", "2025-01-03")]),
+            congress(117, 2021, [(1, "2021-01-03", "2022-01-03"), (2, "2022-01-03", "2023-01-03")])
+        ]
+        self.requests = []
+        self.votes = [{"congress": 118, "sessionNumber": 2, "rollCallNumber": n,
+                       "startDate": f"2024-{(n - 1) // 10 + 1:02d}-{(n - 1) % 10 + 10}T12:00:00-05:00"} for n in range(1, 121)]
+
+    def upstream(self, url, params, fields=None):
+        self.requests.append((url, dict(params)))
+        if url.endswith("/congress"):
+            return {"congresses": self.congresses, "pagination": {"count": len(self.congresses)}}
+        votes = [vote for vote in self.votes if url.endswith(f"/house-vote/118/{vote['sessionNumber']}")]
+        offset, limit = int(params["offset"]), int(params["limit"])
+        return {"houseRollCallVotes": votes[offset:offset + limit], "pagination": {"count": len(votes)}}
+
+    def resolve(self, dates, today=date(2025, 6, 15)):
+        with mock.patch.object(server, "_get_json", side_effect=self.upstream):
+            return server._resolve_dates(dates, today=today)
+
+    def test_lookup(self):
+        """Test that dates map to the congress and session in office"""
+        with mock.patch.object(server, "_get_json", side_effect=self.upstream):
+            calendar = server._get_calendar()
+
+        self.assertEqual(calendar.congress(date(2024, 6, 1)), 118)
+        self.assertEqual(calendar.congress(date(2023, 1, 2)), 117)
+        self.assertEqual(calendar.congress(date(2030, 1, 1)), 119)
+        self.assertIsNone(calendar.congress(date(1990, 1, 1)))
+        self.assertEqual(calendar.session(date(2024, 6, 1)), (118, 2))
+        self.assertEqual(calendar.session(date(2025, 6, 1)), (119, 1))
+
+    def test_natural_ranges(self):
+        """Test date, month, year, relative and congress terms"""
+        self.assertEqual(self.resolve("2024-03")["to"], "2024-03-31")
+        self.assertEqual(self.resolve("2024")["from_datetime"], "2024-01-01T00:00:00Z")
+        self.assertEqual(self.resolve("last 30 days")["from"], "2025-05-16")
+        self.assertEqual(self.resolve("last month")["from"], "2025-05-01")
+        self.assertEqual(self.resolve("118th congress")["to"], "2025-01-02")
+        session = self.resolve("congress 118 session 2")
+        self.assertEqual((session["from"], session["to"]), ("2024-01-03", "2025-01-02"))
+        self.assertEqual(session["congresses"], [118])
+        self.assertEqual(self.resolve("congress 118 session 1")["to"], "2024-01-02")
+        self.assertEqual(self.resolve("congress 119 session 1")["to"], "2025-06-15")
+        self.assertEqual(self.resolve("this congress")["congresses"], [119])
+
+        span = self.resolve("2022-06 to 2023-06")
+        self.assertEqual(span["congresses"], [117, 118])
+        self.assertEqual([(s["congress"], s["session"]) for s in span["sessions"]], [(117, 2), (118, 1)])
+
+    def test_invalid_dates(self):
+        """Test that unrecognized and reversed ranges are rejected"""
+        with self.assertRaises(ValueError):
+            self.resolve("sometime soon")
+        with self.assertRaises(ValueError):
+            self.resolve("2024 to 2023")
+
+    def test_calendar_cached(self):
+        """Test that the congress list is fetched once for many lookups"""
+        for dates in ("2024", "2023-05", "last year"):
+            self.resolve(dates)
+
+        self.assertEqual(len(self.requests), 1)
+
+    def test_house_votes_by_dates(self):
+        """Test that only the votes held in the range are returned, from the session that covers it"""
+        with mock.patch.object(server, "_get_json", side_effect=self.upstream):
+            march = asyncio.run(get_house_votes(dates="2024-03", limit=5))
+            wide = asyncio.run(get_house_votes(dates="2022 to 2024"))
+            both = asyncio.run(get_house_votes(congress=117, dates="2024-03"))
+            session = asyncio.run(get_house_votes(dates="118th congress session 2", limit=250))
+            tool = asyncio.run(resolve_dates("2023-01-03"))
+
+        self.assertEqual([v["rollCallNumber"] for v in march["houseRollCallVotes"]], [30, 29, 28, 27, 26])
+        self.assertEqual(march["pagination"]["count"], 10)
+        self.assertEqual(march["dates"]["from"], "2024-03-01")
+        self.assertTrue(all(url.endswith("/house-vote/118/2") for url, params in self.requests[1:]))
+        self.assertIn("span congresses", wide["error"])
+        self.assertIn("not both", both["error"])
+        self.assertEqual(session["pagination"]["count"], 120)
+        self.assertEqual(session["dates"]["sessions"], [
+            {"congress": 118, "session": 2, "startDate": "2024-01-03", "endDate": "2025-01-03"}
+        ])
+        self.assertEqual(tool["congresses"], [118])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import json
+from server import _decode_stream
+
+
+def chunked(payload, size):
+    raw = json.dumps(payload).encode()
+    return [raw[i:i + size] for i in range(0, len(raw), size)]
+
+
+class TestStreamingDecoder(unittest.TestCase):
+    """Test the incremental JSON decoder used for every upstream response"""
+
+    def setUp(self):
+        self.page = {
+            "bills": [{"number": str(i), "title": "Título " * i, "latestAction": {"text": "Referred"}} for i in range(50)],
+            "pagination": {"count": 50, "next": None},
+            "request": {"format": "json"}
+        }
+
+    def test_decode_matches_json_loads(self):
+        """Test that decoding across arbitrary chunk boundaries matches json.loads"""
+        for size in (1, 3, 17, 4096):
+            self.assertEqual(_decode_stream(chunked(self.page, size)), self.page)
+
+    def test_decode_with_fields(self):
+        """Test that listed records are projected onto the requested fields"""
+        result = _decode_stream(chunked(self.page, 64), fields=["number"])
+
+        self.assertEqual(result["bills"], [{"number": str(i)} for i in range(50)])
+        self.assertEqual(result["pagination"], self.page["pagination"])
+
+    def test_decode_envelope(self):
+        """Test that records nested in the congressional record envelope are projected"""
+        payload = {"Results": {"Issues": [{"Volume": 170, "Issue": "1"}], "IndexStart": 1}}
+        result = _decode_stream(chunked(payload, 5), fields=["Volume"])
+
+        self.assertEqual(result["Results"]["Issues"], [{"Volume": 170}])
+        self.assertEqual(result["Results"]["IndexStart"], 1)
+
+    def test_decode_detail_not_projected(self):
+        """Test that single-record detail responses are returned whole"""
+        payload = {"bill": {"number": "1", "sponsors": [{"bioguideId": "A000001"}]}}
+
+        self.assertEqual(_decode_stream(chunked(payload, 7), fields=["title"]), payload)
+
+    def test_decode_truncated_body(self):
+        """Test that a truncated body raises a decode error"""
+        with self.assertRaises(json.JSONDecodeError):
+            _decode_stream([b'{"bills": [{"number": "1"}'])
+
+
+if __name__ == '__main__':
+    unittest.main()